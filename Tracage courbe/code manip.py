@@ -1,61 +1,32 @@
-import pandas as pd
-
-def concatenate_csv(file1, file2, output_file='output.csv', has_header=True):
-    # Lire les fichiers CSV
-    df1 = pd.read_csv(file1, header=0 if has_header else None)
-    df2 = pd.read_csv(file2, header=0 if has_header else None)
-
-    # Concaténer les fichiers
-    concatenated_df = pd.concat([df1, df2], ignore_index=True)
-
-    # Sauvegarde du résultat
-    concatenated_df.to_csv(output_file, index=False, header=has_header)
-    print(f"Fichier fusionné enregistré sous '{output_file}'.")
-
+import sys
+from pathlib import Path
+
+# Le magasin de mesures est à la racine du dépôt
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from enthalpie import Magasin
+
+# Les relevés "t,T | t,T | ..." de la maquette, rangés dans le magasin de
+# mesures. Le relevé sans MCP est coupé en deux : la seconde partie
+# commence 5190 s après la première.
+# En ligne de commande (depuis la racine du dépôt) :
+#   python -m enthalpie.mesures "Tracage courbe/mesures" \
+#       "Tracage courbe/relevé sans bin/relevé sans 1.txt" \
+#       "Tracage courbe/relevé sans bin/relevé sans 2.txt" \
+#       --run classique --decalage 0 5190 --meta montage=maquette
+dossier = Path(__file__).resolve().parent
+magasin = Magasin(dossier / "mesures")
+
+magasin.ingerer(dossier / "relevé sans bin" / "relevé sans 1.txt", "classique",
+                montage="maquette", mcp="non")
+magasin.ingerer(dossier / "relevé sans bin" / "relevé sans 2.txt", "classique",
+                decalage=5190, ajouter=True)
 
 # %%
 
-import csv
-
-def text_to_csv(input_file, output_file="output.csv"):
-    opened = open(input_file, 'r')
-    text= opened.read()
-    pairs = text.split(" | ")  # Séparation des paires
-
-    with open(output_file, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["X", "Y"])  # Écriture de l'en-tête
-
-        for pair in pairs:
-            pair = pair.strip()  # Nettoyer les espaces
-            if "," in pair:  # Vérifier que la paire est valide
-                x, y = pair.split(",")
-                writer.writerow([x.strip(), y.strip()])
-            else:
-                print(f"Erreur : donnée incorrecte détectée -> {pair}")
-
-    print(f"Fichier CSV '{output_file}' généré avec succès.")
+magasin.ingerer(dossier / "relevé avec bin" / "relevé avec.txt", "mcp",
+                montage="maquette", mcp="oui")
 
 # %%
 
-def text_to_csv_ajout(input_file, output_file="output.csv"):
-    opened = open(input_file, 'r')
-    text= opened.read()
-    pairs = text.split(" | ")  # Séparation des paires
-
-    with open(output_file, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["X", "Y"])  # Écriture de l'en-tête
-
-        for pair in pairs:
-            pair = pair.strip()  # Nettoyer les espaces
-            if "," in pair:  # Vérifier que la paire est valide
-                x, y = pair.split(",")
-                x_val = float(x)
-                x = str(x_val + 5190)
-                writer.writerow([x.strip(), y.strip()])
-            else:
-                print(f"Erreur : donnée incorrecte détectée -> {pair}")
-
-    print(f"Fichier CSV '{output_file}' généré avec succès.")
-
+for run in magasin.runs():
+    print(run, magasin.canaux(run), magasin.metadonnees(run))
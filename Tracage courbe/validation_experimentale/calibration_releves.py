@@ -0,0 +1,50 @@
+import numpy as np
+import matplotlib.pyplot as plt
+import sys
+import time
+from pathlib import Path
+
+# Le solveur commun est à la racine du dépôt
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from enthalpie import Materiau, simuler_diffusion, calibrer, lire_releve
+
+# Paramètres fixes (mêmes valeurs que simulation_diffusion_validation.py)
+materiau = dict(rho=800, cp=2200, k=0.18, L_latent=150000, T_m=58.0, delta=5.0)
+simulation = dict(L=0.09, N=500, T_initial=23, T_hot=90.0, T_cold=0.0)
+dt = 0.05           # pas de temps en s (sous la limite CFL pour k <= 0.35)
+
+# Paramètres ajustés et leurs bornes
+bornes = {"k": (0.1, 0.35), "T_initial": (20.0, 25.0)}
+
+# Sondes des points 150, 250 et 350 et relevés correspondants
+sondes = [150, 250, 350]
+fichiers = ["relevé_chaud.csv", "relevé_milieu.csv", "relevé_froid.csv"]
+
+if __name__ == "__main__":
+    dossier = Path(__file__).resolve().parent
+    mesures = [lire_releve(dossier / nom) for nom in fichiers]
+
+    debut = time.perf_counter()
+    resultat = calibrer(materiau, simulation, bornes, sondes, mesures, dt)
+    print(f"Calibration en {time.perf_counter() - debut:.0f} s")
+    for nom, valeur in resultat["parametres"].items():
+        print(f"{nom} = {valeur:.4g}")
+    print(f"Écart quadratique moyen : {resultat['ecart']:.3f} °C")
+
+    # Comparaison des sondes simulées avec les paramètres ajustés
+    materiau.update({nom: v for nom, v in resultat["parametres"].items() if nom in materiau})
+    simulation.update({nom: v for nom, v in resultat["parametres"].items() if nom in simulation})
+    temps = mesures[0][0]
+    sim = simuler_diffusion(Materiau(**materiau), dt=dt, total_time=temps[-1], sondes=sondes,
+                            temps_sondes=temps, **simulation)
+
+    plt.figure(figsize=(8, 5))
+    for j, nom in enumerate(fichiers):
+        ligne, = plt.plot(mesures[j][0], mesures[j][1], label=nom)
+        plt.plot(temps, sim["sondes"][:, j], "--", color=ligne.get_color())
+    plt.xlabel("Temps (s)")
+    plt.ylabel("Température (°C)")
+    plt.title("Relevés (traits pleins) et modèle calibré (pointillés)")
+    plt.legend()
+    plt.grid(True)
+    plt.show()
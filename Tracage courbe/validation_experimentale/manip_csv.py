@@ -1,21 +1,17 @@
-fichier = open("releve_texte.txt","r",encoding="latin-1")
+import sys
+from pathlib import Path
 
-releve_1 = open("relevé_1.csv","w",encoding="latin-1")
-releve_2 = open("relevé_2.csv","w",encoding="latin-1")
-releve_3 = open("relevé_3.csv","w",encoding="latin-1")
+# Le magasin de mesures est à la racine du dépôt
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from enthalpie import Magasin
 
-for line in fichier :
-    line = line.rstrip("\n")
-    elements = line.split(";")
-    releve_1.write(elements[0] + ";" + elements[1] + "\n")
-    releve_2.write(elements[2] + ";" + elements[3] + "\n")
-    releve_3.write(elements[4] + ";" + elements[5] + "\n")
+# Les trois voies de releve_texte.txt rangées dans le magasin de mesures
+# (remplace les fichiers intermédiaires relevé_1/2/3.csv)
+dossier = Path(__file__).resolve().parent
+magasin = Magasin(dossier.parent / "mesures")
+magasin.ingerer(dossier / "releve_texte.txt", "diffusion",
+                canaux=["froid", "chaud", "milieu"], montage="diffusion")
 
-fichier.close()
-releve_1.close()
-releve_2.close()
-releve_3.close()
 # %%
 
-
-
+temps, T_chaud = magasin.lire("diffusion", "chaud")
@@ -0,0 +1,51 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from enthalpie import grille, balayer
+
+
+# -------------------------------
+# Paramètres communs (ceux de simulation_pièce_MCP+classique.py)
+# -------------------------------
+materiau = dict(rho=800, cp=2000, k=0.5, L_latent=15e4, T_m=20.0, delta=5.0,
+                p=1, rho_v=25, cp_v=1030, k_v=0.046)
+
+# Fonction de température extérieure (sinusoïdale sur 24 h), définie au
+# niveau du module pour être transmise aux processus
+def T_ext(t):
+    return 20 + 10 * np.sin(2 * np.pi * t / 86400)
+
+simulation = dict(L=0.1, N=50, T_ext=T_ext, dt=0.5, total_time=86400 * 5,
+                  h_conv=10, A=24.0, C_room=1e4, T_init_wall=20.0, T_room_init=22.0,
+                  pas_releve=100)
+
+# -------------------------------
+# Scénarios balayés
+# -------------------------------
+scenarios = grille(L=[0.05, 0.1, 0.2],
+                   p=[0.25, 0.5, 1.0],
+                   T_m=[18.0, 20.0, 22.0],
+                   h_conv=[5, 10],
+                   A=[24.0],
+                   C_room=[1e4, 5e4])
+
+if __name__ == "__main__":
+    resultat = balayer(scenarios, materiau, simulation)
+
+    # Amplitude de la température de la pièce sur le dernier jour
+    dernier_jour = resultat["temps"] >= simulation["total_time"] - 86400
+    T_room = resultat["T_room"][dernier_jour]
+    amplitude = T_room.max(axis=0) - T_room.min(axis=0)
+
+    ordre = np.argsort(amplitude)
+    print("Scénarios les plus stables :")
+    for i in ordre[:5]:
+        print(f"  {scenarios[i]} : amplitude {amplitude[i]:.2f} °C")
+
+    plt.figure(figsize=(10, 6))
+    plt.plot(amplitude[ordre], marker=".", linestyle="")
+    plt.xlabel("Scénario (classé)")
+    plt.ylabel("Amplitude de T_room sur le dernier jour (°C)")
+    plt.title(f"Balayage de {len(scenarios)} scénarios")
+    plt.grid(True)
+    plt.show()
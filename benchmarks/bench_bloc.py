@@ -0,0 +1,49 @@
+"""
+Passage à l'échelle du schéma explicite 3D (Bloc) de 1 à 32 threads, sur
+une grille de 160^3 mailles (paraffine, face x = 0 à 80 °C). Vérifie au
+passage que le champ final est identique au bit près à celui d'un thread.
+
+Lancer depuis la racine du dépôt : python benchmarks/bench_bloc.py [numpy|numba]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from enthalpie import Bloc, Materiau
+
+materiau = Materiau(rho=800, cp=2000, k=0.2, L_latent=150000, T_m=58.0, delta=5.0)
+forme = (160, 160, 160)
+dx = 1e-3
+dt = 0.9 * dx**2 * materiau.C / (6 * materiau.k_eff)
+n_pas = 20
+THREADS = (1, 2, 4, 8, 16, 32)
+
+
+def chronometrer(n_threads, backend, repetitions=3):
+    meilleur = np.inf
+    for _ in range(repetitions):
+        with Bloc(materiau, forme, dx, 20.0, n_threads, backend) as bloc:
+            bloc.imposer_face(0, 0, 80.0)
+            bloc.pas_explicite(dt)   # compilation / démarrage des threads hors mesure
+            debut = time.perf_counter()
+            bloc.avancer(dt, n_pas)
+            meilleur = min(meilleur, time.perf_counter() - debut)
+            T = bloc.T.copy()
+    return meilleur, T
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else "auto"
+    print(f"{np.prod(forme)} mailles, {n_pas} pas, {os.cpu_count()} processeur(s)")
+    reference = None
+    for n_threads in THREADS:
+        duree, T = chronometrer(n_threads, backend)
+        if reference is None:
+            reference, duree_1 = T, duree
+        identique = "identique" if np.array_equal(T, reference) else "DIFFÉRENT"
+        print(f"{n_threads:2d} threads : {1e3 * duree / n_pas:8.2f} ms/pas"
+              f"  (x{duree_1 / duree:.2f})  {identique}")
@@ -0,0 +1,52 @@
+"""
+Comparaison des backends NumPy et Numba du schéma explicite
+(paramètres de simulation_diffusion.py), pour N = 50 et N = 500, et coût
+du même calcul avec le matériau tabulé (MateriauTabule, NumPy).
+
+Lancer depuis la racine du dépôt : python benchmarks/bench_noyau.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from enthalpie import Materiau, MateriauTabule, simuler_diffusion
+from enthalpie.noyau_numba import NUMBA_DISPONIBLE
+
+materiau = Materiau(rho=800, cp=2000, k=0.2, L_latent=150000, T_m=58.0, delta=5.0)
+tabule = MateriauTabule.depuis_materiau(materiau)
+L = 0.09
+dt = 0.01
+total_time = 100.0   # 10 000 pas
+
+
+def chronometrer(N, backend, repetitions=3, materiau=materiau):
+    meilleur = np.inf
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        simuler_diffusion(materiau, L, N, 20.0, 100.0, 20.0, dt, total_time,
+                          sondes=[N // 4, N // 2, 3 * N // 4], suivre_interface=True,
+                          backend=backend)
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+if __name__ == "__main__":
+    backends = ["numpy", "numba"] if NUMBA_DISPONIBLE else ["numpy"]
+    if NUMBA_DISPONIBLE:
+        # Première compilation (ou lecture du cache) hors chronométrage
+        debut = time.perf_counter()
+        simuler_diffusion(materiau, L, 50, 20.0, 100.0, 20.0, dt, dt, backend="numba")
+        print(f"Compilation / chargement du cache Numba : {time.perf_counter() - debut:.2f} s")
+
+    n_pas = int(total_time / dt)
+    for N in (50, 500):
+        temps = {backend: chronometrer(N, backend) for backend in backends}
+        ligne = f"N = {N:4d} : " + ", ".join(
+            f"{backend} {1e6 * t / n_pas:7.2f} µs/pas" for backend, t in temps.items())
+        if "numba" in temps:
+            ligne += f"  (x{temps['numpy'] / temps['numba']:.1f})"
+        ligne += f", tabulé {1e6 * chronometrer(N, 'numpy', materiau=tabule) / n_pas:7.2f} µs/pas"
+        print(ligne)
@@ -0,0 +1,64 @@
+"""
+Modèle réduit POD + DEIM (ModeleReduit) face à la simulation complète de la
+pièce : 5 jours de sinusoïde de 24 h, apprentissage sur les 3 premiers.
+Affiche la durée (estimation d'erreur comprise), l'écart maximal sur
+T_room et T_interieur et l'estimation d'erreur du modèle réduit pour
+plusieurs pas de temps.
+
+Lancer depuis la racine du dépôt : python benchmarks/bench_reduit.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from enthalpie import Materiau, ModeleReduit, simuler_piece
+from enthalpie.noyau_numba import NUMBA_DISPONIBLE
+
+materiau = Materiau(rho=800, cp=2000, k=0.5, L_latent=15e4, T_m=20.0, delta=5.0)
+L, N, dt = 0.1, 50, 1.0
+piece = dict(h_conv=10, A=24, C_room=1e4, T_init_wall=20.0, T_room_init=20.0)
+duree = 5 * 86400
+PAS_REDUITS = (1.0, 10.0, 60.0, 300.0, 600.0)
+
+
+def T_ext(t):
+    return 20 + 10 * np.sin(2 * np.pi * t / 86400)
+
+
+def chronometrer(fonction, repetitions=3):
+    fonction()   # compilation hors mesure
+    meilleur = np.inf
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur, resultat
+
+
+if __name__ == "__main__":
+    backends = ("numpy", "numba") if NUMBA_DISPONIBLE else ("numpy",)
+    debut = time.perf_counter()
+    modele = ModeleReduit.apprendre(materiau, L, N, T_ext, dt, 3 * 86400, **piece)
+    print(f"Apprentissage : {time.perf_counter() - debut:.1f} s, "
+          f"énergie négligée {modele.energie_negligee:.1e}, "
+          f"erreur d'apprentissage {modele.erreur_apprentissage:.4f} °C")
+    complets = {}
+    for backend in backends:
+        complets[backend], reference = chronometrer(
+            lambda: simuler_piece(materiau, L, N, T_ext, dt, duree, pas_releve=60,
+                                  backend=backend, **piece), repetitions=1)
+        print(f"complet {backend:5s} dt = {dt:5.0f} s : {complets[backend]:7.3f} s")
+    for pas in PAS_REDUITS:
+        for backend in backends:
+            t, r = chronometrer(lambda: modele.simuler(T_ext, pas, duree,
+                                                       pas_releve=max(1, int(60 / pas)),
+                                                       backend=backend, **piece))
+            ecart = max(np.max(np.abs(r[nom][:, 0] - np.interp(
+                r["temps"], reference["temps"], reference[nom][:, 0])))
+                for nom in ("T_room", "T_interieur"))
+            print(f"réduit  {backend:5s} dt = {pas:5.0f} s : {t:7.3f} s "
+                  f"(x{complets[backend] / t:6.1f})  écart {ecart:.4f} °C, "
+                  f"estimé {r['erreur_estimee']:.4f} °C")
@@ -0,0 +1,45 @@
+import matplotlib.pyplot as plt
+import sys
+import time
+from pathlib import Path
+
+# Le solveur commun est à la racine du dépôt
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from enthalpie import Materiau, lire_releve, ajuster_refroidissement, ecrire_materiau
+
+# Les courbes de refroidissement sont en kelvins
+KELVIN = 273.15
+
+# rho, cp et k de paraffine.json ; L_latent, T_m et delta sont ajustés,
+# avec le coefficient de pertes de l'échantillon et la température ambiante
+dossier = Path(__file__).resolve().parent
+materiau = Materiau.depuis_json(dossier / "paraffine.json")
+courbes = {
+    "solidification_paraffine.csv": "paraffine_ajustee.json",
+    "solidification_paraffine_chut.csv": "paraffine_ajustee_chut.json",
+}
+
+if __name__ == "__main__":
+    for releve, sortie in courbes.items():
+        t, T = lire_releve(dossier / releve)
+        T = T - KELVIN
+
+        debut = time.perf_counter()
+        resultat = ajuster_refroidissement(materiau, t, T, bornes={"T_ambiante": (0.0, T.min())})
+        print(f"{releve} : ajusté en {time.perf_counter() - debut:.1f} s, "
+              f"écart {resultat['ecart']:.2f} °C")
+        for nom, valeur in resultat["parametres"].items():
+            print(f"  {nom} = {valeur:.4g}")
+
+        # Fichier lu directement par Materiau.depuis_json
+        ecrire_materiau(dossier / sortie, resultat["materiau"])
+
+        plt.plot(t, T, label=f"{releve} (mesure)")
+        plt.plot(t, resultat["simule"], "--", label=f"{releve} (modèle ajusté)")
+
+    plt.xlabel("Temps (secondes)")
+    plt.ylabel("Température (°C)")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.show()
@@ -1,27 +1,15 @@
 import matplotlib.pyplot as plt
 import numpy as np
+import sys
+from pathlib import Path
 
-def plot_courbe(file_to_plot, name_curve):
-    # Lecture du fichier
-    text = open(file_to_plot, 'r', encoding='latin-1')
-
-    t = []
-    deg = []
-    text.readline()
+# Le chargeur de relevés est à la racine du dépôt
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from enthalpie import lire_releve
 
-    for line in text:
-        line = line.rstrip("\n").split(";")
-        x = float(line[0].replace(",", "."))    # convertir en float
-        y = float(line[1].replace(",", "."))    # convertir en float
-        if est_convertible_en_float(x) and est_convertible_en_float(y):
-            t_i = float(x)
-            deg_i = float(y)
-            t.append(t_i)
-            deg.append(deg_i)
-
-    # Conversion en tableau NumPy (optionnel mais pratique)
-    t    = np.array(t)
-    deg  = np.array(deg)
+def plot_courbe(file_to_plot, name_curve):
+    # Lecture du fichier (tableaux NumPy, lignes non numériques ignorées)
+    t, deg = lire_releve(file_to_plot)
 
     # On choisit un intervalle fixe (ici tous les 20 points)
     interval = 50
@@ -50,10 +38,3 @@ def plot_courbe(file_to_plot, name_curve):
     plt.grid(True)
     plt.tight_layout()
     plt.show()
-    
-def est_convertible_en_float(valeur):
-    try:
-        float(valeur)
-        return True  # La conversion a réussi
-    except ValueError:
-        return False  # La conversion a échoué
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Solveur enthalpique commun aux scripts de simulation du TIPE MCP.
+"""
+
+from .materiau import Materiau, MateriauTabule
+from .couches import Couche, Multicouche
+from .mur import Mur, SuiviFronts, position_interface
+from .diffusion import simuler_diffusion
+from .piece import Piece, simuler_piece
+from .implicite import NonConvergence, SolveurImplicite, resoudre_tridiagonal
+from .adaptatif import simuler_piece_adaptatif
+from .boite import Boite, simuler_boite
+from .bloc import Bloc
+from .enveloppe import Paroi, Enveloppe, simuler_enveloppe
+from .meteo import FichierMeteo
+from .periodique import regime_periodique
+from .admittance import amortissement, reponse_periodique
+from .reduit import ModeleReduit
+from .cache import CacheResultats
+from .releves import lire_releve
+from .calibration import calibrer
+from .enregistreur import Enregistreur
+from .balayage import grille, balayer
+from .reprise import sauver_point, charger_point
+from .champs import EcrivainChamps, LecteurChamps
+from .mesures import Magasin
+from .refroidissement import ajuster_refroidissement, ecrire_materiau
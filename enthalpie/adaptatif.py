@@ -0,0 +1,157 @@
+import numpy as np
+
+from .implicite import NonConvergence
+from .piece import Piece
+
+
+def pas_cfl(piece):
+    """
+    Pas de temps maximal du schéma explicite : diffusion (dx^2 * C / 2k,
+    avec la plus petite capacité) et modèle lumpé de la pièce (1 / c).
+    """
+    materiau = piece.mur.materiau
+    dt_mur = np.min(piece.mur.dx**2 * materiau.C / (2 * materiau.k_eff))
+    dt_room = np.min(1.0 / np.asarray(piece._coef_room))
+    return min(dt_mur, dt_room)
+
+
+def chercher_rupture(T_ext, t0, t1, seuil=1.0, n_echantillons=8, precision=1e-6):
+    """
+    Cherche une discontinuité de T_ext dans ]t0, t1] : saut de plus de
+    `seuil` entre deux échantillons voisins, localisé par dichotomie.
+    Renvoie l'instant de la rupture (premier instant de la nouvelle valeur)
+    ou None.
+    """
+    ts = np.linspace(t0, t1, n_echantillons + 1)
+    valeurs = [T_ext(t) for t in ts]
+    for i in range(n_echantillons):
+        if abs(valeurs[i + 1] - valeurs[i]) <= seuil:
+            continue
+        a, b = ts[i], ts[i + 1]
+        T_a = valeurs[i]
+        while b - a > precision:
+            m = 0.5 * (a + b)
+            if abs(T_ext(m) - T_a) > seuil:
+                b = m
+            else:
+                a = m
+        # Un vrai saut reste visible sur un intervalle de largeur `precision`
+        if abs(T_ext(b) - T_ext(a)) > seuil:
+            return b
+    return None
+
+
+def simuler_piece_adaptatif(materiau, L, N, T_ext, total_time, h_conv, A, C_room,
+                            T_init_wall, T_room_init, schema="implicite",
+                            dt_init=10.0, dt_min=1e-3, dt_max=3600.0, tol=0.05,
+                            fraction_max=0.5, ruptures=None, seuil_rupture=1.0):
+    """
+    Simulation de la pièce avec pas de temps adaptatif.
+
+    L'erreur locale est estimée par doublement de pas (un pas dt contre deux
+    pas dt/2, écart maximal en °C sur les murs et l'air) et comparée à tol.
+    Un pas est aussi rejeté si la fraction liquide d'un noeud varie de plus
+    de fraction_max (front de changement de phase), ou si les itérations
+    non linéaires du schéma implicite ne convergent pas. En explicite, dt reste
+    sous la limite CFL.
+
+    Les pas tombent exactement sur les ruptures de T_ext : celles de la liste
+    `ruptures` si elle est donnée, sinon celles détectées sur T_ext(t).
+    En implicite, T_ext est prise au milieu du pas, donc jamais de part et
+    d'autre d'une rupture.
+
+    Renvoie un dictionnaire avec un relevé par pas accepté, ainsi que
+    "pas_acceptes" et "pas_rejetes".
+    """
+    piece = Piece(materiau, L, N, T_init_wall, T_room_init, h_conv, A, C_room, schema)
+    explicite = piece.solveur is None
+    if explicite:
+        dt_max = min(dt_max, 0.9 * pas_cfl(piece))
+    # Ordre de l'erreur locale : dt^2 (Euler), dt^3 (Crank-Nicolson)
+    ordre = 3 if schema == "crank-nicolson" else 2
+    ruptures = sorted(ruptures) if ruptures is not None else None
+
+    def avancer(t, dt):
+        t_force = t if explicite else t + 0.5 * dt
+        piece.pas(dt, T_ext(t_force))
+
+    temps = [0.0]
+    T_ext_arr = [T_ext(0.0)]
+    T_room_arr = [piece.T_room.ravel().copy()]
+    T_interior_arr = [piece.mur.T[..., -1].ravel().copy()]
+    dt_arr = []
+    pas_acceptes = 0
+    pas_rejetes = 0
+
+    t = 0.0
+    dt = min(dt_init, dt_max)
+    while t < total_time - 1e-9:
+        dt = min(max(min(dt, dt_max), dt_min), total_time - t)
+
+        # Atterrissage sur la prochaine rupture du forçage
+        if ruptures is not None:
+            prochaine = next((tb for tb in ruptures if t < tb < t + dt), None)
+        else:
+            prochaine = chercher_rupture(T_ext, t, t + dt, seuil_rupture)
+            if prochaine is not None and prochaine - t < dt_min:
+                prochaine = None
+        dt_pas = prochaine - t if prochaine is not None else dt
+
+        etat_initial = piece.etat()
+        fraction_initiale = piece.mur.fraction.copy()
+
+        try:
+            # Un grand pas...
+            avancer(t, dt_pas)
+            T_gros = np.concatenate([piece.mur.T.ravel(), piece.T_room.ravel()])
+            # ... puis deux demi-pas depuis le même état
+            piece.restaurer(etat_initial)
+            avancer(t, 0.5 * dt_pas)
+            avancer(t + 0.5 * dt_pas, 0.5 * dt_pas)
+        except NonConvergence:
+            if dt_pas <= dt_min:
+                raise
+            piece.restaurer(etat_initial)
+            pas_rejetes += 1
+            dt = 0.5 * dt_pas
+            continue
+        T_fin = np.concatenate([piece.mur.T.ravel(), piece.T_room.ravel()])
+
+        erreur = np.max(np.abs(T_fin - T_gros))
+        saut_fraction = np.max(np.abs(piece.mur.fraction - fraction_initiale))
+
+        if (erreur > tol or saut_fraction > fraction_max) and dt_pas > dt_min:
+            piece.restaurer(etat_initial)
+            pas_rejetes += 1
+            facteur = 0.9 * (tol / max(erreur, 1e-300)) ** (1.0 / ordre)
+            if saut_fraction > fraction_max:
+                facteur = min(facteur, 0.5)
+            dt = dt_pas * min(max(facteur, 0.1), 0.9)
+            continue
+
+        # Pas accepté : on garde la solution à deux demi-pas
+        t += dt_pas
+        pas_acceptes += 1
+        temps.append(t)
+        T_ext_arr.append(T_ext(t))
+        T_room_arr.append(piece.T_room.ravel().copy())
+        T_interior_arr.append(piece.mur.T[..., -1].ravel().copy())
+        dt_arr.append(dt_pas)
+
+        facteur = 0.9 * (tol / max(erreur, 1e-300)) ** (1.0 / ordre)
+        dt = dt_pas * min(max(facteur, 0.2), 5.0)
+        # Après une rupture, on repart d'un pas prudent
+        if prochaine is not None:
+            dt = min(dt, dt_init)
+
+    return {
+        "x": piece.mur.x,
+        "temps": np.array(temps),
+        "T_ext": np.array(T_ext_arr),
+        "T_room": np.array(T_room_arr),
+        "T_interieur": np.array(T_interior_arr),
+        "dt": np.array(dt_arr),
+        "T": piece.mur.T.copy(),
+        "pas_acceptes": pas_acceptes,
+        "pas_rejetes": pas_rejetes,
+    }
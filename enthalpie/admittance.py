@@ -0,0 +1,107 @@
+"""
+Réponse en fréquence d'un mur sans changement de phase et de sa pièce
+(méthode des matrices de transfert, ou « admittances »).
+
+Pour un forçage harmonique de pulsation w, une couche homogène
+d'épaisseur e relie température et flux de ses deux faces :
+    [T_a]   [cosh(g e)        sinh(g e) / (k g)] [T_b]
+    [q_a] = [k g sinh(g e)    cosh(g e)        ] [q_b],   g = sqrt(i w C / k)
+Les couches se multiplient de l'extérieur vers l'intérieur, puis viennent
+la convection intérieure [[1, 1/h_conv], [0, 1]] et l'air de la pièce
+(A * q = i w C_room * T_room), comme dans Piece : T_ext imposée en x = 0,
+pas d'autre échange. Le rapport T_room / T_ext s'obtient sans pas de temps,
+pour toutes les harmoniques d'un coup.
+
+Seul un matériau linéaire (L_latent = 0) s'y prête : le mur MCP reste
+simulé par la méthode enthalpique.
+"""
+import numpy as np
+
+from .couches import Multicouche
+
+
+def _couches(construction, L):
+    # Liste de (C, k, épaisseur) de l'extérieur vers l'intérieur
+    if isinstance(construction, Multicouche):
+        couches = [(c.materiau, c.epaisseur) for c in construction.couches]
+    else:
+        couches = [(construction, L)]
+    for materiau, _ in couches:
+        if np.any(np.asarray(materiau.L_vol) != 0) or getattr(materiau, "tabule", False):
+            raise ValueError("La méthode des admittances ne traite que les matériaux "
+                             "sans changement de phase")
+    return [(materiau.C, materiau.k_eff, epaisseur) for materiau, epaisseur in couches]
+
+
+def matrice_transfert(construction, L, omega):
+    """
+    Matrice de transfert (a, b, c, d) du mur, de la face extérieure à la
+    face intérieure, aux pulsations omega (rad/s). construction est un
+    Materiau (épaisseur L) ou un Multicouche (L = None) ; les paramètres
+    de forme (n, 1) d'un ensemble de cas donnent des tableaux (n, len(omega)).
+    """
+    omega = np.asarray(omega, dtype=float)
+    a, b, c, d = 1.0, 0.0, 0.0, 1.0
+    for C, k, e in _couches(construction, L):
+        g = np.sqrt(1j * omega * C / k)
+        ge = g * e
+        nul = ge == 0
+        ge_sur = np.where(nul, 1.0, ge)
+        with np.errstate(over="ignore", invalid="ignore"):
+            ch, sh = np.cosh(ge), np.sinh(ge)
+            # sinh(ge) / ge -> 1 et ge * sinh(ge) -> 0 en w = 0 (régime permanent)
+            sh_sur_ge = np.where(nul, 1.0, sh / ge_sur)
+            a_c, b_c, c_c, d_c = ch, sh_sur_ge * e / k, k * ge * sh / e, ch
+            a, b, c, d = (a * a_c + b * c_c, a * b_c + b * d_c,
+                          c * a_c + d * c_c, c * b_c + d * d_c)
+    return a, b, c, d
+
+
+def transfert_piece(construction, L, omega, h_conv, A, C_room):
+    """
+    Fonctions de transfert complexes de la pièce de Piece, aux pulsations
+    omega : {"T_room": T_room / T_ext, "T_interieur": T_face / T_ext}.
+    Aux pulsations où le mur amortit au-delà de la précision des flottants,
+    les deux valent 0.
+    """
+    omega = np.asarray(omega, dtype=float)
+    a, b, c, d = matrice_transfert(construction, L, omega)
+    Y_room = 1j * omega * C_room / A                  # q = Y_room * T_room
+    # Convection intérieure : T_face = T_room + q / h_conv
+    face = 1.0 + Y_room / h_conv
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        G_room = 1.0 / (a * face + b * Y_room)
+        G_room = np.where(np.isfinite(G_room), G_room, 0.0)
+    return {"T_room": G_room, "T_interieur": G_room * face}
+
+
+def amortissement(construction, L, periode, h_conv, A, C_room):
+    """
+    Facteur d'amortissement |T / T_ext| et déphasage (s, retard de T sur
+    T_ext, entre 0 et la période) de l'air et de la face intérieure pour
+    un forçage sinusoïdal de période `periode` (s).
+    """
+    omega = 2 * np.pi / periode
+    resultat = {}
+    for nom, G in transfert_piece(construction, L, omega, h_conv, A, C_room).items():
+        resultat[nom] = {"facteur": np.abs(G),
+                         "dephasage": np.mod(-np.angle(G), 2 * np.pi) / omega}
+    return resultat
+
+
+def reponse_periodique(construction, L, T_ext, periode, h_conv, A, C_room):
+    """
+    Régime périodique établi de la pièce pour un forçage périodique
+    quelconque, échantillonné régulièrement sur une période : T_ext est le
+    tableau des valeurs aux instants k * periode / len(T_ext). Chaque
+    harmonique (FFT) est multipliée par la fonction de transfert. Renvoie
+    {"temps", "T_room", "T_interieur"} aux mêmes instants.
+    """
+    T_ext = np.asarray(T_ext, dtype=float)
+    n = T_ext.shape[-1]
+    spectre = np.fft.rfft(T_ext)
+    omega = 2 * np.pi * np.arange(spectre.shape[-1]) / periode
+    resultat = {"temps": np.arange(n) * periode / n}
+    for nom, G in transfert_piece(construction, L, omega, h_conv, A, C_room).items():
+        resultat[nom] = np.fft.irfft(G * spectre, n)
+    return resultat
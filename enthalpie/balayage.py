@@ -0,0 +1,178 @@
+"""
+Balayage de paramètres de la pièce sur plusieurs processus.
+
+Les scénarios sont regroupés en paquets ; chaque paquet est simulé comme
+un ensemble de cas (une ligne par scénario) dans un processus du pool.
+Les relevés sont écrits directement dans des tableaux en mémoire partagée :
+seules de petites statistiques repassent par pickle.
+"""
+import inspect
+import itertools
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .implicite import theta_du_schema
+from .materiau import Materiau
+from .meteo import valeurs_forcage
+from .piece import simuler_piece
+
+PARAMETRES_MATERIAU = inspect.signature(Materiau).parameters
+PARAMETRES_SCENARIO = ("L", "h_conv", "A", "C_room", "T_init_wall", "T_room_init")
+SORTIES = ("T_room", "T_interieur")
+
+# Événement d'annulation partagé, transmis aux processus par _initialiser
+_annulation = None
+
+
+def grille(**axes):
+    """
+    Produit cartésien des valeurs de chaque paramètre, par exemple
+    grille(L=[0.05, 0.1], p=[0.5, 1]) : liste de 4 dictionnaires.
+    """
+    noms = list(axes)
+    return [dict(zip(noms, valeurs)) for valeurs in itertools.product(*axes.values())]
+
+
+def _initialiser(annulation):
+    global _annulation
+    _annulation = annulation
+
+
+def _simuler_paquet(indices, scenarios, materiau, simulation, noms_memoire, forme):
+    """
+    Simule un paquet de scénarios et écrit ses colonnes dans la mémoire
+    partagée. Renvoie (pid, nombre de scénarios, durée) ou None si annulé.
+    """
+    if _annulation is not None and _annulation.is_set():
+        return None
+    debut = time.perf_counter()
+
+    def par_scenario(nom, valeur):
+        return [s.get(nom, valeur) for s in scenarios]
+
+    noms = set(materiau).union(*scenarios) & set(PARAMETRES_MATERIAU)
+    materiau = Materiau.ensemble(**{
+        nom: par_scenario(nom, materiau.get(nom, PARAMETRES_MATERIAU[nom].default))
+        for nom in noms})
+    simulation = dict(simulation)
+    for nom in PARAMETRES_SCENARIO:
+        simulation[nom] = par_scenario(nom, simulation[nom])
+    resultat = simuler_piece(materiau, **simulation)
+
+    for sortie, nom in zip(SORTIES, noms_memoire):
+        # Les processus du pool partagent le resource_tracker du parent, qui
+        # reste seul responsable de la destruction des segments
+        memoire = shared_memory.SharedMemory(name=nom)
+        tableau = np.ndarray(forme, dtype=float, buffer=memoire.buf)
+        tableau[:, indices] = resultat[sortie]
+        del tableau
+        memoire.close()
+    return os.getpid(), len(indices), time.perf_counter() - debut
+
+
+def balayer(scenarios, materiau, simulation, n_processus=None, taille_paquet=4,
+            annulation=None, afficher=True):
+    """
+    Simule chaque scénario de la liste (voir grille) avec simuler_piece.
+
+    materiau : paramètres de Materiau communs à tous les scénarios.
+    simulation : arguments de simuler_piece (L, N, T_ext, dt, total_time,
+    h_conv, A, C_room, T_init_wall, T_room_init, pas_releve, schema...).
+    Un scénario remplace n'importe quel paramètre du matériau ainsi que L,
+    h_conv, A, C_room, T_init_wall et T_room_init. T_ext doit être une
+    fonction définie au niveau d'un module (transmise par pickle).
+
+    annulation : multiprocessing.Event ; dès qu'il est levé (ou sur Ctrl-C),
+    les paquets non commencés sont abandonnés et les résultats déjà
+    calculés sont renvoyés. Le débit de chaque processus est affiché si
+    `afficher`.
+
+    Renvoie un dictionnaire : "temps", "T_ext", "T_room" et "T_interieur"
+    (une colonne par scénario), "termine" (scénarios calculés), "debits"
+    ({pid: scénarios par seconde}) et "annule".
+    """
+    inconnus = {nom for s in scenarios for nom in s} - set(PARAMETRES_MATERIAU) \
+        - set(PARAMETRES_SCENARIO)
+    if inconnus:
+        raise ValueError(f"Paramètres de scénario inconnus : {sorted(inconnus)}")
+    materiau = dict(materiau)
+    simulation = dict(simulation)
+    simulation.setdefault("pas_releve", 100)
+    simulation.setdefault("schema", "explicite")
+
+    # Instants des relevés, comme dans simuler_piece
+    dt, pas_releve = simulation["dt"], simulation["pas_releve"]
+    steps = int(simulation["total_time"] / dt)
+    decalage = 0.0 if theta_du_schema(simulation["schema"]) is None else dt
+    temps = np.arange(0, steps, pas_releve) * dt + decalage
+    forme = (len(temps), len(scenarios))
+
+    n_processus = n_processus or os.cpu_count() or 1
+    annulation = annulation or multiprocessing.Event()
+    memoires = [shared_memory.SharedMemory(create=True, size=max(8 * np.prod(forme), 8))
+                for _ in SORTIES]
+    tableaux = [np.ndarray(forme, dtype=float, buffer=m.buf) for m in memoires]
+    for tableau in tableaux:
+        tableau[...] = np.nan
+
+    termine = np.zeros(len(scenarios), dtype=bool)
+    debits = {}
+    try:
+        with ProcessPoolExecutor(n_processus, initializer=_initialiser,
+                                 initargs=(annulation,)) as pool:
+            taches = {}
+            for debut in range(0, len(scenarios), taille_paquet):
+                indices = list(range(debut, min(debut + taille_paquet, len(scenarios))))
+                tache = pool.submit(_simuler_paquet, indices,
+                                    [scenarios[i] for i in indices], materiau, simulation,
+                                    [m.name for m in memoires], forme)
+                taches[tache] = indices
+            en_cours = set(taches)
+            try:
+                while en_cours:
+                    faites, en_cours = wait(en_cours, timeout=0.5,
+                                            return_when=FIRST_COMPLETED)
+                    for tache in faites:
+                        if tache.cancelled() or tache.result() is None:
+                            continue
+                        pid, n, duree = tache.result()
+                        termine[taches[tache]] = True
+                        n_total, duree_totale = debits.get(pid, (0, 0.0))
+                        debits[pid] = (n_total + n, duree_totale + duree)
+                    if annulation.is_set():
+                        for tache in en_cours:
+                            tache.cancel()
+            except KeyboardInterrupt:
+                annulation.set()
+                for tache in en_cours:
+                    tache.cancel()
+                wait(en_cours)
+
+        resultat = {sortie: tableau.copy() for sortie, tableau in zip(SORTIES, tableaux)}
+    finally:
+        del tableaux
+        for memoire in memoires:
+            memoire.close()
+            memoire.unlink()
+
+    debits = {pid: n / duree for pid, (n, duree) in debits.items()}
+    if afficher:
+        for pid, debit in sorted(debits.items()):
+            print(f"processus {pid} : {debit:.3g} scénarios/s")
+        print(f"{termine.sum()}/{len(scenarios)} scénarios calculés")
+
+    T_ext = simulation["T_ext"]
+    resultat.update({
+        "temps": temps,
+        "T_ext": valeurs_forcage(T_ext, temps),
+        "termine": termine,
+        "debits": debits,
+        "annule": annulation.is_set(),
+        "scenarios": scenarios,
+    })
+    return resultat
@@ -0,0 +1,134 @@
+"""
+Schéma explicite 3D parallèle : bloc de MCP sur une grille régulière.
+
+La grille (nx, ny, nz) est découpée en tranches de plans selon le premier
+axe, une par thread. Chaque pas lit l'ancienne température T et écrit la
+nouvelle dans un second tableau (double tampon) : une tranche lit les plans
+voisins des autres tranches (halo) sans copie ni verrou, puisque personne
+n'écrit dans T pendant le pas, et les tampons sont échangés une fois toutes
+les tranches finies. Chaque maille fait les mêmes opérations dans le même
+ordre quel que soit le découpage : le résultat ne dépend pas du nombre de
+threads, au bit près.
+
+Les tranches sont avancées par un noyau Numba compilé sans GIL, ou sans
+Numba par des opérations NumPy sur des vues (qui relâchent aussi le GIL).
+Les mailles du bord de la grille gardent leur température (Dirichlet).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .noyau_numba import avancer_tranche_3d, choisir_backend
+
+
+class Bloc:
+    """
+    Bloc de `materiau` (paramètres scalaires, zone mushy linéaire) de forme
+    (nx, ny, nz) mailles cubiques de côté dx, à T_init (scalaire ou tableau
+    de cette forme). n_threads : nombre de tranches avancées en parallèle
+    (par défaut le nombre de processeurs).
+
+        with Bloc(materiau, (100, 100, 100), 1e-3, 20.0, n_threads=8) as bloc:
+            bloc.imposer_face(0, 0, 80.0)
+            bloc.avancer(0.01, 1000)
+    """
+
+    def __init__(self, materiau, forme, dx, T_init, n_threads=None, backend="auto"):
+        if getattr(materiau, "tabule", False) or getattr(materiau, "par_noeud", False) \
+                or np.ndim(materiau.C) != 0:
+            raise ValueError("Le bloc 3D n'accepte qu'un matériau à paramètres scalaires")
+        if len(forme) != 3 or min(forme) < 3:
+            raise ValueError("La grille doit avoir au moins 3 mailles sur chacun des 3 axes")
+        self.materiau = materiau
+        self.forme = tuple(int(n) for n in forme)
+        self.dx = dx
+        self.backend = choisir_backend(backend, materiau)
+        self._coef_lap = float(materiau.k_eff) / dx**2
+
+        T = np.empty(self.forme)
+        T[...] = T_init
+        self.H = materiau.compute_H(T)
+        self.fraction = np.empty(self.forme)
+        self.T = materiau.T_from_H(self.H, fraction=self.fraction)
+        self._T_neuf = self.T.copy()
+
+        self.n_threads = max(1, int(n_threads or os.cpu_count() or 1))
+        # Plans intérieurs 1 .. nx - 2 répartis en tranches contiguës
+        bornes = np.linspace(1, self.forme[0] - 1, self.n_threads + 1).round().astype(int)
+        self.tranches = [(int(a), int(b)) for a, b in zip(bornes[:-1], bornes[1:]) if b > a]
+        if self.backend == "numpy":
+            # Tampons du laplacien, un par tranche
+            self._lap = [np.empty((b - a, self.forme[1] - 2, self.forme[2] - 2))
+                         for a, b in self.tranches]
+            self._tmp = [np.empty_like(lap) for lap in self._lap]
+        self._pool = ThreadPoolExecutor(len(self.tranches)) if len(self.tranches) > 1 else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        """
+        Arrête les threads.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def imposer_face(self, axe, cote, T_face):
+        """
+        Impose la température de la face `cote` (0 ou -1) de l'axe `axe`
+        (scalaire ou tableau de la forme de la face).
+        """
+        face = [slice(None)] * 3
+        face[axe] = cote
+        face = tuple(face)
+        self.T[face] = T_face
+        self._T_neuf[face] = self.T[face]
+        self.materiau.compute_H(self.T[face], out=self.H[face])
+
+    def _avancer_numpy(self, n, dt):
+        a, b = self.tranches[n]
+        T, lap, tmp = self.T, self._lap[n], self._tmp[n]
+        centre = (slice(a, b), slice(1, -1), slice(1, -1))
+        np.add(T[a - 1:b - 1, 1:-1, 1:-1], T[a + 1:b + 1, 1:-1, 1:-1], out=lap)
+        lap += T[a:b, :-2, 1:-1]
+        lap += T[a:b, 2:, 1:-1]
+        lap += T[a:b, 1:-1, :-2]
+        lap += T[a:b, 1:-1, 2:]
+        np.multiply(T[centre], 6.0, out=tmp)
+        lap -= tmp
+        lap *= dt * self._coef_lap
+        self.H[centre] += lap
+        self.materiau.T_from_H(self.H[centre], out=self._T_neuf[centre],
+                               fraction=self.fraction[centre])
+
+    def _avancer_numba(self, n, dt):
+        a, b = self.tranches[n]
+        m = self.materiau
+        avancer_tranche_3d(self.H, self.T, self._T_neuf, self.fraction, a, b,
+                           dt * self._coef_lap, float(m.H_low), float(m._inv_dH),
+                           float(m.L_vol), float(m._inv_C))
+
+    def pas_explicite(self, dt):
+        """
+        Avance le bloc de dt (stabilité : dt <= dx^2 * C / (6 k)).
+        """
+        avancer = self._avancer_numba if self.backend == "numba" else self._avancer_numpy
+        if self._pool is None:
+            for n in range(len(self.tranches)):
+                avancer(n, dt)
+        else:
+            # list() attend toutes les tranches et propage leurs exceptions
+            list(self._pool.map(avancer, range(len(self.tranches)), [dt] * len(self.tranches)))
+        self.T, self._T_neuf = self._T_neuf, self.T
+
+    def avancer(self, dt, n_pas):
+        """
+        n_pas pas explicites de dt.
+        """
+        for _ in range(n_pas):
+            self.pas_explicite(dt)
@@ -0,0 +1,265 @@
+"""
+Conduction 2D/3D dans les parois de la maquette (boîte fermée).
+
+La boîte est une grille régulière de mailles cubiques (carrées en 2D) :
+les mailles à moins de `epaisseur` du bord extérieur forment les parois,
+les autres l'air intérieur, supposé homogène (un seul noeud, comme le
+modèle lumpé de Piece). Les arêtes et les coins des parois sont donc
+représentés, contrairement au mur 1D.
+
+Le pas de temps est un Euler implicite sur des matrices scipy.sparse :
+    (V * C_app + dt * K) T* = V * (C_app * T - H + H^n) + dt * G_ext * T_ext
+avec K la matrice des conductances (conduction entre mailles, convection
+vers l'air, échange avec l'extérieur), et les mêmes itérations sur la
+capacité apparente que SolveurImplicite. C_app ne change que dans la zone
+mushy : la factorisation LU est réutilisée tant que l'ensemble des mailles
+mushy ne change pas (et que dt est le même).
+"""
+import numpy as np
+
+from .implicite import NonConvergence
+
+try:
+    import scipy.sparse as sparse
+    from scipy.sparse.linalg import cg, splu
+except ImportError:
+    sparse = None
+
+RHO_CP_AIR = 1.2 * 1005.0   # J/(m^3.K)
+
+
+class Boite:
+    """
+    Boîte de dimensions extérieures `taille` (2 ou 3 longueurs, m), de
+    parois d'épaisseur `epaisseur` en `materiau` (paramètres scalaires),
+    maillée à dx près.
+
+    En 2D, la boîte est une section de profondeur `profondeur` (m) : seules
+    les surfaces et les volumes en dépendent. L'air intérieur échange avec
+    les parois par h_conv ; les faces extérieures sont à T_ext (h_ext=None)
+    ou échangent avec l'extérieur par h_ext. C_air (J/K) vaut par défaut la
+    capacité de l'air de la cavité.
+
+    solveur : "lu" (factorisation réutilisée, voir plus haut) ou "gc"
+    (gradient conjugué préconditionné par la diagonale, sans factorisation :
+    mémoire linéaire, pour les grilles de l'ordre du million de mailles ;
+    la matrice y est bien conditionnée tant que dt * k / (C * dx^2) reste
+    de l'ordre de l'unité).
+    """
+
+    def __init__(self, materiau, taille, epaisseur, dx, T_init, T_air_init,
+                 h_conv=10.0, h_ext=None, C_air=None, profondeur=1.0, solveur="lu"):
+        if solveur not in ("lu", "gc"):
+            raise ValueError(f"Solveur inconnu : {solveur!r}")
+        if sparse is None:
+            raise ImportError("Le solveur 2D/3D nécessite SciPy (scipy.sparse)")
+        if len(taille) not in (2, 3):
+            raise ValueError("La boîte est en 2D ou en 3D")
+        self.materiau = materiau
+        self.dx = dx
+        forme = tuple(max(int(round(l / dx)), 3) for l in taille)
+        self.forme = forme
+        e = max(int(round(epaisseur / dx)), 1)
+
+        # Parois : mailles à moins de e mailles d'un bord
+        distance = np.full(forme, np.iinfo(np.int64).max)
+        for axe, n in enumerate(forme):
+            i = np.arange(n).reshape([-1 if a == axe else 1 for a in range(len(forme))])
+            distance = np.minimum(distance, np.minimum(i, n - 1 - i))
+        self.paroi = distance < e
+        if self.paroi.all():
+            raise ValueError("Parois trop épaisses : pas d'air intérieur")
+
+        # Numéro de chaque maille de paroi ; l'air est l'inconnue n
+        numero = np.full(forme, -1)
+        numero[self.paroi] = np.arange(np.count_nonzero(self.paroi))
+        n = int(np.count_nonzero(self.paroi))
+        self.n = n
+        self._numero = numero
+
+        surface = dx ** (len(forme) - 1) * (profondeur if len(forme) == 2 else 1.0)
+        self.volume = surface * dx
+        k = float(materiau.k_eff)
+        G_cond = surface * k / dx
+        G_conv = surface / (dx / (2 * k) + 1.0 / h_conv)
+        G_ext = surface / (dx / (2 * k) + (0.0 if h_ext is None else 1.0 / h_ext))
+
+        lignes, colonnes, valeurs = [], [], []
+        g_ext = np.zeros(n + 1)
+        interieur = np.zeros(n, dtype=bool)
+        n_faces_air = 0
+
+        def relier(i, j, G):
+            # Conductance G entre les inconnues i et j (matrice symétrique)
+            lignes.extend([i, j, i, j])
+            colonnes.extend([i, j, j, i])
+            valeurs.extend([G, G, -G, -G])
+
+        for axe in range(len(forme)):
+            a = [slice(None)] * len(forme)
+            b = [slice(None)] * len(forme)
+            a[axe], b[axe] = slice(None, -1), slice(1, None)
+            na, nb = numero[tuple(a)], numero[tuple(b)]
+            # Paroi - paroi
+            entre = (na >= 0) & (nb >= 0)
+            relier(na[entre], nb[entre], np.full(np.count_nonzero(entre), G_cond))
+            # Paroi - air intérieur
+            for p, q in ((na, nb), (nb, na)):
+                vers_air = (p >= 0) & (q < 0)
+                relier(p[vers_air], np.full(np.count_nonzero(vers_air), n),
+                       np.full(np.count_nonzero(vers_air), G_conv))
+                interieur[p[vers_air]] = True
+                n_faces_air += int(np.count_nonzero(vers_air))
+            # Faces extérieures (premier et dernier plan de l'axe)
+            for plan in (0, -1):
+                c = [slice(None)] * len(forme)
+                c[axe] = plan
+                np.add.at(g_ext, numero[tuple(c)].ravel(), G_ext)
+
+        K = sparse.coo_matrix((np.concatenate(valeurs), (np.concatenate(lignes),
+                                                         np.concatenate(colonnes))),
+                              shape=(n + 1, n + 1)).tocsc()
+        self._K = K + sparse.diags(g_ext, format="csc")
+        self._K_csr = self._K.tocsr()
+        self._g_ext = g_ext
+        self.interieur = interieur
+        self.surface_interieure = surface * n_faces_air
+        if C_air is None:
+            C_air = RHO_CP_AIR * self.volume * np.count_nonzero(~self.paroi)
+        self.C_air = C_air
+
+        # État : H, T, fraction liquide des mailles de paroi et T de l'air
+        self.T = np.full(n, float(T_init))
+        self.H = materiau.compute_H(self.T)
+        self.fraction = np.empty(n)
+        materiau.T_from_H(self.H, out=self.T, fraction=self.fraction)
+        self.T_air = float(T_air_init)
+
+        self._H_n = np.empty(n)
+        self._C_app = np.empty(n)
+        self._d = np.empty(n + 1)
+        self.solveur = solveur
+        self._C_fact = None
+        self._dt = None
+        self._lu = None
+        self.factorisations = 0
+        self.iterations = 0
+
+    def _factoriser(self, dt):
+        diagonale = np.append(self.volume * self._C_app, self.C_air)
+        matrice = (self._K * dt + sparse.diags(diagonale, format="csc")).tocsc()
+        # Matrice symétrique : ordre de minimum degree sur A + A^T
+        self._lu = splu(matrice, permc_spec="MMD_AT_PLUS_A", options={"SymmetricMode": True})
+        self._C_fact = self._C_app.copy()
+        self._dt = dt
+        self.factorisations += 1
+
+    def _resoudre(self, dt, d, x0):
+        # Système du pas avec la capacité apparente actuelle
+        if self.solveur == "gc":
+            diagonale = np.append(self.volume * self._C_app, self.C_air)
+            matrice = self._K_csr * dt
+            matrice.setdiag(matrice.diagonal() + diagonale)
+            x, info = cg(matrice, d, x0=x0, rtol=1e-10, M=sparse.diags(1.0 / matrice.diagonal()))
+            if info != 0:
+                raise RuntimeError("Le gradient conjugué n'a pas convergé")
+            return x
+        if self._lu is None or dt != self._dt or not np.array_equal(self._C_app, self._C_fact):
+            self._factoriser(dt)
+        return self._lu.solve(d)
+
+    def pas(self, dt, T_ext_val, tol=1e-6, max_iter=50):
+        """
+        Avance la boîte de dt (T_ext_val : température extérieure en fin de
+        pas). Renvoie le nombre d'itérations non linéaires ; lève
+        NonConvergence si tol n'est pas atteinte en max_iter itérations.
+        """
+        materiau = self.materiau
+        H, T, C_app, d = self.H, self.T, self._C_app, self._d
+        self._H_n[...] = H
+        T_air_n = self.T_air
+
+        for iteration in range(1, max_iter + 1):
+            materiau.capacite_apparente(self.fraction, out=C_app, T=T)
+
+            np.multiply(C_app, T, out=d[:-1])
+            d[:-1] -= H
+            d[:-1] += self._H_n
+            d[:-1] *= self.volume
+            d[-1] = self.C_air * T_air_n
+            d += dt * T_ext_val * self._g_ext
+            T_etoile = self._resoudre(dt, d, np.append(T, self.T_air))
+
+            # Correction de l'enthalpie puis retour à la température
+            ecart = np.max(np.abs(T_etoile[:-1] - T))
+            H += C_app * (T_etoile[:-1] - T)
+            materiau.T_from_H(H, out=T, fraction=self.fraction)
+            self.T_air = float(T_etoile[-1])
+            if ecart < tol:
+                break
+        else:
+            self.iterations = iteration
+            raise NonConvergence(f"Pas de la boîte non convergé en {max_iter} itérations "
+                                 f"(écart {ecart:.2e} °C > tol = {tol:.0e})")
+
+        self.iterations = iteration
+        return iteration
+
+    def etat(self):
+        """
+        Copie de l'état de la boîte (H des parois et T_air).
+        """
+        return self.H.copy(), self.T_air
+
+    def restaurer(self, etat):
+        """
+        Revient à un état renvoyé par etat(), par exemple après un pas non
+        convergé (NonConvergence), pour le refaire avec un dt plus petit.
+        """
+        H, self.T_air = etat
+        self.H[...] = H
+        self.materiau.T_from_H(self.H, out=self.T, fraction=self.fraction)
+
+    def T_interieur(self):
+        """
+        Température moyenne des mailles de paroi au contact de l'air.
+        """
+        return float(np.mean(self.T[self.interieur]))
+
+    def champ(self):
+        """
+        Température sur toute la grille (air intérieur compris).
+        """
+        T = np.full(self.forme, self.T_air)
+        T[self.paroi] = self.T
+        return T
+
+
+def simuler_boite(materiau, taille, epaisseur, dx, T_ext, dt, total_time, T_init,
+                  T_air_init, h_conv=10.0, h_ext=None, C_air=None, profondeur=1.0,
+                  pas_releve=1, tol=1e-6, solveur="lu"):
+    """
+    Simulation de la boîte sur total_time secondes ; T_ext(t) comme dans
+    simuler_piece. Les relevés (tous les pas_releve pas, datés de la fin
+    du pas) ont les noms de simuler_piece : "temps", "T_ext", "T_room" (air
+    intérieur, à comparer aux relevés des boîtes) et "T_interieur" (face
+    intérieure des parois). "factorisations" compte les factorisations LU.
+    """
+    boite = Boite(materiau, taille, epaisseur, dx, T_init, T_air_init, h_conv, h_ext,
+                  C_air, profondeur, solveur)
+    steps = int(total_time / dt)
+    n_releves = steps // pas_releve
+    releves = {nom: np.empty(n_releves) for nom in ("temps", "T_ext", "T_room", "T_interieur")}
+    for step in range(steps):
+        t = (step + 1) * dt
+        T_ext_val = T_ext(t)
+        boite.pas(dt, T_ext_val, tol)
+        if (step + 1) % pas_releve == 0:
+            j = (step + 1) // pas_releve - 1
+            releves["temps"][j] = t
+            releves["T_ext"][j] = T_ext_val
+            releves["T_room"][j] = boite.T_air
+            releves["T_interieur"][j] = boite.T_interieur()
+    releves["factorisations"] = boite.factorisations
+    releves["boite"] = boite
+    return releves
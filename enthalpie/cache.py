@@ -0,0 +1,234 @@
+"""
+Cache sur disque des résultats de simulation, adressé par leur contenu.
+
+La clé d'un calcul est l'empreinte SHA-256 de tout ce qui le détermine :
+fonction appelée (avec l'objet d'une méthode liée comme modele.simuler,
+les arguments d'un functools.partial, les variables d'une fermeture),
+valeurs de tous ses paramètres (y compris ceux laissés par défaut :
+schéma, backend, taille des blocs...), paramètres des matériaux (ceux du
+JSON, comme paraffine.json), forçage et version du code (contenu des
+sources du paquet enthalpie). Deux appels de même clé
+donnent le même résultat : le second relit les relevés au lieu de
+refaire les pas de temps.
+
+    cache = CacheResultats("cache_resultats")
+    resultat = cache.appeler(simuler_piece, materiau, L, N, T_ext, dt, total_time, ...)
+
+Le forçage T_ext(t) d'un script est une fonction : son empreinte est
+celle de ses valeurs aux instants k * dt, de 0 à total_time (ou periode).
+Celle d'un FichierMeteo est celle du contenu du fichier.
+
+Chaque résultat (dictionnaire de tableaux) est un fichier .npz nommé
+d'après sa clé. Quand le dossier dépasse taille_max octets, les
+résultats les moins récemment utilisés sont supprimés.
+"""
+import functools
+import hashlib
+import inspect
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .meteo import FichierMeteo, valeurs_forcage
+from .reprise import charger_point, sauver_point
+
+_version_code = None
+
+
+def version_code():
+    """
+    Empreinte des sources du paquet enthalpie : toute modification du code
+    change les clés, donc invalide les résultats déjà en cache.
+    """
+    global _version_code
+    if _version_code is None:
+        h = hashlib.sha256()
+        for source in sorted(Path(__file__).parent.glob("*.py")):
+            h.update(source.name.encode())
+            h.update(source.read_bytes())
+        _version_code = h.hexdigest()
+    return _version_code
+
+
+def _empreinte(valeur, h, instants, parents=()):
+    # Ajoute à h une description canonique de valeur (type et contenu) ;
+    # parents : objets en cours de description (références circulaires)
+    if valeur is None or isinstance(valeur, (bool, int, float, complex, str, bytes)):
+        h.update(f"{type(valeur).__name__}:{valeur!r};".encode())
+    elif isinstance(valeur, (np.ndarray, np.generic)):
+        tableau = np.ascontiguousarray(valeur)
+        h.update(f"ndarray:{tableau.dtype.str}:{tableau.shape};".encode())
+        h.update(tableau.tobytes())
+    elif isinstance(valeur, (list, tuple)):
+        h.update(f"{type(valeur).__name__}:{len(valeur)};".encode())
+        for element in valeur:
+            _empreinte(element, h, instants, parents)
+    elif isinstance(valeur, dict):
+        h.update(f"dict:{len(valeur)};".encode())
+        for cle in sorted(valeur, key=str):
+            _empreinte(str(cle), h, instants, parents)
+            _empreinte(valeur[cle], h, instants, parents)
+    elif isinstance(valeur, Path):
+        h.update(b"fichier;")
+        h.update(valeur.read_bytes())
+    elif isinstance(valeur, FichierMeteo):
+        h.update(f"meteo:{valeur.colonne}:{valeur.decalage!r};".encode())
+        h.update(Path(valeur.chemin).read_bytes())
+    elif callable(valeur):
+        if instants is None:
+            raise ValueError("Forçage fonction : préciser instants_forcage (ou passer dt "
+                             "et total_time à la simulation)")
+        h.update(b"forcage;")
+        try:
+            # Une expression NumPy s'évalue d'un seul appel sur tous les instants
+            valeurs = np.asarray(valeur(instants), dtype=float)
+            if valeurs.shape != instants.shape:
+                raise ValueError
+        except Exception:
+            valeurs = valeurs_forcage(valeur, instants)
+        _empreinte(valeurs, h, None)
+    elif hasattr(valeur, "__dict__"):
+        # Materiau, Multicouche, Paroi, ModeleReduit... : attributs publics
+        if any(valeur is parent for parent in parents):
+            h.update(f"parent:{[p is valeur for p in parents].index(True)};".encode())
+            return
+        h.update(f"{type(valeur).__qualname__};".encode())
+        _empreinte(_attributs(valeur), h, instants, parents + (valeur,))
+    else:
+        raise TypeError(f"Empreinte impossible pour un objet {type(valeur).__name__}")
+
+
+def _attributs(objet):
+    # Attributs publics : les attributs en _ sont des grandeurs dérivées ou
+    # des tampons de travail (MateriauTabule._indices), qui changent quand
+    # l'objet sert sans changer son résultat
+    return {nom: valeur for nom, valeur in vars(objet).items() if not nom.startswith("_")}
+
+
+def _empreinte_objet(objet, h, instants):
+    # Type et attributs d'un objet, même appelable (un objet appelable passé
+    # en argument serait pris pour un forçage)
+    h.update(f"{type(objet).__qualname__};".encode())
+    _empreinte(_attributs(objet) if hasattr(objet, "__dict__") else None, h, instants, (objet,))
+
+
+def _empreinte_fonction(fonction, h, instants):
+    # Identité de la fonction appelée, y compris l'état dont dépend son
+    # résultat : objet d'une méthode liée (m.simuler d'un ModeleReduit),
+    # arguments figés d'un functools.partial, variables d'une fermeture
+    if inspect.ismethod(fonction):
+        _empreinte_fonction(fonction.__func__, h, instants)
+        _empreinte_objet(fonction.__self__, h, instants)
+    elif isinstance(fonction, functools.partial):
+        _empreinte_fonction(fonction.func, h, instants)
+        _empreinte([fonction.args, fonction.keywords], h, instants)
+    elif inspect.isfunction(fonction):
+        _empreinte([fonction.__module__, fonction.__qualname__], h, None)
+        for cellule in fonction.__closure__ or ():
+            _empreinte(cellule.cell_contents, h, instants)
+    else:
+        _empreinte_objet(fonction, h, instants)
+        _empreinte_fonction(type(fonction).__call__, h, instants)
+
+
+class CacheResultats:
+    """
+    Résultats de simulation rangés dans le dossier `dossier` (créé au
+    besoin), limité à taille_max octets.
+    """
+
+    def __init__(self, dossier="cache_resultats", taille_max=2**30):
+        self.dossier = Path(dossier)
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        self.taille_max = taille_max
+
+    def cle(self, fonction, *args, instants_forcage=None, **kwargs):
+        """
+        Clé (hexadécimale) de l'appel fonction(*args, **kwargs). Les
+        forçages fonctions sont évalués aux instants_forcage (par défaut
+        k * dt de 0 à total_time, ou à periode).
+        """
+        arguments = inspect.signature(fonction).bind(*args, **kwargs)
+        arguments.apply_defaults()
+        parametres = arguments.arguments
+        if instants_forcage is None and "dt" in parametres:
+            duree = parametres.get("total_time", parametres.get("periode"))
+            if duree is not None:
+                dt = parametres["dt"]
+                instants_forcage = np.arange(int(duree / dt) + 1) * dt
+        h = hashlib.sha256()
+        _empreinte(version_code(), h, None)
+        _empreinte_fonction(fonction, h, instants_forcage)
+        _empreinte(dict(parametres), h, instants_forcage)
+        return h.hexdigest()
+
+    def appeler(self, fonction, *args, instants_forcage=None, **kwargs):
+        """
+        fonction(*args, **kwargs), relu dans le cache s'il y est. La
+        fonction doit renvoyer un dictionnaire de tableaux (comme
+        simuler_piece) ; les valeurs scalaires sont relues en scalaires.
+        Les objets du résultat (la "boite" de simuler_boite, l'"enveloppe"
+        de simuler_enveloppe) ne sont pas mis en cache : ils manquent au
+        résultat relu.
+        Lors d'une relecture, les fichiers que la fonction aurait écrits
+        (fichier_reprise, fichier_champs) ne sont pas écrits.
+        """
+        fichier = self.dossier / (self.cle(fonction, *args, instants_forcage=instants_forcage,
+                                           **kwargs) + ".npz")
+        try:
+            resultat = charger_point(fichier)
+        except FileNotFoundError:
+            pass
+        else:
+            # Date de modification = dernier usage, pour l'éviction
+            os.utime(fichier)
+            return {nom: tableau.item() if tableau.ndim == 0 else tableau
+                    for nom, tableau in resultat.items()}
+
+        resultat = fonction(*args, **kwargs)
+        if not isinstance(resultat, dict):
+            raise TypeError("Seuls les résultats de type dictionnaire de tableaux se "
+                            "mettent en cache")
+        tableaux = {nom: np.asarray(valeur) for nom, valeur in resultat.items()}
+        sauver_point(fichier, **{nom: tableau for nom, tableau in tableaux.items()
+                                 if tableau.dtype != object})
+        self.evincer(garder=fichier)
+        return resultat
+
+    def taille(self):
+        """
+        Taille totale des résultats en cache (octets).
+        """
+        return sum(fichier.stat().st_size for fichier in self.dossier.glob("*.npz"))
+
+    def evincer(self, garder=None):
+        """
+        Supprime les résultats les moins récemment utilisés jusqu'à revenir
+        sous taille_max (sauf le fichier `garder`).
+        """
+        fichiers = []
+        for fichier in self.dossier.glob("*.npz"):
+            try:
+                etat = fichier.stat()
+            except FileNotFoundError:
+                continue
+            fichiers.append((etat.st_mtime_ns, etat.st_size, fichier))
+        total = sum(taille for _, taille, _ in fichiers)
+        for _, taille, fichier in sorted(fichiers, key=lambda f: f[0]):
+            if total <= self.taille_max:
+                break
+            if fichier == garder:
+                continue
+            try:
+                fichier.unlink()
+            except FileNotFoundError:
+                pass
+            total -= taille
+
+    def vider(self):
+        """
+        Supprime tous les résultats en cache.
+        """
+        for fichier in self.dossier.glob("*.npz"):
+            fichier.unlink(missing_ok=True)
@@ -0,0 +1,129 @@
+"""
+Calibration des paramètres du modèle sur des relevés de sondes.
+
+Les candidats d'une grille sont simulés ensemble (ensemble de cas, une
+ligne par candidat), répartis sur plusieurs processus, et les sondes ne
+sont relevées qu'aux instants de mesure. La grille est ensuite resserrée
+autour du meilleur candidat.
+"""
+import inspect
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .diffusion import simuler_diffusion
+from .materiau import Materiau
+
+PARAMETRES_MATERIAU = tuple(inspect.signature(Materiau).parameters)
+PARAMETRES_SIMULATION = ("L", "T_initial", "T_hot", "T_cold")
+
+
+def _ecarts(candidats, noms, materiau, simulation, dt, sondes, mesures, schema, backend):
+    """
+    Écart quadratique moyen (°C) entre sondes simulées et mesures pour
+    chaque candidat (une ligne de `candidats`, une colonne par nom).
+    """
+    materiau = dict(materiau)
+    simulation = dict(simulation)
+    for j, nom in enumerate(noms):
+        if nom in PARAMETRES_MATERIAU:
+            materiau[nom] = candidats[:, j]
+        else:
+            simulation[nom] = candidats[:, j]
+    n_cas = len(candidats)
+    materiau = {nom: np.broadcast_to(valeur, (n_cas,)) for nom, valeur in materiau.items()}
+
+    # Sondes relevées à l'union des instants de mesure
+    temps = np.unique(np.concatenate([t for t, _ in mesures]))
+    resultat = simuler_diffusion(Materiau.ensemble(**materiau), N=simulation.pop("N"),
+                                 dt=dt, total_time=temps[-1], sondes=sondes,
+                                 schema=schema, backend=backend, temps_sondes=temps,
+                                 **{nom: np.broadcast_to(simulation[nom], (n_cas,))
+                                    for nom in PARAMETRES_SIMULATION})
+    # Instants jamais relevés (au-delà de la simulation) : nan pour tous les
+    # candidats, écartés de la moyenne
+    releve = ~np.all(np.isnan(resultat["sondes"]), axis=(1, 2))
+    somme = np.zeros(n_cas)
+    n_points = 0
+    for j, (t, valeurs) in enumerate(mesures):
+        lignes = np.searchsorted(temps, t)
+        garder = releve[lignes]
+        simule = resultat["sondes"][lignes[garder], :, j]
+        somme += np.sum((simule - valeurs[garder, None]) ** 2, axis=0)
+        n_points += np.count_nonzero(garder)
+    if n_points == 0:
+        raise ValueError("Aucun instant de mesure n'a été relevé par la simulation")
+    return np.sqrt(somme / n_points)
+
+
+def calibrer(materiau, simulation, bornes, sondes, mesures, dt, n_points=5,
+             n_raffinements=8, n_processus=None, schema="explicite", backend="numpy"):
+    """
+    Ajuste les paramètres de `bornes` pour que les sondes simulées suivent
+    les mesures.
+
+    materiau : paramètres de Materiau (rho, cp, k, ...).
+    simulation : L, N, T_initial, T_hot et T_cold de simuler_diffusion.
+    bornes : {nom: (min, max)} des paramètres ajustés, pris dans l'un ou
+    l'autre dictionnaire, par exemple {"k": (0.1, 0.3), "T_initial": (20, 25)}.
+    sondes : indices des noeuds sondés ; mesures : un couple (temps, valeurs)
+    par sonde, par exemple renvoyé par lire_releve.
+
+    Chaque tour évalue une grille de n_points valeurs par paramètre, puis la
+    resserre à ± un pas de grille autour du meilleur candidat. Renvoie un
+    dictionnaire : meilleurs "parametres", "ecart" (°C, quadratique moyen)
+    et "historique" (candidats et écarts de chaque tour).
+    """
+    noms = list(bornes)
+    inconnus = set(noms) - set(PARAMETRES_MATERIAU) - set(PARAMETRES_SIMULATION)
+    if inconnus:
+        raise ValueError(f"Paramètres non calibrables : {sorted(inconnus)}")
+    if len(sondes) != len(mesures):
+        raise ValueError("Il faut un relevé par sonde")
+    mesures = [(np.asarray(t, dtype=float), np.asarray(v, dtype=float)) for t, v in mesures]
+    n_processus = n_processus or os.cpu_count() or 1
+
+    limites = np.array([bornes[nom] for nom in noms], dtype=float)
+    bas, haut = limites[:, 0].copy(), limites[:, 1].copy()
+    historique = []
+    meilleur, ecart_min = None, np.inf
+
+    with ProcessPoolExecutor(n_processus) if n_processus > 1 else _SansPool() as pool:
+        for _ in range(n_raffinements):
+            axes = [np.linspace(b, h, n_points) for b, h in zip(bas, haut)]
+            candidats = np.array(list(itertools.product(*axes)))
+            paquets = np.array_split(candidats, min(n_processus, len(candidats)))
+            arguments = (noms, materiau, simulation, dt, sondes, mesures, schema, backend)
+            ecarts = np.concatenate(list(pool.map(_ecarts, paquets,
+                                                  *[itertools.repeat(a) for a in arguments])))
+            historique.append((candidats, ecarts))
+
+            if np.all(np.isnan(ecarts)):
+                raise ValueError("Écart non défini pour tous les candidats "
+                                 "(simulations instables ? réduire dt)")
+            i = np.nanargmin(ecarts)
+            if ecarts[i] < ecart_min:
+                meilleur, ecart_min = candidats[i], ecarts[i]
+            pas_grille = (haut - bas) / max(n_points - 1, 1)
+            bas = np.maximum(meilleur - pas_grille, limites[:, 0])
+            haut = np.minimum(meilleur + pas_grille, limites[:, 1])
+
+    return {
+        "parametres": dict(zip(noms, meilleur.tolist())),
+        "ecart": float(ecart_min),
+        "historique": historique,
+    }
+
+
+class _SansPool:
+    # Même interface que ProcessPoolExecutor, dans le processus courant
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fonction, *iterables):
+        return map(fonction, *iterables)
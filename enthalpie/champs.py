@@ -0,0 +1,197 @@
+"""
+Champs espace-temps (T, H, fraction liquide) écrits sur disque pendant le
+calcul, par blocs de pas de temps compressés.
+
+Deux formats : un fichier HDF5 (si h5py est installé) ou un dossier de
+blocs .npz compressés accompagné d'un index champs.json. La lecture ne
+charge que les blocs qui recoupent l'intervalle de temps demandé.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+NOMS_CHAMPS = ("T", "H", "fraction")
+
+
+def _format(chemin, format):
+    if format == "auto":
+        return "hdf5" if h5py is not None and Path(chemin).suffix in (".h5", ".hdf5") else "npz"
+    if format == "hdf5" and h5py is None:
+        raise ImportError("h5py n'est pas installé : utiliser format=\"npz\"")
+    if format not in ("hdf5", "npz"):
+        raise ValueError(f"Format inconnu : {format!r}")
+    return format
+
+
+class EcrivainChamps:
+    """
+    Écrit les champs d'une simulation dans `chemin`, un instant à la fois.
+
+    Les instants sont accumulés dans un tampon de taille_bloc lignes, écrit
+    et compressé dès qu'il est plein : la mémoire utilisée ne dépend pas de
+    la durée de la simulation. Avec format="auto", un chemin en .h5 donne un
+    fichier HDF5 et tout autre chemin un dossier de blocs .npz.
+    """
+
+    def __init__(self, chemin, x, forme, noms=NOMS_CHAMPS, taille_bloc=256, format="auto"):
+        self.chemin = Path(chemin)
+        self.format = _format(chemin, format)
+        self.noms = tuple(noms)
+        self.forme = tuple(forme)
+        self.taille_bloc = taille_bloc
+        self._temps = np.empty(taille_bloc)
+        self._tampons = {nom: np.empty((taille_bloc,) + self.forme) for nom in self.noms}
+        self._n = 0
+        self.n_temps = 0
+        self._blocs = []
+
+        if self.format == "hdf5":
+            self._fichier = h5py.File(self.chemin, "w")
+            self._fichier.create_dataset("x", data=np.asarray(x, dtype=float))
+            self._fichier.create_dataset("temps", shape=(0,), maxshape=(None,),
+                                         chunks=(taille_bloc,), dtype=float)
+            for nom in self.noms:
+                self._fichier.create_dataset(nom, shape=(0,) + self.forme,
+                                             maxshape=(None,) + self.forme,
+                                             chunks=(taille_bloc,) + self.forme,
+                                             dtype=float, compression="gzip", shuffle=True)
+        else:
+            self.chemin.mkdir(parents=True, exist_ok=True)
+            for ancien in self.chemin.glob("bloc_*.npz"):
+                ancien.unlink()
+            np.save(self.chemin / "x.npy", np.asarray(x, dtype=float))
+
+    def ajouter(self, t, **champs):
+        """
+        Ajoute l'instant t ; champs : un tableau de forme `forme` par nom.
+        """
+        i = self._n
+        self._temps[i] = t
+        for nom in self.noms:
+            self._tampons[nom][i] = champs[nom]
+        self._n += 1
+        if self._n == self.taille_bloc:
+            self._vider()
+
+    def _vider(self):
+        n = self._n
+        if n == 0:
+            return
+        debut = self.n_temps
+        if self.format == "hdf5":
+            f = self._fichier
+            f["temps"].resize((debut + n,))
+            f["temps"][debut:] = self._temps[:n]
+            for nom in self.noms:
+                f[nom].resize((debut + n,) + self.forme)
+                f[nom][debut:] = self._tampons[nom][:n]
+        else:
+            nom_bloc = f"bloc_{len(self._blocs):06d}.npz"
+            np.savez_compressed(self.chemin / nom_bloc, temps=self._temps[:n],
+                                **{nom: self._tampons[nom][:n] for nom in self.noms})
+            self._blocs.append({"fichier": nom_bloc, "debut": debut, "n": n,
+                                "t_min": float(self._temps[0]), "t_max": float(self._temps[n - 1])})
+        self.n_temps += n
+        self._n = 0
+
+    def fermer(self):
+        """
+        Écrit le dernier bloc incomplet et l'index.
+        """
+        self._vider()
+        if self.format == "hdf5":
+            self._fichier.close()
+        else:
+            index = {"noms": self.noms, "forme": self.forme, "n_temps": self.n_temps,
+                     "blocs": self._blocs}
+            with open(self.chemin / "champs.json", "w") as f:
+                json.dump(index, f, indent=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+        return False
+
+
+class LecteurChamps:
+    """
+    Lecture par morceaux des champs écrits par EcrivainChamps.
+    """
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+        if self.chemin.is_dir():
+            self.format = "npz"
+            with open(self.chemin / "champs.json") as f:
+                index = json.load(f)
+            self.noms = tuple(index["noms"])
+            self._blocs = index["blocs"]
+            self.x = np.load(self.chemin / "x.npy")
+            self.temps = np.empty(index["n_temps"])
+            for bloc in self._blocs:
+                with np.load(self.chemin / bloc["fichier"]) as donnees:
+                    self.temps[bloc["debut"]:bloc["debut"] + bloc["n"]] = donnees["temps"]
+        else:
+            if h5py is None:
+                raise ImportError("h5py n'est pas installé : impossible de lire un fichier HDF5")
+            self.format = "hdf5"
+            self._fichier = h5py.File(self.chemin, "r")
+            self.noms = tuple(nom for nom in NOMS_CHAMPS if nom in self._fichier)
+            self.x = self._fichier["x"][...]
+            self.temps = self._fichier["temps"][...]
+
+    def lire(self, nom, t_min=-np.inf, t_max=np.inf, x_min=-np.inf, x_max=np.inf):
+        """
+        Champ `nom` restreint à t_min <= t <= t_max et x_min <= x <= x_max
+        (positions du premier mur pour un ensemble de murs d'épaisseurs
+        différentes). Renvoie (temps, x, valeurs), valeurs de forme
+        (n_t, ..., n_x).
+        """
+        i0 = np.searchsorted(self.temps, t_min, side="left")
+        i1 = np.searchsorted(self.temps, t_max, side="right")
+        x = self.x.reshape(-1, self.x.shape[-1])[0]
+        colonnes = np.flatnonzero((x >= x_min) & (x <= x_max))
+        j0, j1 = (colonnes[0], colonnes[-1] + 1) if len(colonnes) else (0, 0)
+
+        if self.format == "hdf5":
+            valeurs = self._fichier[nom][i0:i1, ..., j0:j1]
+        else:
+            morceaux = []
+            for bloc in self._blocs:
+                debut, fin = bloc["debut"], bloc["debut"] + bloc["n"]
+                if fin <= i0 or debut >= i1:
+                    continue
+                with np.load(self.chemin / bloc["fichier"]) as donnees:
+                    morceaux.append(donnees[nom][max(i0 - debut, 0):min(i1, fin) - debut,
+                                                 ..., j0:j1])
+            valeurs = np.concatenate(morceaux) if morceaux else np.empty((0, j1 - j0))
+        return self.temps[i0:i1], self.x[..., j0:j1], valeurs
+
+    def serie(self, nom, x, t_min=-np.inf, t_max=np.inf):
+        """
+        Évolution temporelle du champ `nom` au noeud le plus proche de x.
+        Renvoie (temps, valeurs).
+        """
+        positions = self.x.reshape(-1, self.x.shape[-1])[0]
+        j = int(np.argmin(np.abs(positions - x)))
+        temps, _, valeurs = self.lire(nom, t_min, t_max, positions[j], positions[j])
+        return temps, valeurs[..., 0]
+
+    def fermer(self):
+        if self.format == "hdf5":
+            self._fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+        return False
@@ -0,0 +1,103 @@
+"""
+Murs multicouches (enduit / plaque de MCP / laine / brique, ...).
+
+Le mur est discrétisé sur une grille uniforme ; les propriétés de chaque
+noeud et de chaque face sont calculées une seule fois :
+- capacité et chaleur latente volumiques d'un noeud : moyennes des couches
+  pondérées par leur part de son volume de contrôle ;
+- conductivité d'une face (entre deux noeuds) : moyenne harmonique des
+  couches traversées, pondérée par leurs épaisseurs (résistances en série).
+Un pas de temps ne fait alors que des produits et sommes de tableaux.
+"""
+import numpy as np
+
+from .materiau import Materiau
+
+
+class Couche:
+    """
+    Couche d'épaisseur `epaisseur` (m) d'un Materiau à paramètres scalaires
+    (avec ou sans changement de phase, éventuellement mélange MCP / isolant).
+    """
+
+    def __init__(self, materiau, epaisseur):
+        if getattr(materiau, "tabule", False):
+            raise ValueError("Les couches n'acceptent que la zone mushy linéaire")
+        self.materiau = materiau
+        self.epaisseur = float(epaisseur)
+
+
+class Multicouche:
+    """
+    Mur fait de couches, de x = 0 (extérieur) à x = L (intérieur). S'utilise
+    à la place d'un Materiau dans Mur, simuler_diffusion et simuler_piece,
+    avec L = None (épaisseur totale des couches) :
+
+        mur = Multicouche([Couche(platre, 0.013), Couche(mcp, 0.02),
+                           Couche(laine, 0.1), Couche(brique, 0.2)])
+        simuler_piece(mur, None, 200, T_ext, ...)
+
+    couches : liste de Couche ou de couples (materiau, epaisseur).
+    """
+
+    def __init__(self, couches):
+        self.couches = [c if isinstance(c, Couche) else Couche(*c) for c in couches]
+        self.epaisseur = sum(c.epaisseur for c in self.couches)
+        self.lignes = [self]
+
+    @classmethod
+    def empiler(cls, murs):
+        """
+        Plusieurs murs multicouches avancés ensemble (une ligne par mur),
+        par exemple un mur avec MCP et le même sans.
+        """
+        empile = cls(murs[0].couches)
+        empile.lignes = list(murs)
+        empile.epaisseur = np.array([m.epaisseur for m in murs])[:, None]
+        return empile
+
+    def _discretiser_ligne(self, N):
+        x = np.linspace(0.0, self.epaisseur, N)
+        dx = self.epaisseur / (N - 1)
+        bornes = np.concatenate([[0.0], np.cumsum([c.epaisseur for c in self.couches])])
+
+        def recouvrement(debut, fin):
+            # Longueur de [debut, fin] dans chaque couche : (n_intervalles, n_couches)
+            return np.maximum(np.minimum(fin[:, None], bornes[1:])
+                              - np.maximum(debut[:, None], bornes[:-1]), 0.0)
+
+        C = np.array([c.materiau.C for c in self.couches], dtype=float)
+        k = np.array([c.materiau.k_eff for c in self.couches], dtype=float)
+        L_vol = np.array([c.materiau.L_vol for c in self.couches], dtype=float)
+        T_m = np.array([c.materiau.T_m for c in self.couches], dtype=float)
+        delta = np.array([c.materiau.delta for c in self.couches], dtype=float)
+
+        # Volumes de contrôle des noeuds (demi-mailles aux bords)
+        poids = recouvrement(np.maximum(x - dx / 2, 0.0), np.minimum(x + dx / 2, self.epaisseur))
+        poids /= poids.sum(axis=1, keepdims=True)
+        C_noeud = poids @ C
+        L_noeud = poids @ L_vol
+        # Zone mushy de la couche qui apporte le plus de chaleur latente
+        dominante = np.argmax(poids * L_vol, axis=1)
+
+        # Faces : résistances des couches traversées en série
+        k_faces = dx / (recouvrement(x[:-1], x[1:]) @ (1.0 / k))
+        k_noeud = np.maximum(np.append(k_faces[:1], k_faces), np.append(k_faces, k_faces[-1:]))
+        return C_noeud, k_noeud, L_noeud, T_m[dominante], delta[dominante], k_faces
+
+    def discretiser(self, N):
+        """
+        Propriétés sur une grille de N noeuds : Materiau dont les paramètres
+        sont des tableaux d'une valeur par noeud (le k d'un noeud est la
+        plus grande conductivité de ses deux faces, pour le pas CFL) et
+        conductivités des N - 1 faces.
+        """
+        lignes = [m._discretiser_ligne(N) for m in self.lignes]
+        if len(lignes) == 1:
+            C, k, L_vol, T_m, delta, k_faces = lignes[0]
+        else:
+            C, k, L_vol, T_m, delta, k_faces = (np.array(t) for t in zip(*lignes))
+        # rho = 1 et cp = C : le Materiau reçoit directement les grandeurs volumiques
+        materiau = Materiau(1.0, C, k, L_vol, T_m, delta)
+        materiau.par_noeud = True
+        return materiau, k_faces
@@ -0,0 +1,153 @@
+import numpy as np
+
+from .champs import EcrivainChamps
+from .enregistreur import Enregistreur
+from .implicite import SolveurImplicite, theta_du_schema
+from .mur import Mur, SuiviFronts, par_cas
+from .noyau_numba import avancer_dirichlet_mur, choisir_backend
+
+
+def simuler_diffusion(materiau, L, N, T_initial, T_hot, T_cold, dt, total_time,
+                      sondes=(), pas_profil=None, suivre_interface=False,
+                      schema="explicite", backend="auto", temps_sondes=None,
+                      pas_sondes=1, reduction=None, fichier_sondes=None,
+                      fichier_profils=None, taille_bloc=8192, max_fronts=4,
+                      fichier_champs=None, pas_champs=1):
+    """
+    Diffusion dans un mur de MCP avec températures imposées aux deux bords,
+    comme dans simulation_diffusion.py.
+
+    sondes : indices des noeuds dont on relève T, tous les pas_sondes pas.
+    temps_sondes : si donné, les sondes ne sont relevées qu'à ces instants
+    (arrondis au pas de temps le plus proche, comme le nombre de pas), par
+    exemple les instants d'un relevé expérimental.
+    reduction : "min", "max" ou "moyenne" de chaque fenêtre de pas_sondes
+    pas au lieu d'un échantillon.
+    pas_profil : si donné, un profil complet est stocké tous les pas_profil pas.
+    suivre_interface : relève la position des fronts solide/liquide
+    (T = T_m, celle de la couche de MCP d'un mur multicouche), au plus
+    max_fronts, aux mêmes instants que les sondes (pas_sondes ou
+    temps_sondes) ; "interface" est le premier front en
+    partant de x = 0 et "fronts" les contient tous (nan au-delà du nombre
+    de fronts présents), datés par "temps_interface".
+    fichier_sondes, fichier_profils : fichiers .npy où les relevés sont
+    écrits au fil du calcul (mémoire bornée quelle que soit la durée).
+    fichier_champs : champs T, H et fraction liquide complets écrits tous
+    les pas_champs pas, par blocs compressés (voir EcrivainChamps et
+    LecteurChamps).
+    schema : "explicite", "implicite" (Euler) ou "crank-nicolson" ; les deux
+    derniers restent stables pour des dt bien plus grands.
+    backend : "numpy", "numba" ou "auto" pour le schéma explicite.
+
+    Pour un ensemble de cas (voir Materiau.ensemble), L, T_initial, T_hot et
+    T_cold peuvent être des listes d'une valeur par cas : tous les cas sont
+    avancés ensemble et les sondes sont de forme (n_releves, n_cas, n_sondes).
+    Renvoie un dictionnaire de tableaux NumPy ; "temps" date les relevés
+    des sondes et "fraction" est la fraction liquide finale de chaque noeud.
+    """
+    num_steps = int(total_time / dt)
+    if temps_sondes is not None:
+        # Même arrondi que les instants des sondes : un dernier instant
+        # égal à total_time est atteint même si total_time / dt tombe juste
+        # sous un entier
+        num_steps = int(np.rint(total_time / dt))
+    mur = Mur(materiau, par_cas(L), N, par_cas(T_initial))
+    T_hot, T_cold = par_cas(T_hot), par_cas(T_cold)
+    mur.imposer_T_bords(T_hot, T_cold)
+    if suivre_interface and mur.H.ndim > 1:
+        raise ValueError("Le suivi d'interface ne porte que sur un seul cas")
+    theta = theta_du_schema(schema)
+    solveur = SolveurImplicite(mur, theta) if theta is not None else None
+
+    sondes = list(sondes)
+    releve = Enregistreur(num_steps, mur.H.shape[:-1] + (len(sondes),), dt, pas_sondes,
+                          temps_sondes, reduction or (), fichier_sondes)
+    if pas_profil:
+        profils = Enregistreur(num_steps, mur.T.shape, dt, pas_profil, fichier=fichier_profils)
+    if suivre_interface:
+        fronts = Enregistreur(num_steps, (max_fronts,), dt, pas_sondes, temps_sondes)
+        ligne_fronts = np.empty(max_fronts)
+    if fichier_champs is not None:
+        champs = EcrivainChamps(fichier_champs, mur.x, mur.T.shape)
+
+    def ecrire_champs(n):
+        if fichier_champs is not None and n % pas_champs == 0:
+            champs.ajouter(n * dt, T=mur.T, H=mur.H, fraction=mur.fraction)
+
+    if solveur is None and choisir_backend(backend, mur.materiau) == "numba":
+        # Noyau compilé, appelé par blocs ; les sondes de chaque bloc passent
+        # par un tampon de taille fixe avant d'être relevées
+        arrets = set(range(0, num_steps, taille_bloc)) | {num_steps}
+        if pas_profil:
+            arrets.update(range(0, num_steps, pas_profil))
+        if fichier_champs is not None:
+            arrets.update(range(0, num_steps, pas_champs))
+        arrets = sorted(arrets)
+        T_bloc = np.empty((taille_bloc,) + releve.forme)
+        x_bloc = np.empty((taille_bloc, max_fronts))
+        for debut, fin in zip(arrets[:-1], arrets[1:]):
+            if pas_profil:
+                profils.ajouter(debut, mur.T)
+            ecrire_champs(debut)
+            avancer_dirichlet_mur(mur, fin - debut, dt, sondes,
+                                  T_bloc[:fin - debut], x_bloc[:fin - debut])
+            releve.ajouter_bloc(debut, T_bloc[:fin - debut])
+            if suivre_interface:
+                fronts.ajouter_bloc(debut, x_bloc[:fin - debut])
+    else:
+        if suivre_interface:
+            suivi = SuiviFronts(mur)
+        for n in range(num_steps):
+            T = mur.T
+            releve.ajouter(n, T[..., sondes])
+
+            # Suivi des fronts solide/liquide
+            if suivre_interface:
+                positions = suivi.positions()[:max_fronts]
+                ligne_fronts[:] = np.nan
+                ligne_fronts[:len(positions)] = positions
+                fronts.ajouter(n, ligne_fronts)
+
+            # Stockage pour affichage des profils
+            if pas_profil:
+                profils.ajouter(n, T)
+            ecrire_champs(n)
+
+            if solveur is None:
+                mur.pas_explicite(dt)
+            else:
+                solveur.pas(dt, (1.0, 0.0, T_hot), (1.0, 0.0, T_cold))
+            if suivre_interface:
+                suivi.mettre_a_jour()
+
+    if temps_sondes is not None:
+        # Relevés à la fin de la simulation ; ceux au-delà restent à nan
+        releve.ajouter(num_steps, mur.T[..., sondes])
+        if suivre_interface:
+            positions = SuiviFronts(mur).positions()[:max_fronts]
+            ligne_fronts[:] = np.nan
+            ligne_fronts[:len(positions)] = positions
+            fronts.ajouter(num_steps, ligne_fronts)
+    donnees = releve.terminer()
+    if fichier_champs is not None:
+        champs.fermer()
+    if suivre_interface:
+        x_fronts = fronts.terminer()["valeurs"]
+        avec_front = ~np.isnan(x_fronts[:, 0])
+        temps_interface, x_fronts = fronts.temps[avec_front], x_fronts[avec_front]
+    else:
+        temps_interface, x_fronts = np.empty(0), np.empty((0, max_fronts))
+
+    return {
+        "x": mur.x,
+        "T": mur.T.copy(),
+        "H": mur.H.copy(),
+        "fraction": mur.fraction.copy(),
+        "temps": releve.temps,
+        "sondes": donnees[reduction or "valeurs"],
+        "profils": profils.terminer()["valeurs"] if pas_profil else np.array([]),
+        "temps_profils": profils.temps if pas_profil else np.array([]),
+        "temps_interface": temps_interface,
+        "interface": x_fronts[:, 0],
+        "fronts": x_fronts,
+    }
@@ -0,0 +1,159 @@
+"""
+Relevés d'une grandeur au cours d'une simulation (sondes, profils).
+
+Les tableaux de relevés sont alloués une seule fois, éventuellement dans un
+fichier .npy projeté en mémoire : la mémoire utilisée ne dépend pas de la
+durée de la simulation.
+"""
+from pathlib import Path
+
+import numpy as np
+
+REDUCTIONS = ("min", "max", "moyenne")
+
+
+class Enregistreur:
+    """
+    Relève des valeurs de forme `forme` sur une simulation de n_pas pas de dt.
+
+    - par défaut, un relevé tous les `pas` pas ;
+    - avec `temps`, un relevé à chacun de ces instants (arrondis au pas le
+      plus proche ; ceux au-delà de la simulation restent à nan) ;
+    - avec `reductions` (parmi "min", "max", "moyenne"), chaque fenêtre de
+      `pas` pas est résumée au lieu d'être échantillonnée ; le relevé est
+      daté du début de sa fenêtre.
+
+    Avec `fichier`, les relevés sont écrits dans un .npy projeté en mémoire
+    (un fichier par réduction, suffixé par son nom s'il y en a plusieurs).
+    Les relevés sont dans le dictionnaire `donnees` ("valeurs" sans
+    réduction), datés par `temps`.
+    """
+
+    def __init__(self, n_pas, forme, dt=1.0, pas=1, temps=None, reductions=(), fichier=None):
+        self.forme = tuple(forme)
+        self.pas = pas
+        if isinstance(reductions, str):
+            reductions = (reductions,)
+        self.reductions = tuple(reductions)
+        inconnues = set(self.reductions) - set(REDUCTIONS)
+        if inconnues:
+            raise ValueError(f"Réductions inconnues : {sorted(inconnues)}")
+
+        if temps is not None:
+            if self.reductions:
+                raise ValueError("Les réductions portent sur des fenêtres de pas, pas sur des instants")
+            pas_cibles = np.rint(np.asarray(temps, dtype=float) / dt).astype(int)
+            self._ordre = np.argsort(pas_cibles, kind="stable")
+            self._cibles = pas_cibles[self._ordre]
+            self._k = 0
+            self.temps = pas_cibles * dt
+        else:
+            self._cibles = None
+            self.temps = np.arange(0, n_pas, pas) * dt
+        self._n = len(self.temps)
+
+        noms = self.reductions or ("valeurs",)
+        self.donnees = {}
+        for nom in noms:
+            tableau = self._allouer(fichier, nom if len(noms) > 1 else None)
+            tableau[...] = np.nan
+            self.donnees[nom] = tableau
+
+        if self.reductions:
+            self._fenetre = -1
+            self._compte = 0
+            self._min = np.empty(self.forme)
+            self._max = np.empty(self.forme)
+            self._somme = np.empty(self.forme)
+
+    def _allouer(self, fichier, suffixe):
+        forme = (self._n,) + self.forme
+        if fichier is None:
+            return np.empty(forme)
+        chemin = Path(fichier)
+        if suffixe is not None:
+            chemin = chemin.with_name(f"{chemin.stem}_{suffixe}{chemin.suffix}")
+        return np.lib.format.open_memmap(chemin, mode="w+", dtype=float, shape=forme)
+
+    def ajouter(self, n, valeurs):
+        """
+        Valeurs au pas n. Les pas doivent être présentés dans l'ordre.
+        """
+        if self._cibles is not None:
+            cibles, k = self._cibles, self._k
+            while k < self._n and cibles[k] <= n:
+                self.donnees["valeurs"][self._ordre[k]] = valeurs
+                k += 1
+            self._k = k
+        elif not self.reductions:
+            if n % self.pas == 0 and n // self.pas < self._n:
+                self.donnees["valeurs"][n // self.pas] = valeurs
+        elif n // self.pas < self._n:
+            self._accumuler(n // self.pas, valeurs, valeurs, valeurs, 1)
+
+    def ajouter_bloc(self, n0, valeurs):
+        """
+        Valeurs des pas n0, n0 + 1, ... (premier axe de `valeurs`), traitées
+        sans boucle sur les pas.
+        """
+        n1 = n0 + len(valeurs)
+        if self._cibles is not None:
+            debut = max(self._k, np.searchsorted(self._cibles, n0))
+            fin = np.searchsorted(self._cibles, n1)
+            self.donnees["valeurs"][self._ordre[debut:fin]] = valeurs[self._cibles[debut:fin] - n0]
+            self._k = max(self._k, fin)
+        elif not self.reductions:
+            pas = np.arange(-(-n0 // self.pas) * self.pas, min(n1, self._n * self.pas), self.pas)
+            self.donnees["valeurs"][pas // self.pas] = valeurs[pas - n0]
+        else:
+            fenetres = np.arange(n0, n1) // self.pas
+            garder = fenetres < self._n
+            fenetres, valeurs = fenetres[garder], valeurs[garder]
+            if len(fenetres) == 0:
+                return
+            bornes = np.flatnonzero(np.diff(fenetres, prepend=-1))
+            comptes = np.diff(np.append(bornes, len(fenetres)))
+            mins = np.minimum.reduceat(valeurs, bornes, axis=0)
+            maxs = np.maximum.reduceat(valeurs, bornes, axis=0)
+            sommes = np.add.reduceat(valeurs, bornes, axis=0)
+            for j, i in enumerate(bornes):
+                self._accumuler(fenetres[i], mins[j], maxs[j], sommes[j], comptes[j])
+
+    def _accumuler(self, fenetre, mini, maxi, somme, compte):
+        if fenetre != self._fenetre:
+            self._vider()
+            self._fenetre = fenetre
+            self._min[...] = mini
+            self._max[...] = maxi
+            self._somme[...] = somme
+            self._compte = compte
+        else:
+            np.minimum(self._min, mini, out=self._min)
+            np.maximum(self._max, maxi, out=self._max)
+            self._somme += somme
+            self._compte += compte
+
+    def _vider(self):
+        # Écrit la fenêtre en cours
+        if self._fenetre < 0:
+            return
+        f = self._fenetre
+        if "min" in self.donnees:
+            self.donnees["min"][f] = self._min
+        if "max" in self.donnees:
+            self.donnees["max"][f] = self._max
+        if "moyenne" in self.donnees:
+            self.donnees["moyenne"][f] = self._somme / self._compte
+        self._fenetre = -1
+
+    def terminer(self):
+        """
+        Écrit la dernière fenêtre (éventuellement incomplète), vide les
+        fichiers projetés et renvoie `donnees`.
+        """
+        if self.reductions:
+            self._vider()
+        for tableau in self.donnees.values():
+            if isinstance(tableau, np.memmap):
+                tableau.flush()
+        return self.donnees
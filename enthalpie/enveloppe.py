@@ -0,0 +1,215 @@
+"""
+Enveloppe complète d'une pièce : murs, toiture et plancher couplés au même
+noeud d'air.
+
+Chaque paroi a sa composition, son épaisseur, son aire et ses échanges ;
+toutes sont discrétisées au même pas dx (à peu près) et rangées dans un
+seul tableau (n_parois, N_max). Une paroi plus mince que la plus épaisse
+est complétée côté extérieur par des noeuds de remplissage, isolés par
+des faces de conductance nulle et jamais mis à jour. La face intérieure
+de toutes les parois est donc la dernière colonne, et un pas de
+l'enveloppe coûte à peu près un pas d'un seul mur de Piece.
+
+Le schéma est explicite, sous forme de flux (volumes de contrôle centrés
+sur les noeuds, demi-volumes aux deux faces) :
+    V * dH/dt = flux entrant - flux sortant
+    C_room * dT_room/dt = somme des A * h_int * (T_intérieure - T_room)
+"""
+import numpy as np
+
+from .couches import Couche, Multicouche
+from .materiau import Materiau
+from .meteo import valeurs_forcage
+
+
+class Paroi:
+    """
+    Paroi de l'enveloppe : `construction` est un Materiau (paramètres
+    scalaires, avec `epaisseur` en m) ou un Multicouche. aire en m^2,
+    h_int le coefficient d'échange avec l'air de la pièce (W/(m^2.K)) et
+    h_ext celui avec l'extérieur ; h_ext = None impose T_ext à la face
+    extérieure (comme Piece).
+    """
+
+    def __init__(self, construction, aire, epaisseur=None, h_int=8.0, h_ext=None, nom=None):
+        if not isinstance(construction, Multicouche):
+            if epaisseur is None:
+                raise ValueError("L'épaisseur d'une paroi homogène est obligatoire")
+            construction = Multicouche([Couche(construction, epaisseur)])
+        elif epaisseur is not None and epaisseur != construction.epaisseur:
+            raise ValueError("epaisseur doit être celle des couches (ou None)")
+        self.construction = construction
+        self.epaisseur = construction.epaisseur
+        self.aire = float(aire)
+        self.h_int = float(h_int)
+        self.h_ext = h_ext
+        self.nom = nom
+
+
+class Enveloppe:
+    """
+    Parois (liste de Paroi) autour d'un noeud d'air de capacité C_room
+    (J/K), discrétisées au pas dx : chaque paroi a au moins 3 noeuds.
+    T_init_wall est une valeur ou une liste d'une valeur par paroi.
+    """
+
+    def __init__(self, parois, dx, C_room, T_init_wall, T_room_init):
+        self.parois = list(parois)
+        n = len(self.parois)
+        self.n = n
+        self.C_room = float(C_room)
+
+        N = [max(int(round(p.epaisseur / dx)) + 1, 3) for p in self.parois]
+        N_max = max(N)
+        self.N = np.array(N)
+        self.N_max = N_max
+        # Premier noeud réel (face extérieure) de chaque paroi
+        self.debut = N_max - self.N
+        self.dx = np.array([p.epaisseur / (Ni - 1) for p, Ni in zip(self.parois, N)])
+
+        # Propriétés par noeud et par face ; remplissage : C = 1, L = 0, k = 0
+        C = np.ones((n, N_max))
+        k = np.zeros((n, N_max))
+        L_vol = np.zeros((n, N_max))
+        T_m = np.zeros((n, N_max))
+        delta = np.ones((n, N_max))
+        G = np.zeros((n, N_max - 1))
+        inv_V = np.zeros((n, N_max))
+        for r, (paroi, Ni) in enumerate(zip(self.parois, N)):
+            s = N_max - Ni
+            Cr, kr, Lr, T_mr, deltar, k_faces = paroi.construction._discretiser_ligne(Ni)
+            C[r, s:], k[r, s:], L_vol[r, s:], T_m[r, s:], delta[r, s:] = Cr, kr, Lr, T_mr, deltar
+            G[r, s:] = k_faces / self.dx[r]
+            inv_V[r, s:] = 1.0 / self.dx[r]
+            inv_V[r, [s, -1]] = 2.0 / self.dx[r]
+        self.materiau = Materiau(1.0, C, k, L_vol, T_m, delta)
+        self.materiau.par_noeud = True
+        self._G = G
+
+        # Faces extérieures : indices dans les tableaux aplatis (n * N_max)
+        self._exterieur = np.arange(n) * N_max + self.debut
+        self._dirichlet = np.array([p.h_ext is None for p in self.parois])
+        self._robin = ~self._dirichlet
+        d = self._exterieur[self._dirichlet]
+        self._exterieur_dirichlet = d
+        self._exterieur_robin = self._exterieur[self._robin]
+        # Matériau des faces extérieures imposées (pour H = H(T_ext))
+        self._materiau_dirichlet = Materiau(*(np.ravel(a)[d] for a in
+                                              (np.ones_like(C), C, k, L_vol, T_m, delta)))
+        self._h_ext = np.array([p.h_ext for p in self.parois if p.h_ext is not None])
+        # Les faces extérieures imposées ne sont pas avancées par le schéma
+        inv_V[self._dirichlet, self.debut[self._dirichlet]] = 0.0
+        self._inv_V = inv_V
+        self._h_int = np.array([p.h_int for p in self.parois])
+        self._A_h_int = np.array([p.aire for p in self.parois]) * self._h_int
+
+        T = np.zeros((n, N_max))
+        for r in range(n):
+            T[r, self.debut[r]:] = np.broadcast_to(T_init_wall, (n,))[r]
+        self.H = self.materiau.compute_H(T)
+        self.T = np.empty((n, N_max))
+        self.fraction = np.empty((n, N_max))
+        self.materiau.T_from_H(self.H, out=self.T, fraction=self.fraction)
+        self.T_room = float(T_room_init)
+
+        self._flux = np.empty((n, N_max - 1))
+        self._net = np.empty((n, N_max))
+        self._T_ext = np.empty(n)
+        self.flux_interieur = np.empty(n)
+
+    def pas_max(self):
+        """
+        Pas de temps maximal du schéma explicite (noeud le plus contraint
+        et air de la pièce).
+        """
+        G_noeud = np.zeros((self.n, self.N_max))
+        G_noeud[:, 1:] += self._G
+        G_noeud[:, :-1] += self._G
+        G_noeud.ravel()[self._exterieur_robin] += self._h_ext
+        G_noeud[:, -1] += self._h_int
+        with np.errstate(divide="ignore"):
+            dt_noeud = self.materiau.C / (G_noeud * self._inv_V)
+        return min(float(np.min(dt_noeud)), self.C_room / float(np.sum(self._A_h_int)))
+
+    def pas(self, dt, T_ext_val):
+        """
+        Avance les parois et l'air d'un pas dt ; T_ext_val est une valeur
+        ou une valeur par paroi.
+        """
+        T, H, flux, net = self.T, self.H, self._flux, self._net
+        T_ext = self._T_ext
+        T_ext[...] = T_ext_val
+
+        # Faces extérieures imposées
+        if len(self._exterieur_dirichlet):
+            T_ext_d = T_ext[self._dirichlet]
+            T.ravel()[self._exterieur_dirichlet] = T_ext_d
+            H.ravel()[self._exterieur_dirichlet] = self._materiau_dirichlet.compute_H(T_ext_d)
+
+        # Flux intérieurs (vers l'air), partagés par les parois et la pièce
+        np.subtract(T[:, -1], self.T_room, out=self.flux_interieur)
+        self.flux_interieur *= self._h_int
+
+        # Conduction : flux de la face i, de i + 1 vers i
+        np.subtract(T[:, 1:], T[:, :-1], out=flux)
+        flux *= self._G
+        np.subtract(flux[:, 1:], flux[:, :-1], out=net[:, 1:-1])
+        net[:, 0] = flux[:, 0]
+        np.negative(flux[:, -1], out=net[:, -1])
+        net[:, -1] -= self.flux_interieur
+        # Échange avec l'extérieur des faces non imposées
+        if len(self._exterieur_robin):
+            robin = self._exterieur_robin
+            net.ravel()[robin] += self._h_ext * (T_ext[self._robin] - T.ravel()[robin])
+        net *= self._inv_V
+        net *= dt
+        H += net
+        self.materiau.T_from_H(H, out=T, fraction=self.fraction)
+
+        self.T_room += dt / self.C_room * float(self._A_h_int @ self.flux_interieur)
+
+    def profil(self, r):
+        """
+        Positions (m, depuis la face extérieure) et températures des noeuds
+        de la paroi r.
+        """
+        return (np.linspace(0.0, self.parois[r].epaisseur, self.N[r]),
+                self.T[r, self.debut[r]:].copy())
+
+
+def simuler_enveloppe(parois, dx, T_ext, dt, total_time, C_room, T_init_wall, T_room_init,
+                      pas_releve=100, taille_bloc=8192):
+    """
+    Simulation d'une pièce et de toute son enveloppe sur total_time
+    secondes. T_ext(t) renvoie une valeur commune ou une valeur par paroi
+    (orientations, sol, ...). Relevés tous les pas_releve pas, aux noms de
+    simuler_piece : "temps", "T_ext" et "T_interieur" (une colonne par
+    paroi), "T_room", ainsi que "flux_interieur" (W/m^2, de chaque paroi
+    vers l'air). T_ext est évaluée par blocs de taille_bloc pas (voir
+    simuler_piece).
+    """
+    enveloppe = Enveloppe(parois, dx, C_room, T_init_wall, T_room_init)
+    if dt > enveloppe.pas_max():
+        raise ValueError(f"dt = {dt} s dépasse la limite de stabilité "
+                         f"({enveloppe.pas_max():.3g} s)")
+    steps = int(total_time / dt)
+    n_releves = (steps + pas_releve - 1) // pas_releve
+    n = enveloppe.n
+    releves = {"temps": np.empty(n_releves), "T_ext": np.empty((n_releves, n)),
+               "T_room": np.empty(n_releves), "T_interieur": np.empty((n_releves, n)),
+               "flux_interieur": np.empty((n_releves, n))}
+    for step in range(steps):
+        t = step * dt
+        if step % taille_bloc == 0:
+            T_ext_vals = valeurs_forcage(T_ext, np.arange(step, min(step + taille_bloc, steps)) * dt)
+        T_ext_val = T_ext_vals[step % taille_bloc]
+        enveloppe.pas(dt, T_ext_val)
+        if step % pas_releve == 0:
+            j = step // pas_releve
+            releves["temps"][j] = t
+            releves["T_ext"][j] = T_ext_val
+            releves["T_room"][j] = enveloppe.T_room
+            releves["T_interieur"][j] = enveloppe.T[:, -1]
+            releves["flux_interieur"][j] = enveloppe.flux_interieur
+    releves["enveloppe"] = enveloppe
+    return releves
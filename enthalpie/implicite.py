@@ -0,0 +1,185 @@
+import numpy as np
+
+try:
+    from scipy.linalg import solve_banded
+except ImportError:  # l'algorithme de Thomas en NumPy prend le relais
+    solve_banded = None
+
+
+def resoudre_tridiagonal(sous, diag, sur, d, out=None):
+    """
+    Résout le système tridiagonal sous*x[i-1] + diag*x[i] + sur*x[i+1] = d
+    sur le dernier axe ; les axes précédents sont des systèmes indépendants.
+    sous[..., 0] et sur[..., -1] sont ignorés.
+    """
+    if out is None:
+        out = np.empty_like(d)
+    n = d.shape[-1]
+
+    if solve_banded is not None:
+        # Un seul système bande pour tous les cas : blocs mis bout à bout,
+        # sans couplage entre deux blocs voisins
+        forme = d.shape
+        ab = np.empty((3, d.size))
+        bande = np.broadcast_to(sur, forme).copy()
+        bande[..., -1] = 0.0
+        ab[0, 0] = 0.0
+        ab[0, 1:] = bande.reshape(-1)[:-1]
+        ab[1] = np.broadcast_to(diag, forme).reshape(-1)
+        bande = np.broadcast_to(sous, forme).copy()
+        bande[..., 0] = 0.0
+        ab[2, :-1] = bande.reshape(-1)[1:]
+        ab[2, -1] = 0.0
+        out[...] = solve_banded((1, 1), ab, d.reshape(-1), overwrite_ab=True,
+                                check_finite=False).reshape(forme)
+        return out
+
+    # Algorithme de Thomas : élimination descendante puis remontée
+    c = np.empty_like(d)
+    c[..., 0] = sur[..., 0] / diag[..., 0]
+    out[..., 0] = d[..., 0] / diag[..., 0]
+    for i in range(1, n):
+        m = 1.0 / (diag[..., i] - sous[..., i] * c[..., i - 1])
+        c[..., i] = sur[..., i] * m
+        out[..., i] = (d[..., i] - sous[..., i] * out[..., i - 1]) * m
+    for i in range(n - 2, -1, -1):
+        out[..., i] -= c[..., i] * out[..., i + 1]
+    return out
+
+
+class NonConvergence(RuntimeError):
+    """
+    Les itérations non linéaires d'un pas implicite n'ont pas atteint tol
+    en max_iter itérations : le pas est à refaire (dt plus petit).
+    """
+
+
+class SolveurImplicite:
+    """
+    Schéma implicite en theta pour un Mur : theta = 1 donne Euler implicite,
+    theta = 0.5 Crank-Nicolson. Inconditionnellement stable (theta >= 0.5).
+
+    La non-linéarité de T_from_H est traitée par itérations sur la capacité
+    apparente : on résout le système linéarisé en T, on corrige
+    H += dH/dT * (T* - T), puis T = T_from_H(H), jusqu'à ce que T* et T
+    coïncident à tol près.
+
+    Les bords sont des équations algébriques a*T_bord + b*T_voisin = d
+    (Dirichlet : a = 1, b = 0, d = T imposée).
+    """
+
+    def __init__(self, mur, theta=1.0, tol=1e-6, max_iter=50):
+        self.mur = mur
+        self.theta = theta
+        self.tol = tol
+        self.max_iter = max_iter
+
+        forme = mur.H.shape
+        self._sous = np.empty(forme)
+        self._diag = np.empty(forme)
+        self._sur = np.empty(forme)
+        self._d = np.empty(forme)
+        self._r = np.empty(forme)
+        self._C_app = np.empty(forme)
+        self._T_etoile = np.empty(forme)
+        self._a_th = np.zeros(forme)
+        self.iterations = 0
+
+    def pas(self, dt, bord_gauche, bord_droit):
+        """
+        Avance le mur de dt. bord_gauche et bord_droit sont des triplets
+        (a, b, d) scalaires ou de forme (..., 1). Renvoie le nombre
+        d'itérations non linéaires effectuées ; lève NonConvergence si tol
+        n'est pas atteinte en max_iter itérations (le mur est alors dans
+        l'état de la dernière itération).
+        """
+        mur = self.mur
+        materiau = mur.materiau
+        H, T = mur.H, mur.T
+
+        # Partie explicite : r = H^n + (1 - theta) * dt * k * d2T^n/dx^2
+        r = self._r
+        r[...] = H
+        faces = mur._coef_faces
+        if self.theta < 1.0:
+            lap = mur._lap
+            if faces is None:
+                np.add(T[..., 2:], T[..., :-2], out=lap)
+                lap -= T[..., 1:-1]
+                lap -= T[..., 1:-1]
+                lap *= (1.0 - self.theta) * dt * mur._coef_lap
+            else:
+                flux = mur._flux
+                np.subtract(T[..., 1:], T[..., :-1], out=flux)
+                flux *= faces
+                np.subtract(flux[..., 1:], flux[..., :-1], out=lap)
+                lap *= (1.0 - self.theta) * dt
+            r[..., 1:-1] += lap
+
+        # Coefficients constants de la matrice (noeuds internes) ; pour un
+        # mur multicouche, a_th est la somme des coefficients des deux faces
+        sous, diag, sur, d = self._sous, self._diag, self._sur, self._d
+        if faces is None:
+            a_th = 2 * self.theta * dt * mur._coef_lap
+            sous[...] = -a_th / 2
+            sur[...] = -a_th / 2
+        else:
+            sous[..., 1:] = -self.theta * dt * faces
+            sur[..., :-1] = -self.theta * dt * faces
+            a_th = self._a_th
+            np.add(sous[..., 1:-1], sur[..., 1:-1], out=a_th[..., 1:-1])
+            a_th[..., 1:-1] *= -1.0
+
+        a0, b0, d0 = bord_gauche
+        aN, bN, dN = bord_droit
+        C_app = self._C_app
+        T_etoile = self._T_etoile
+
+        for iteration in range(1, self.max_iter + 1):
+            materiau.capacite_apparente(mur.fraction, out=C_app, T=T)
+
+            # C_app * T* - theta*dt*k*d2T*/dx^2 = C_app * T - H + r
+            np.add(C_app, a_th, out=diag)
+            np.multiply(C_app, T, out=d)
+            d -= H
+            d += r
+
+            diag[..., :1] = a0
+            sur[..., :1] = b0
+            d[..., :1] = d0
+            diag[..., -1:] = aN
+            sous[..., -1:] = bN
+            d[..., -1:] = dN
+
+            resoudre_tridiagonal(sous, diag, sur, d, out=T_etoile)
+
+            # Correction de l'enthalpie puis retour à la température
+            H[..., 1:-1] += C_app[..., 1:-1] * (T_etoile[..., 1:-1] - T[..., 1:-1])
+            bords = slice(None, None, mur.N - 1)
+            mur.materiau_bords.compute_H(T_etoile[..., bords], out=H[..., bords])
+            mur.mettre_a_jour_T()
+
+            ecart = np.max(np.abs(T_etoile - T))
+            if ecart < self.tol:
+                break
+        else:
+            self.iterations = iteration
+            raise NonConvergence(f"Pas implicite non convergé en {self.max_iter} itérations "
+                                 f"(écart {ecart:.2e} °C > tol = {self.tol:.0e})")
+
+        self.iterations = iteration
+        return iteration
+
+
+# Valeur de theta associée à chaque schéma (None : schéma explicite)
+SCHEMAS = {"explicite": None, "implicite": 1.0, "crank-nicolson": 0.5}
+
+
+def theta_du_schema(schema):
+    """
+    Renvoie theta pour un nom de schéma ("explicite", "implicite" ou
+    "crank-nicolson").
+    """
+    if schema not in SCHEMAS:
+        raise ValueError(f"Schéma inconnu : {schema!r} (attendu : {', '.join(SCHEMAS)})")
+    return SCHEMAS[schema]
@@ -0,0 +1,321 @@
+import json
+
+import numpy as np
+
+
+class Materiau:
+    """
+    Matériau à changement de phase décrit par la méthode enthalpique.
+
+    Le noeud peut être un mélange de MCP (fraction p) et d'un isolant
+    (laine de verre : rho_v, cp_v, k_v). Avec p = 1 on retrouve le MCP pur
+    et avec L_latent = 0 un matériau classique sans changement de phase.
+
+    Les constantes utilisées à chaque pas (H_low, H_high, pente de la zone
+    mushy) sont calculées une seule fois ici.
+    """
+
+    # Zone mushy linéaire et paramètres par mur, que les noyaux Numba
+    # savent traiter (par_noeud : paramètres d'un mur multicouche)
+    tabule = False
+    par_noeud = False
+
+    def __init__(self, rho, cp, k, L_latent=0.0, T_m=0.0, delta=1.0,
+                 p=1.0, rho_v=0.0, cp_v=0.0, k_v=0.0):
+        self.rho = rho
+        self.cp = cp
+        self.k = k
+        self.L_latent = L_latent
+        self.T_m = T_m
+        self.delta = delta
+        self.p = p
+        self.rho_v = rho_v
+        self.cp_v = cp_v
+        self.k_v = k_v
+
+        # Grandeurs effectives du mélange MCP / isolant
+        self.C = rho * cp * p + rho_v * cp_v * (1 - p)     # J/(m^3.K)
+        self.k_eff = k * p + k_v * (1 - p)                 # W/(m.K)
+        self.L_vol = rho * L_latent * p                    # J/m^3
+
+        # Bornes de la zone mushy en température et en enthalpie
+        self.T_low = T_m - delta
+        self.T_high = T_m + delta
+        self.H_low = self.C * self.T_low
+        self.H_high = self.C * self.T_high + self.L_vol
+        # Pente de la chaleur latente dans la zone mushy (J/(m^3.K))
+        self.pente_mushy = self.L_vol / (2 * delta)
+
+        self._inv_C = 1.0 / self.C
+        self._inv_2delta = 1.0 / (2 * delta)
+        self._inv_dH = 1.0 / (self.H_high - self.H_low)
+
+    @classmethod
+    def depuis_json(cls, chemin, **kwargs):
+        """
+        Construit le matériau à partir d'un fichier comme paraffine.json.
+        """
+        with open(chemin, "r") as f:
+            params = json.load(f)
+        params.update(kwargs)
+        return cls(**params)
+
+    @classmethod
+    def empiler(cls, materiaux):
+        """
+        Regroupe plusieurs matériaux en un seul dont les paramètres sont de
+        forme (n, 1) : chaque ligne d'un tableau (n, N) suit son matériau.
+        """
+        noms = ("rho", "cp", "k", "L_latent", "T_m", "delta",
+                "p", "rho_v", "cp_v", "k_v")
+        params = {nom: np.array([getattr(m, nom) for m in materiaux], dtype=float)[:, None]
+                  for nom in noms}
+        return cls(**params)
+
+    @classmethod
+    def ensemble(cls, **params):
+        """
+        Matériau d'un ensemble de cas : chaque paramètre est un scalaire ou
+        une liste d'une valeur par cas, par exemple k=[0.18, 0.19]. Les
+        paramètres sont ramenés à la forme (n_cas, 1).
+        """
+        valeurs = np.broadcast_arrays(*[np.atleast_1d(np.asarray(v, dtype=float))
+                                        for v in params.values()])
+        return cls(**{nom: v[:, None] for nom, v in zip(params, valeurs)})
+
+    def noeuds(self, indices):
+        """
+        Matériau restreint aux noeuds `indices` (dernier axe) d'un matériau
+        défini noeud par noeud ; un matériau ordinaire est renvoyé tel quel.
+        """
+        if not self.par_noeud:
+            return self
+        forme = np.shape(self.C)
+        noms = ("rho", "cp", "k", "L_latent", "T_m", "delta", "p", "rho_v", "cp_v", "k_v")
+        restreint = Materiau(**{nom: np.broadcast_to(getattr(self, nom), forme)[..., indices]
+                                for nom in noms})
+        restreint.par_noeud = True
+        return restreint
+
+    def compute_H(self, T, out=None):
+        """
+        Calcule l'enthalpie H pour une température T donnée.
+        """
+        T = np.asarray(T, dtype=float)
+        # Fraction liquide : 0 en dessous de T_m - delta, 1 au-dessus de T_m + delta
+        f = np.minimum(np.maximum((T - self.T_low) * self._inv_2delta, 0.0), 1.0)
+        return np.add(self.C * T, self.L_vol * f, out=out)
+
+    def T_from_H(self, H, out=None, fraction=None):
+        """
+        Calcule la température T à partir de l'enthalpie H.
+
+        La fraction liquide f = clip((H - H_low) / (H_high - H_low), 0, 1)
+        donne directement T = (H - L_vol * f) / C dans les trois zones, sans
+        masque booléen. Si `fraction` est fourni, f y est écrite.
+        """
+        H = np.asarray(H, dtype=float)
+        if fraction is None:
+            fraction = np.empty_like(H)
+        np.subtract(H, self.H_low, out=fraction)
+        fraction *= self._inv_dH
+        np.maximum(fraction, 0.0, out=fraction)
+        np.minimum(fraction, 1.0, out=fraction)
+
+        if out is None:
+            out = np.empty_like(H)
+        np.multiply(fraction, -self.L_vol, out=out)
+        out += H
+        out *= self._inv_C
+        return out
+
+    def capacite_apparente(self, fraction, out=None, T=None):
+        """
+        Capacité apparente dH/dT : C hors de la zone mushy, C + pente_mushy
+        dedans (fraction liquide strictement entre 0 et 1). T ne sert qu'aux
+        matériaux tabulés.
+        """
+        mushy = (fraction > 0.0) & (fraction < 1.0)
+        return np.add(self.C, self.pente_mushy * mushy, out=out)
+
+
+class MateriauTabule(Materiau):
+    """
+    Matériau dont la fraction liquide f(T) est une courbe monotone
+    quelconque au lieu de la rampe linéaire de largeur 2 * delta : courbe
+    mesurée (voir depuis_refroidissement) ou construite à partir des
+    paramètres (depuis_materiau, depuis_json).
+
+    f(T) est rééchantillonnée sur une grille uniforme en T, et f(H) sur une
+    grille uniforme en H entre H_low et H_high : T_from_H et compute_H se
+    réduisent à un calcul d'indice et une interpolation linéaire, en une
+    passe vectorisée. Les paramètres doivent être des scalaires (un seul
+    matériau, pas d'ensemble).
+
+    T_table, f_table : points de la courbe f(T), T croissant et f croissant
+    de 0 à 1. T_m est la température où f = 1/2 ; T_low et T_high bornent
+    la zone où 0 < f < 1.
+    """
+
+    tabule = True
+
+    def __init__(self, T_table, f_table, rho, cp, k, L_latent, p=1.0,
+                 rho_v=0.0, cp_v=0.0, k_v=0.0, n_grille=1024):
+        if any(np.ndim(v) for v in (rho, cp, k, L_latent, p, rho_v, cp_v, k_v)):
+            raise ValueError("Un matériau tabulé n'a que des paramètres scalaires")
+        T_table = np.asarray(T_table, dtype=float)
+        f_table = np.minimum(np.maximum(np.asarray(f_table, dtype=float), 0.0), 1.0)
+        if len(T_table) < 2 or np.any(np.diff(T_table) <= 0) or np.any(np.diff(f_table) < 0):
+            raise ValueError("f(T) doit être tabulée à T strictement croissant, f croissant")
+        if f_table[0] > 0.0 or f_table[-1] < 1.0:
+            raise ValueError("f(T) doit aller de 0 à 1")
+
+        T_low = T_table[np.flatnonzero(f_table <= 0.0)[-1]]
+        T_high = T_table[np.flatnonzero(f_table >= 1.0)[0]]
+        super().__init__(rho, cp, k, L_latent, (T_low + T_high) / 2, (T_high - T_low) / 2,
+                         p, rho_v, cp_v, k_v)
+        self.T_m = float(np.interp(0.5, f_table, T_table))
+        self.T_table = T_table
+        self.f_table = f_table
+
+        # f(T) sur une grille uniforme en T
+        T_grille = np.linspace(T_low, T_high, n_grille + 1)
+        self._f_T = np.interp(T_grille, T_table, f_table)
+        self._pente_T = np.diff(self._f_T)
+        self._inv_pas_T = n_grille / (T_high - T_low)
+
+        # f(H) sur une grille uniforme en H (H(T) est strictement croissante)
+        H_T = self.C * T_grille + self.L_vol * self._f_T
+        self._f_H = np.interp(np.linspace(self.H_low, self.H_high, n_grille + 1), H_T, self._f_T)
+        self._pente_H = np.diff(self._f_H)
+        self._inv_pas_H = n_grille / (self.H_high - self.H_low)
+        self.n_grille = n_grille
+        self._indices = {}
+
+    @classmethod
+    def depuis_materiau(cls, materiau, n_grille=1024):
+        """
+        Version tabulée d'un Materiau (rampe linéaire entre T_m - delta et
+        T_m + delta) : mêmes résultats, au pas de grille près.
+        """
+        return cls([materiau.T_low, materiau.T_high], [0.0, 1.0], **_parametres(materiau),
+                   n_grille=n_grille)
+
+    @classmethod
+    def depuis_json(cls, chemin, n_grille=1024, **kwargs):
+        """
+        Construit le matériau à partir d'un fichier comme paraffine.json.
+        """
+        return cls.depuis_materiau(Materiau.depuis_json(chemin, **kwargs), n_grille)
+
+    @classmethod
+    def depuis_refroidissement(cls, materiau, temps, T, T_ambiante, pertes=None,
+                               seuil=0.01, n_grille=1024):
+        """
+        f(T) tirée d'une courbe de refroidissement mesurée (T en °C), les
+        autres paramètres venant de `materiau` (par exemple paraffine.json).
+
+        L'échantillon est supposé uniforme et refroidi par des pertes
+        proportionnelles à T - T_ambiante (W/(m^3.K)) :
+            C dT/dt + L_vol df/dt = -pertes * (T - T_ambiante)
+        ce qui donne la chaleur latente libérée au cours du temps, donc f.
+        Sans `pertes`, le coefficient est celui qui libère exactement L_vol
+        sur la durée du relevé (échantillon liquide au début, solide à la
+        fin). Les fractions à moins de `seuil` de 0 ou de 1 (bruit de mesure
+        dans les zones purement liquide ou solide) sont ramenées à 0 ou 1.
+        """
+        temps = np.asarray(temps, dtype=float)
+        T = np.asarray(T, dtype=float)
+        ecart = T - T_ambiante
+        integrale = np.concatenate([[0.0], np.cumsum(0.5 * (ecart[1:] + ecart[:-1]) * np.diff(temps))])
+        if pertes is None:
+            pertes = (materiau.L_vol + materiau.C * (T[0] - T[-1])) / integrale[-1]
+        libere = -pertes * integrale - materiau.C * (T - T[0])
+        f = 1.0 - libere / libere[-1]
+        f = np.minimum(np.maximum((f - seuil) / (1.0 - 2 * seuil), 0.0), 1.0)
+
+        # Courbe monotone : triée par T, f croissant, une valeur par T
+        ordre = np.argsort(T, kind="stable")
+        T, f = T[ordre], np.maximum.accumulate(f[ordre])
+        T, dernier = np.unique(T[::-1], return_index=True)
+        tabule = cls(T, f[::-1][dernier], **_parametres(materiau), n_grille=n_grille)
+        tabule.pertes = pertes
+        return tabule
+
+    def _coordonnee(self, x, x0, inv_pas):
+        # Coordonnée dans une grille uniforme, ramenée à [0, n_grille]
+        u = (np.asarray(x, dtype=float) - x0) * inv_pas
+        return np.minimum(np.maximum(u, 0.0), self.n_grille)
+
+    def _interpoler(self, u, table, pente):
+        i = np.minimum(u.astype(np.intp), self.n_grille - 1)
+        return table[i] + (u - i) * pente[i]
+
+    def compute_H(self, T, out=None):
+        """
+        Calcule l'enthalpie H pour une température T donnée.
+        """
+        f = self._interpoler(self._coordonnee(T, self.T_low, self._inv_pas_T),
+                             self._f_T, self._pente_T)
+        return np.add(self.C * np.asarray(T, dtype=float), self.L_vol * f, out=out)
+
+    def T_from_H(self, H, out=None, fraction=None):
+        """
+        Calcule la température T à partir de l'enthalpie H : f(H) est lue
+        dans la table uniforme en H, puis T = (H - L_vol * f) / C. Si
+        `fraction` est fourni, f y est écrite.
+        """
+        H = np.asarray(H, dtype=float)
+        if H.ndim == 0:
+            f = self._interpoler(self._coordonnee(H, self.H_low, self._inv_pas_H),
+                                 self._f_H, self._pente_H)
+            if fraction is not None:
+                fraction[...] = f
+            return np.multiply(np.subtract(H, self.L_vol * f), self._inv_C, out=out)
+
+        if fraction is None:
+            fraction = np.empty_like(H)
+        if out is None:
+            out = np.empty_like(H)
+        i = self._indices.get(H.shape)
+        if i is None:
+            i = self._indices[H.shape] = np.empty(H.shape, dtype=np.intp)
+
+        # Coordonnée u dans la grille, indice i, poids u - i (dans fraction)
+        u = fraction
+        np.subtract(H, self.H_low, out=u)
+        u *= self._inv_pas_H
+        np.maximum(u, 0.0, out=u)
+        np.minimum(u, self.n_grille, out=u)
+        # (en haut de la grille, i = n_grille et u - i = 0 : la pente lue est
+        # celle du dernier intervalle, sans effet)
+        i[...] = u
+        u -= i
+        np.take(self._pente_H, i, out=out, mode="clip")
+        out *= u
+        np.take(self._f_H, i, out=fraction, mode="clip")
+        fraction += out
+
+        np.multiply(fraction, -self.L_vol, out=out)
+        out += H
+        out *= self._inv_C
+        return out
+
+    def capacite_apparente(self, fraction, out=None, T=None):
+        """
+        Capacité apparente dH/dT = C + L_vol * df/dT, la pente de f(T) étant
+        lue dans la table en T. Sans T, pente moyenne de la zone mushy.
+        """
+        if T is None:
+            return super().capacite_apparente(fraction, out)
+        u = (np.asarray(T, dtype=float) - self.T_low) * self._inv_pas_T
+        dedans = (u > 0.0) & (u < self.n_grille)
+        i = np.minimum(np.maximum(u, 0.0).astype(np.intp), self.n_grille - 1)
+        pente = self._pente_T[i] * self._inv_pas_T
+        return np.add(self.C, self.L_vol * pente * dedans, out=out)
+
+
+def _parametres(materiau):
+    # Paramètres d'un Materiau autres que la zone mushy
+    return {nom: getattr(materiau, nom) for nom in
+            ("rho", "cp", "k", "L_latent", "p", "rho_v", "cp_v", "k_v")}
@@ -0,0 +1,200 @@
+"""
+Magasin de mesures : toutes les acquisitions dans un même dossier, rangées
+par colonnes.
+
+Chaque acquisition (run) a ses métadonnées et ses canaux ; chaque canal
+est stocké dans deux fichiers .npy (temps et valeurs), si bien qu'une
+requête ne lit que les canaux demandés. L'index (canaux, décalages de
+temps, fichiers sources, métadonnées) est dans index.json.
+
+    magasin = Magasin("mesures")
+    magasin.ingerer("relevé_exp.csv", "diffusion", canaux=["froid", "chaud", "milieu"])
+    temps, T = magasin.lire("diffusion", "chaud")
+
+En ligne de commande :
+
+    python -m enthalpie.mesures mesures "relevé sans 1.txt" "relevé sans 2.txt" \\
+        --run maquette_classique --decalage 0 5190
+"""
+import argparse
+import json
+import os
+import shutil
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from .releves import charger_csv
+
+
+def lire_source(chemin):
+    """
+    Canaux d'un fichier brut du logiciel d'acquisition : dictionnaire
+    {nom: (temps, valeurs)}. Formats reconnus :
+
+    - paires "t,T | t,T | ..." sur une ligne (relevés de la maquette) ;
+    - CSV "Temps;Température{1};Temps;Température{2};..." : une paire de
+      colonnes par canal ;
+    - CSV dont la première colonne est le temps et les suivantes des canaux.
+    """
+    chemin = Path(chemin)
+    with open(chemin, "rb") as f:
+        debut = f.read(4096).decode("latin-1")
+    if " | " in debut:
+        texte = chemin.read_text(encoding="latin-1").strip().strip("|")
+        texte = texte.replace(" | ", "\n").replace(",", " ")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            valeurs = np.fromstring(texte, sep=" ")
+        paires = valeurs[:len(valeurs) // 2 * 2].reshape(-1, 2)
+        return {"T": (paires[:, 0], paires[:, 1])}
+
+    colonnes, tableau = charger_csv(chemin)
+    if not colonnes:
+        colonnes = ["temps"] + [f"canal{j}" for j in range(1, tableau.shape[1])]
+    canaux = {}
+    temps_repetes = [j for j, nom in enumerate(colonnes) if nom == colonnes[0]]
+    if len(temps_repetes) > 1:
+        for j in temps_repetes:
+            canaux[colonnes[j + 1]] = (tableau[:, j], tableau[:, j + 1])
+    else:
+        for j in range(1, tableau.shape[1]):
+            canaux[colonnes[j]] = (tableau[:, 0], tableau[:, j])
+    # Lignes incomplètes (canaux de longueurs différentes)
+    return {nom: (t[~np.isnan(t) & ~np.isnan(v)], v[~np.isnan(t) & ~np.isnan(v)])
+            for nom, (t, v) in canaux.items()}
+
+
+class Magasin:
+    """
+    Magasin de mesures rangé dans le dossier `chemin` (créé au besoin).
+    """
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+        self.chemin.mkdir(parents=True, exist_ok=True)
+        fichier_index = self.chemin / "index.json"
+        if fichier_index.exists():
+            with open(fichier_index, encoding="utf-8") as f:
+                self.index = json.load(f)
+        else:
+            self.index = {}
+
+    def _sauver_index(self):
+        # Écriture atomique : fichier temporaire renommé
+        temporaire = self.chemin / "index.json.tmp"
+        with open(temporaire, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1, ensure_ascii=False)
+        os.replace(temporaire, self.chemin / "index.json")
+
+    def _fichiers(self, run, canal):
+        dossier = self.chemin / run
+        return dossier / f"{canal}.temps.npy", dossier / f"{canal}.valeurs.npy"
+
+    def ingerer(self, source, run, canaux=None, decalage=0.0, pas=1, ajouter=False,
+                **metadonnees):
+        """
+        Range les canaux du fichier `source` dans l'acquisition `run`.
+
+        canaux : nouveaux noms des canaux, dans l'ordre du fichier.
+        decalage : temps (s) ajouté à tous les instants, par exemple 5190 pour
+        la seconde partie d'un relevé coupé en deux.
+        pas : ne garde qu'un point sur `pas`.
+        ajouter : complète les canaux existants au lieu de remplacer
+        l'acquisition. Les métadonnées sont ajoutées à celles du run.
+        """
+        donnees = lire_source(source)
+        if canaux is not None:
+            if len(canaux) != len(donnees):
+                raise ValueError(f"{source} : {len(donnees)} canaux, {len(canaux)} noms donnés")
+            donnees = dict(zip(canaux, donnees.values()))
+
+        if not ajouter and run in self.index:
+            shutil.rmtree(self.chemin / run, ignore_errors=True)
+            del self.index[run]
+        entree = self.index.setdefault(run, {"metadonnees": {}, "canaux": {}})
+        entree["metadonnees"].update(metadonnees)
+        (self.chemin / run).mkdir(exist_ok=True)
+
+        for nom, (temps, valeurs) in donnees.items():
+            temps = temps[::pas] + decalage
+            valeurs = valeurs[::pas]
+            info = entree["canaux"].setdefault(nom, {"n": 0, "segments": []})
+            fichier_temps, fichier_valeurs = self._fichiers(run, nom)
+            if info["n"]:
+                temps = np.concatenate([np.load(fichier_temps), temps])
+                valeurs = np.concatenate([np.load(fichier_valeurs), valeurs])
+                ordre = np.argsort(temps, kind="stable")
+                temps, valeurs = temps[ordre], valeurs[ordre]
+            np.save(fichier_temps, temps)
+            np.save(fichier_valeurs, valeurs)
+            info["segments"].append({"source": str(source), "decalage": decalage,
+                                     "pas": pas, "n": int(len(valeurs) - info["n"])})
+            info["n"] = int(len(valeurs))
+        self._sauver_index()
+        return list(donnees)
+
+    def runs(self):
+        return list(self.index)
+
+    def canaux(self, run):
+        return list(self.index[run]["canaux"])
+
+    def metadonnees(self, run):
+        return dict(self.index[run]["metadonnees"])
+
+    def lire(self, run, canal, t_min=-np.inf, t_max=np.inf):
+        """
+        Canal `canal` de l'acquisition `run` entre t_min et t_max. Renvoie
+        (temps, valeurs) ; seuls les deux fichiers du canal sont lus.
+        """
+        if canal not in self.index.get(run, {}).get("canaux", {}):
+            raise KeyError(f"Pas de canal {canal!r} dans {run!r}")
+        fichier_temps, fichier_valeurs = self._fichiers(run, canal)
+        temps = np.load(fichier_temps)
+        i0 = np.searchsorted(temps, t_min, side="left")
+        i1 = np.searchsorted(temps, t_max, side="right")
+        valeurs = np.load(fichier_valeurs, mmap_mode="r")[i0:i1]
+        return temps[i0:i1], np.array(valeurs)
+
+    def lire_canaux(self, run, canaux=None, t_min=-np.inf, t_max=np.inf):
+        """
+        Plusieurs canaux d'une acquisition (tous par défaut) :
+        {canal: (temps, valeurs)}.
+        """
+        canaux = self.canaux(run) if canaux is None else canaux
+        return {canal: self.lire(run, canal, t_min, t_max) for canal in canaux}
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description="Range un ou plusieurs relevés bruts dans un magasin de mesures.")
+    parser.add_argument("magasin", help="dossier du magasin")
+    parser.add_argument("sources", nargs="+", help="fichiers du logiciel d'acquisition")
+    parser.add_argument("--run", required=True, help="nom de l'acquisition")
+    parser.add_argument("--canaux", help="noms des canaux, séparés par des virgules")
+    parser.add_argument("--decalage", type=float, nargs="+", default=[0.0],
+                        help="décalage de temps (s), un seul ou un par source")
+    parser.add_argument("--pas", type=int, default=1, help="ne garder qu'un point sur PAS")
+    parser.add_argument("--ajouter", action="store_true",
+                        help="compléter l'acquisition au lieu de la remplacer")
+    parser.add_argument("--meta", nargs="*", default=[], metavar="CLE=VALEUR",
+                        help="métadonnées de l'acquisition")
+    args = parser.parse_args(arguments)
+
+    decalages = args.decalage * len(args.sources) if len(args.decalage) == 1 else args.decalage
+    if len(decalages) != len(args.sources):
+        parser.error("--decalage : une valeur ou une par source")
+    canaux = args.canaux.split(",") if args.canaux else None
+    metadonnees = dict(meta.split("=", 1) for meta in args.meta)
+
+    magasin = Magasin(args.magasin)
+    for i, (source, decalage) in enumerate(zip(args.sources, decalages)):
+        noms = magasin.ingerer(source, args.run, canaux, decalage, args.pas,
+                               ajouter=args.ajouter or i > 0, **metadonnees)
+        print(f"{source} -> {args.run} : {', '.join(noms)} (décalage {decalage:g} s)")
+
+
+if __name__ == "__main__":
+    main()
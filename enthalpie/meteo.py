@@ -0,0 +1,169 @@
+"""
+Forçage météorologique lu dans un fichier climatique horaire.
+
+Formats reconnus :
+- EPW (EnergyPlus Weather) : 8 lignes d'en-tête (LOCATION, ...), puis une
+  ligne par heure "année,mois,jour,heure,minute,source,T_sèche,...";
+- CSV "heure;valeur" (heures depuis le début du fichier), séparateur et
+  virgule décimale détectés comme pour les relevés.
+
+Le fichier est lu par tranches de quelques centaines de lignes, au fur et
+à mesure que la simulation avance : seule une fenêtre autour des instants
+demandés reste en mémoire, si bien qu'une année (8760 h) ou davantage se
+déroule à mémoire constante. Les simulations demandent les valeurs d'un
+bloc de pas à la fois (valeurs_forcage), interpolées d'un seul appel.
+"""
+import itertools
+
+import numpy as np
+
+from .releves import _decoder, detecter_format
+
+# Colonnes d'une ligne EPW
+EPW_TEMPERATURE = 6             # température sèche (°C)
+EPW_RAYONNEMENT_GLOBAL = 13     # rayonnement global horizontal (Wh/m^2)
+# Codes des valeurs manquantes
+MANQUANT_EPW = {EPW_TEMPERATURE: 99.9, EPW_RAYONNEMENT_GLOBAL: 9999.0}
+
+# Premier jour de chaque mois dans une année non bissextile (jours depuis le 1er janvier)
+_DEBUT_MOIS = np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[:-1]
+ANNEE = 365 * 86400.0
+
+
+class FichierMeteo:
+    """
+    Grandeur d'un fichier climatique (par défaut la température sèche d'un
+    EPW, ou la seconde colonne d'un CSV), en fonction du temps t (s depuis
+    le 1er janvier 0 h pour un EPW, depuis l'heure 0 pour un CSV),
+    interpolée linéairement entre les heures.
+
+    S'utilise comme la fonction T_ext(t) des scripts ; les simulations
+    appellent valeurs(t) une fois par bloc de pas. Les instants doivent
+    globalement avancer : revenir avant la fenêtre gardée en mémoire
+    relit le fichier depuis le début.
+
+    decalage : temps (s) ajouté aux instants du fichier (par exemple
+    -180 * 86400 pour démarrer la simulation au 1er juillet).
+    """
+
+    def __init__(self, chemin, colonne=None, decalage=0.0, taille_lecture=744):
+        self.chemin = chemin
+        self.decalage = float(decalage)
+        self.taille_lecture = taille_lecture
+        with open(chemin, "rb") as f:
+            debut = _decoder(f.read(4096))
+        self.epw = debut.startswith("LOCATION")
+        if self.epw:
+            self.colonne = EPW_TEMPERATURE if colonne is None else colonne
+            self._separateur, self._virgule_decimale, self._en_tete = ",", False, 8
+        else:
+            self.colonne = 1 if colonne is None else colonne
+            separateur, self._virgule_decimale, en_tete = detecter_format(debut)
+            self._separateur = None if separateur == " " else separateur
+            self._en_tete = 1 if en_tete else 0
+        self._fichier = None
+        self._ouvrir()
+
+    def _ouvrir(self):
+        if self._fichier is not None:
+            self._fichier.close()
+        self._fichier = open(self.chemin, encoding="latin-1")
+        for _ in range(self._en_tete):
+            next(self._fichier, None)
+        self._t = np.empty(0)
+        self._v = np.empty(0)
+        self._t_brut = -np.inf    # dernier instant lu, avant passage à l'année suivante
+        self._annee = 0.0
+        self._fin = False
+        self._tronque = False
+
+    def fermer(self):
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def _lire(self):
+        # Tranche suivante du fichier, ajoutée à la fenêtre
+        lignes = [ligne for ligne in itertools.islice(self._fichier, self.taille_lecture)
+                  if ligne.strip()]
+        if not lignes:
+            self._fin = True
+            return
+        if self._virgule_decimale:
+            lignes = [ligne.replace(",", ".") for ligne in lignes]
+        if self.epw:
+            tableau = np.loadtxt(lignes, delimiter=",", usecols=(1, 2, 3, self.colonne), ndmin=2)
+            mois, jour, heure, v = tableau.T
+            t = (_DEBUT_MOIS[mois.astype(int) - 1] + jour - 1) * 86400.0 + heure * 3600.0
+            # Fichier de plusieurs années : le temps repart en arrière au 1er janvier
+            retours = np.cumsum(np.diff(t, prepend=self._t_brut) < 0)
+            self._t_brut = t[-1]
+            t = t + (self._annee + retours) * ANNEE
+            self._annee += retours[-1]
+            garder = v != MANQUANT_EPW.get(self.colonne, np.nan)
+        else:
+            tableau = np.loadtxt(lignes, delimiter=self._separateur,
+                                 usecols=(0, self.colonne), ndmin=2)
+            t, v = tableau[:, 0] * 3600.0, tableau[:, 1]
+            garder = ~np.isnan(v)
+        self._t = np.concatenate([self._t, t[garder] + self.decalage])
+        self._v = np.concatenate([self._v, v[garder]])
+
+    def valeurs(self, t):
+        """
+        Valeurs aux instants t (tableau), d'un seul appel. Avant la première
+        heure et après la dernière, la valeur extrême est prolongée.
+        """
+        t = np.asarray(t, dtype=float)
+        if t.size == 0:
+            return np.empty(t.shape)
+        t_min, t_max = float(t.min()), float(t.max())
+        if self._tronque and t_min < self._t[0]:
+            self._ouvrir()
+        while not self._fin and (self._t.size == 0 or self._t[-1] < t_max):
+            self._lire()
+        if self._t.size == 0:
+            raise ValueError(f"{self.chemin} : aucune valeur lue")
+        # On garde une tranche avant t_min (retours en arrière de quelques heures)
+        i = np.searchsorted(self._t, t_min, side="right") - 1 - self.taille_lecture
+        if i > 0:
+            self._t, self._v = self._t[i:], self._v[i:]
+            self._tronque = True
+        return np.interp(t, self._t, self._v)
+
+    def __call__(self, t):
+        return float(self.valeurs(np.array([t]))[0])
+
+    def duree(self):
+        """
+        Durée couverte par le fichier (s), du premier au dernier relevé.
+        Parcourt tout le fichier une fois, sans le garder en mémoire.
+        """
+        self._ouvrir()
+        debut = None
+        while not self._fin:
+            self._lire()
+            if self._t.size:
+                debut = self._t[0] if debut is None else debut
+                self._t, self._v = self._t[-1:], self._v[-1:]
+        fin = self._t[-1]
+        self._ouvrir()
+        return fin - debut
+
+
+def valeurs_forcage(T_ext, t):
+    """
+    Valeurs de T_ext aux instants t d'un bloc de pas : un seul appel pour
+    un forçage tabulé (objet muni de valeurs(t), comme FichierMeteo), sinon
+    un appel de la fonction par instant. Renvoie un tableau (len(t), ...).
+    """
+    if hasattr(T_ext, "valeurs"):
+        return T_ext.valeurs(t)
+    return np.array([T_ext(ti) for ti in t], dtype=float)
+
@@ -0,0 +1,200 @@
+import numpy as np
+
+from .couches import Multicouche
+
+
+class Mur:
+    """
+    Mur 1D discrétisé en N noeuds, avancé par la méthode enthalpique.
+    Les noeuds sont sur le dernier axe des tableaux.
+
+    Tous les tableaux de travail (T, fraction liquide, laplacien) sont
+    alloués une seule fois : un pas de temps ne fait aucune allocation.
+
+    materiau peut être un Multicouche (L = None ou son épaisseur) : le
+    laplacien est alors remplacé par la différence des flux aux faces.
+    """
+
+    def __init__(self, materiau, L, N, T_init):
+        # Mur multicouche : propriétés par noeud et par face (voir couches.py)
+        self.couches = None
+        k_faces = None
+        if isinstance(materiau, Multicouche):
+            self.couches = materiau
+            if L is not None and np.any(L != materiau.epaisseur):
+                raise ValueError("L doit être l'épaisseur totale des couches (ou None)")
+            L = materiau.epaisseur
+            materiau, k_faces = materiau.discretiser(N)
+
+        self.materiau = materiau
+        self.materiau_bords = materiau.noeuds(slice(None, None, N - 1))
+        self.L = L
+        self.N = N
+        self.dx = np.divide(L, N - 1)
+        self.x = np.linspace(0, 1, N) * np.asarray(L, dtype=float)
+
+        # Plusieurs murs peuvent être avancés ensemble : des paramètres de
+        # forme (n, 1) donnent des tableaux (n, N), un mur par ligne.
+        forme = np.broadcast(np.empty(N), T_init, materiau.C, self.dx).shape
+        T = np.empty(forme)
+        T[...] = T_init
+        self.H = materiau.compute_H(T)
+        self.T = np.empty(forme)
+        self.fraction = np.empty(forme)
+        self._lap = np.empty(forme[:-1] + (N - 2,))
+        if k_faces is None:
+            self._coef_lap = materiau.k_eff / self.dx**2
+            self._coef_faces = None
+            self.k_bords = (materiau.k_eff, materiau.k_eff)
+        else:
+            # Flux de la face i : coef_faces[i] * (T[i + 1] - T[i])
+            self._coef_faces = k_faces / self.dx**2
+            self._flux = np.empty(forme[:-1] + (N - 1,))
+            self.k_bords = (k_faces[..., :1], k_faces[..., -1:])
+        self.mettre_a_jour_T()
+
+    def mettre_a_jour_T(self):
+        """
+        Recalcule T (et la fraction liquide) à partir de H, en place.
+        """
+        self.materiau.T_from_H(self.H, out=self.T, fraction=self.fraction)
+
+    def imposer_T(self, i, T_i):
+        """
+        Impose la température du noeud i (condition de Dirichlet).
+        """
+        self.H[..., i] = self.materiau.noeuds(i).compute_H(T_i)
+        self.T[..., i] = T_i
+
+    def imposer_T_bords(self, T_gauche, T_droite):
+        """
+        Impose la température des deux bords pour tous les murs (scalaires
+        ou tableaux de forme (..., 1)), puis met H à jour aux bords.
+        """
+        self.T[..., :1] = T_gauche
+        self.T[..., -1:] = T_droite
+        bords = slice(None, None, self.N - 1)
+        self.materiau_bords.compute_H(self.T[..., bords], out=self.H[..., bords])
+
+    def pas_explicite(self, dt):
+        """
+        Avance H d'un pas explicite sur les noeuds internes :
+        dH/dt = k * d2T/dx^2, puis met T à jour.
+        """
+        T = self.T
+        lap = self._lap
+        if self._coef_faces is not None:
+            flux = self._flux
+            np.subtract(T[..., 1:], T[..., :-1], out=flux)
+            flux *= self._coef_faces
+            np.subtract(flux[..., 1:], flux[..., :-1], out=lap)
+            lap *= dt
+            self.H[..., 1:-1] += lap
+            self.mettre_a_jour_T()
+            return
+        np.add(T[..., 2:], T[..., :-2], out=lap)
+        lap -= T[..., 1:-1]
+        lap -= T[..., 1:-1]
+        lap *= dt * self._coef_lap
+        self.H[..., 1:-1] += lap
+        self.mettre_a_jour_T()
+
+
+def par_cas(valeur):
+    """
+    Laisse un scalaire inchangé et met une liste ou un tableau d'une valeur
+    par cas sous la forme (n_cas, 1), qui se combine avec les tableaux (n_cas, N).
+    """
+    if np.ndim(valeur) == 0:
+        return valeur
+    return np.asarray(valeur, dtype=float).reshape(-1, 1)
+
+
+def position_interface(T, x, T_m, delta):
+    """
+    Position de l'interface solide/liquide : interpolation de T = T_m
+    à partir du premier noeud de la zone mushy. Renvoie None s'il n'y en a pas.
+    """
+    mushy_zone = (T >= (T_m - delta)) & (T <= (T_m + delta))
+    if not np.any(mushy_zone):
+        return None
+    i1 = np.argmax(mushy_zone)
+    if i1 >= len(T) - 1:
+        return None
+    T1, T2 = T[i1], T[i1 + 1]
+    x1, x2 = x[i1], x[i1 + 1]
+    if T2 != T1:
+        return x1 + (T_m - T1) * (x2 - x1) / (T2 - T1)
+    return x1
+
+
+class SuiviFronts:
+    """
+    Fronts solide/liquide d'un mur 1D : positions où T traverse T_m,
+    interpolées linéairement entre deux noeuds. Il peut y en avoir plusieurs.
+    Pour un mur multicouche, T_m est celle de la couche qui apporte le plus
+    de chaleur latente (la couche de MCP).
+
+    À chaque mise à jour, seuls les marge noeuds de part et d'autre des
+    fronts précédents sont examinés. Tout le mur est parcouru au départ,
+    tous les pas_complet pas (apparition d'un nouveau front) et lorsqu'un
+    front n'est plus retrouvé dans son voisinage.
+    """
+
+    def __init__(self, mur, marge=2, pas_complet=50):
+        if mur.T.ndim > 1:
+            raise ValueError("Le suivi des fronts ne porte que sur un seul mur")
+        self.mur = mur
+        # Mur multicouche : T_m de la couche qui apporte le plus de chaleur
+        # latente (comme le noyau compilé)
+        L_vol = np.broadcast_to(mur.materiau.L_vol, mur.T.shape)
+        self.T_m = float(np.broadcast_to(mur.materiau.T_m, mur.T.shape)[np.argmax(L_vol)])
+        self.marge = marge
+        self.pas_complet = pas_complet
+        self._n = 0
+        self.indices = self._croisements(0, mur.N - 1)
+
+    def _croisements(self, debut, fin):
+        # Indices i de [debut, fin[ tels que T - T_m change de signe entre i et i + 1
+        liquide = self.mur.T[debut:fin + 1] > self.T_m
+        return (debut + np.flatnonzero(liquide[1:] != liquide[:-1])).tolist()
+
+    def mettre_a_jour(self):
+        """
+        Recherche les fronts après un pas de temps ; renvoie la liste de
+        leurs indices (front entre les noeuds i et i + 1).
+        """
+        self._n += 1
+        N = self.mur.N
+        if self._n % self.pas_complet == 0:
+            self.indices = self._croisements(0, N - 1)
+            return self.indices
+
+        T, T_m = self.mur.T, self.T_m
+        deplace = False
+        trouves = []
+        for i in self.indices:
+            # Cas courant : le front n'a pas changé de maille
+            if (T[i] > T_m) != (T[i + 1] > T_m):
+                trouves.append(i)
+                continue
+            voisins = self._croisements(max(i - self.marge, 0), min(i + self.marge + 1, N - 1))
+            if not voisins:
+                # Front perdu : parcours complet
+                self.indices = self._croisements(0, N - 1)
+                return self.indices
+            trouves.extend(voisins)
+            deplace = True
+        self.indices = sorted(set(trouves)) if deplace else trouves
+        return self.indices
+
+    def positions(self):
+        """
+        Positions (m) des fronts actuels, du côté x = 0 vers x = L.
+        """
+        T, x, T_m = self.mur.T, self.mur.x, self.T_m
+        positions = []
+        for i in self.indices:
+            T1, T2 = T[i], T[i + 1]
+            positions.append(x[i] + (T_m - T1) * (x[i + 1] - x[i]) / (T2 - T1))
+        return positions
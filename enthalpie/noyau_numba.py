@@ -0,0 +1,444 @@
+"""
+Noyaux compilés (Numba) du schéma explicite.
+
+Chaque pas est une seule boucle sur les noeuds qui enchaîne le laplacien,
+la mise à jour de H, l'inversion T_from_H et la recherche des fronts.
+La compilation est mise en cache sur disque (cache=True) : elle n'est payée
+qu'au premier lancement. Sans Numba, les simulations restent sur NumPy.
+"""
+import warnings
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_DISPONIBLE = numba is not None
+
+
+def _jit(fonction):
+    if numba is None:
+        return fonction
+    return numba.njit(cache=True)(fonction)
+
+
+def _jit_nogil(fonction):
+    # Noyau appelé depuis plusieurs threads : le GIL est relâché pendant l'appel
+    if numba is None:
+        return fonction
+    return numba.njit(cache=True, nogil=True)(fonction)
+
+
+def choisir_backend(backend, materiau=None):
+    """
+    Résout le nom du backend : "numpy", "numba" ou "auto" (Numba s'il est
+    installé). Demander "numba" sans Numba revient à NumPy, avec un avertissement.
+    Les noyaux ne connaissent que la zone mushy linéaire : un matériau
+    tabulé reste sur NumPy. Les murs multicouches ont leurs propres noyaux
+    (conductances des faces, paramètres par noeud).
+    """
+    numpy_seul = getattr(materiau, "tabule", False)
+    if backend == "auto":
+        return "numba" if NUMBA_DISPONIBLE and not numpy_seul else "numpy"
+    if backend == "numba" and not NUMBA_DISPONIBLE:
+        warnings.warn("Numba n'est pas installé : calcul avec NumPy", RuntimeWarning)
+        return "numpy"
+    if backend == "numba" and numpy_seul:
+        warnings.warn("Matériau tabulé : calcul avec NumPy", RuntimeWarning)
+        return "numpy"
+    if backend not in ("numpy", "numba"):
+        raise ValueError(f"Backend inconnu : {backend!r}")
+    return backend
+
+
+@_jit
+def _T_de_H(h, H_low, inv_dH, L_vol, inv_C):
+    f = (h - H_low) * inv_dH
+    if f < 0.0:
+        f = 0.0
+    elif f > 1.0:
+        f = 1.0
+    return (h - L_vol * f) * inv_C
+
+
+@_jit
+def _H_de_T(t, T_low, inv_2delta, L_vol, C):
+    f = (t - T_low) * inv_2delta
+    if f < 0.0:
+        f = 0.0
+    elif f > 1.0:
+        f = 1.0
+    return C * t + L_vol * f
+
+
+@_jit
+def _interpoler_interface(T, i1, dx, T_m):
+    # Interpolation de T = T_m entre les noeuds i1 et i1 + 1
+    T1 = T[i1]
+    T2 = T[i1 + 1]
+    if T2 != T1:
+        return i1 * dx + (T_m - T1) * dx / (T2 - T1)
+    return i1 * dx
+
+
+@_jit
+def _croisements(T, T_m, fronts):
+    # Indices i où T - T_m change de signe entre i et i + 1 (au plus
+    # fronts.shape[0]) ; renvoie leur nombre
+    n = 0
+    for i in range(T.shape[0] - 1):
+        if n < fronts.shape[0] and (T[i] > T_m) != (T[i + 1] > T_m):
+            fronts[n] = i
+            n += 1
+    return n
+
+
+@_jit
+def avancer_dirichlet(H, T, n_pas, coef, H_low, inv_dH, L_vol, inv_C,
+                      T_m, dx, sondes, T_sondes, x_fronts):
+    """
+    Avance n_pas pas explicites d'un mur 1D à bords imposés. Avant chaque
+    pas, relève T aux sondes et la position des fronts (au plus
+    x_fronts.shape[1], nan au-delà). Les fronts sont repérés pendant la
+    mise à jour elle-même.
+    """
+    N = H.shape[0]
+    fronts = np.empty(x_fronts.shape[1], dtype=np.int64)
+    n_fronts = _croisements(T, T_m, fronts)
+    for n in range(n_pas):
+        for j in range(sondes.shape[0]):
+            T_sondes[n, j] = T[sondes[j]]
+        for j in range(x_fronts.shape[1]):
+            if j < n_fronts:
+                x_fronts[n, j] = _interpoler_interface(T, fronts[j], dx, T_m)
+            else:
+                x_fronts[n, j] = np.nan
+
+        n_fronts = 0
+        liquide_prec = T[0] > T_m
+        t_prec = T[0]
+        t_cour = T[1]
+        for i in range(1, N - 1):
+            t_suiv = T[i + 1]
+            h = H[i] + coef * (t_suiv - 2.0 * t_cour + t_prec)
+            H[i] = h
+            t = _T_de_H(h, H_low, inv_dH, L_vol, inv_C)
+            T[i] = t
+            liquide = t > T_m
+            if liquide != liquide_prec and n_fronts < fronts.shape[0]:
+                fronts[n_fronts] = i - 1
+                n_fronts += 1
+            liquide_prec = liquide
+            t_prec = t_cour
+            t_cour = t_suiv
+        if (T[N - 1] > T_m) != liquide_prec and n_fronts < fronts.shape[0]:
+            fronts[n_fronts] = N - 2
+            n_fronts += 1
+
+
+@_jit
+def avancer_piece(H, T, T_room, T_ext_vals, dt, coef, H_low, inv_dH, L_vol, inv_C,
+                  C, T_low, inv_2delta, a_robin, b_robin, coef_room,
+                  pas_debut, pas_releve, T_room_rel, T_int_rel):
+    """
+    Avance les murs (lignes de H) et leurs pièces sur T_ext_vals.shape[0]
+    pas explicites : bord extérieur imposé, bord intérieur convectif, air
+    lumpé. Les paramètres sont des tableaux d'une valeur par mur et
+    T_ext_vals[n, r] est la température extérieure du mur r au pas n.
+    """
+    n_murs, N = H.shape
+    for r in range(n_murs):
+        for n in range(T_ext_vals.shape[0]):
+            # Conditions aux limites
+            T[r, 0] = T_ext_vals[n, r]
+            H[r, 0] = _H_de_T(T[r, 0], T_low[r], inv_2delta[r], L_vol[r], C[r])
+            T[r, N - 1] = a_robin[r] * T[r, N - 2] + b_robin[r] * T_room[r]
+            H[r, N - 1] = _H_de_T(T[r, N - 1], T_low[r], inv_2delta[r], L_vol[r], C[r])
+
+            # Conduction : laplacien, mise à jour de H et T_from_H en une passe
+            t_prec = T[r, 0]
+            t_cour = T[r, 1]
+            for i in range(1, N - 1):
+                t_suiv = T[r, i + 1]
+                h = H[r, i] + dt * coef[r] * (t_suiv - 2.0 * t_cour + t_prec)
+                H[r, i] = h
+                T[r, i] = _T_de_H(h, H_low[r], inv_dH[r], L_vol[r], inv_C[r])
+                t_prec = t_cour
+                t_cour = t_suiv
+            T[r, 0] = _T_de_H(H[r, 0], H_low[r], inv_dH[r], L_vol[r], inv_C[r])
+            T[r, N - 1] = _T_de_H(H[r, N - 1], H_low[r], inv_dH[r], L_vol[r], inv_C[r])
+
+            # Air de la pièce
+            T_room[r] += dt * coef_room[r] * (T[r, N - 1] - T_room[r])
+
+            if (pas_debut + n) % pas_releve == 0:
+                j = (pas_debut + n) // pas_releve
+                T_room_rel[j, r] = T_room[r]
+                T_int_rel[j, r] = T[r, N - 1]
+
+
+@_jit
+def avancer_dirichlet_faces(H, T, n_pas, dt, faces, H_low, inv_dH, L_vol, inv_C,
+                            T_m, dx, sondes, T_sondes, x_fronts):
+    """
+    avancer_dirichlet pour un mur multicouche : faces[i] est la conductance
+    (k / dx^2) de la face entre les noeuds i et i + 1 et les paramètres du
+    matériau sont des tableaux d'une valeur par noeud. Mêmes opérations,
+    dans le même ordre, que Mur.pas_explicite.
+    """
+    N = H.shape[0]
+    fronts = np.empty(x_fronts.shape[1], dtype=np.int64)
+    n_fronts = _croisements(T, T_m, fronts)
+    for n in range(n_pas):
+        for j in range(sondes.shape[0]):
+            T_sondes[n, j] = T[sondes[j]]
+        for j in range(x_fronts.shape[1]):
+            if j < n_fronts:
+                x_fronts[n, j] = _interpoler_interface(T, fronts[j], dx, T_m)
+            else:
+                x_fronts[n, j] = np.nan
+
+        n_fronts = 0
+        liquide_prec = T[0] > T_m
+        t_cour = T[1]
+        flux_prec = (t_cour - T[0]) * faces[0]
+        for i in range(1, N - 1):
+            t_suiv = T[i + 1]
+            flux = (t_suiv - t_cour) * faces[i]
+            h = H[i] + (flux - flux_prec) * dt
+            H[i] = h
+            t = _T_de_H(h, H_low[i], inv_dH[i], L_vol[i], inv_C[i])
+            T[i] = t
+            liquide = t > T_m
+            if liquide != liquide_prec and n_fronts < fronts.shape[0]:
+                fronts[n_fronts] = i - 1
+                n_fronts += 1
+            liquide_prec = liquide
+            flux_prec = flux
+            t_cour = t_suiv
+        if (T[N - 1] > T_m) != liquide_prec and n_fronts < fronts.shape[0]:
+            fronts[n_fronts] = N - 2
+            n_fronts += 1
+
+
+@_jit
+def avancer_piece_faces(H, T, T_room, T_ext_vals, dt, faces, H_low, inv_dH, L_vol, inv_C,
+                        C, T_low, inv_2delta, a_robin, b_robin, coef_room,
+                        pas_debut, pas_releve, T_room_rel, T_int_rel):
+    """
+    avancer_piece pour des murs multicouches : faces (n_murs, N - 1) et
+    paramètres du matériau (n_murs, N), une valeur par noeud.
+    """
+    n_murs, N = H.shape
+    for r in range(n_murs):
+        for n in range(T_ext_vals.shape[0]):
+            # Conditions aux limites
+            T[r, 0] = T_ext_vals[n, r]
+            H[r, 0] = _H_de_T(T[r, 0], T_low[r, 0], inv_2delta[r, 0], L_vol[r, 0], C[r, 0])
+            T[r, N - 1] = a_robin[r] * T[r, N - 2] + b_robin[r] * T_room[r]
+            H[r, N - 1] = _H_de_T(T[r, N - 1], T_low[r, N - 1], inv_2delta[r, N - 1],
+                                  L_vol[r, N - 1], C[r, N - 1])
+
+            # Conduction : différence des flux aux faces, mise à jour de H et T_from_H
+            t_cour = T[r, 1]
+            flux_prec = (t_cour - T[r, 0]) * faces[r, 0]
+            for i in range(1, N - 1):
+                t_suiv = T[r, i + 1]
+                flux = (t_suiv - t_cour) * faces[r, i]
+                h = H[r, i] + (flux - flux_prec) * dt
+                H[r, i] = h
+                T[r, i] = _T_de_H(h, H_low[r, i], inv_dH[r, i], L_vol[r, i], inv_C[r, i])
+                flux_prec = flux
+                t_cour = t_suiv
+            T[r, 0] = _T_de_H(H[r, 0], H_low[r, 0], inv_dH[r, 0], L_vol[r, 0], inv_C[r, 0])
+            T[r, N - 1] = _T_de_H(H[r, N - 1], H_low[r, N - 1], inv_dH[r, N - 1],
+                                  L_vol[r, N - 1], inv_C[r, N - 1])
+
+            # Air de la pièce
+            T_room[r] += dt * coef_room[r] * (T[r, N - 1] - T_room[r])
+
+            if (pas_debut + n) % pas_releve == 0:
+                j = (pas_debut + n) // pas_releve
+                T_room_rel[j, r] = T_room[r]
+                T_int_rel[j, r] = T[r, N - 1]
+
+
+def parametres_par_noeud(materiau, forme):
+    """
+    Paramètres d'un matériau défini noeud par noeud (mur multicouche) sous
+    forme de tableaux contigus (n_murs, N).
+    """
+    n = int(np.prod(forme[:-1]))
+
+    def par_noeud(valeur):
+        return np.ascontiguousarray(np.broadcast_to(valeur, forme).reshape(n, forme[-1]),
+                                    dtype=float)
+
+    return {nom: par_noeud(valeur) for nom, valeur in (
+        ("H_low", materiau.H_low), ("inv_dH", materiau._inv_dH), ("L_vol", materiau.L_vol),
+        ("inv_C", materiau._inv_C), ("C", materiau.C), ("T_low", materiau.T_low),
+        ("inv_2delta", materiau._inv_2delta))}
+
+
+def _par_mur(forme):
+    # Conversion d'un paramètre en tableau contigu d'une valeur par mur
+    n = int(np.prod(forme[:-1]))
+
+    def par_mur(valeur):
+        return np.ascontiguousarray(np.broadcast_to(valeur, forme[:-1] + (1,)).reshape(n),
+                                    dtype=float)
+
+    return par_mur
+
+
+def parametres_par_mur(materiau, forme):
+    """
+    Paramètres du matériau sous forme de tableaux contigus d'une valeur par
+    mur (forme : forme des tableaux (..., N) du mur).
+    """
+    par_mur = _par_mur(forme)
+    return {
+        "H_low": par_mur(materiau.H_low),
+        "inv_dH": par_mur(materiau._inv_dH),
+        "L_vol": par_mur(materiau.L_vol),
+        "inv_C": par_mur(materiau._inv_C),
+        "C": par_mur(materiau.C),
+        "T_low": par_mur(materiau.T_low),
+        "inv_2delta": par_mur(materiau._inv_2delta),
+        "par_mur": par_mur,
+    }
+
+
+@_jit
+def avancer_reduit(z, T_ext_vals, H_moy, Phi, H_low, inv_dH, L_vol, inv_C, M, M_E, M_F,
+                   pas_debut, pas_releve, z_rel):
+    """
+    Pas du modèle réduit (voir reduit.py) : z = [coordonnées POD, T_room],
+    z <- M z + M_E g + M_F T_ext, g étant la partie explicite de T aux
+    points DEIM. z est relevé dans z_rel tous les pas_releve pas.
+    """
+    m, r = Phi.shape
+    g = np.empty(m)
+    z_suivant = np.empty(z.shape[0])
+    for n in range(T_ext_vals.shape[0]):
+        for i in range(m):
+            h = H_moy[i]
+            for j in range(r):
+                h += Phi[i, j] * z[j]
+            f = (h - H_low[i]) * inv_dH[i]
+            if f < 0.0:
+                f = 0.0
+            elif f > 1.0:
+                f = 1.0
+            g[i] = (H_moy[i] - L_vol[i] * f) * inv_C[i]
+        for i in range(z.shape[0]):
+            s = M_F[i] * T_ext_vals[n]
+            for j in range(z.shape[0]):
+                s += M[i, j] * z[j]
+            for j in range(m):
+                s += M_E[i, j] * g[j]
+            z_suivant[i] = s
+        z[:] = z_suivant
+        if (pas_debut + n + 1) % pas_releve == 0:
+            z_rel[(pas_debut + n + 1) // pas_releve - 1] = z
+
+
+@_jit_nogil
+def avancer_tranche_3d(H, T, T_neuf, fraction, i0, i1, coef, H_low, inv_dH, L_vol, inv_C):
+    """
+    Un pas explicite des plans i0 <= i < i1 (intérieurs) d'une grille 3D :
+    lit T (plans i0 - 1 et i1 compris), écrit H, fraction et T_neuf. Les
+    opérations sont celles de Bloc._avancer_numpy, dans le même ordre.
+    """
+    ny, nz = H.shape[1], H.shape[2]
+    for i in range(i0, i1):
+        for j in range(1, ny - 1):
+            for k in range(1, nz - 1):
+                lap = T[i - 1, j, k] + T[i + 1, j, k]
+                lap += T[i, j - 1, k]
+                lap += T[i, j + 1, k]
+                lap += T[i, j, k - 1]
+                lap += T[i, j, k + 1]
+                lap -= T[i, j, k] * 6.0
+                h = H[i, j, k] + lap * coef
+                H[i, j, k] = h
+                f = (h - H_low) * inv_dH
+                if f < 0.0:
+                    f = 0.0
+                elif f > 1.0:
+                    f = 1.0
+                fraction[i, j, k] = f
+                T_neuf[i, j, k] = (f * -L_vol + h) * inv_C
+
+
+def avancer_dirichlet_mur(mur, n_pas, dt, sondes, T_sondes, x_fronts):
+    """
+    Version compilée de n_pas appels à mur.pas_explicite(dt) pour un mur à
+    bords imposés, avec relevé des sondes et des fronts. Les cas d'un
+    ensemble (lignes du mur) sont indépendants et avancés l'un après l'autre.
+    Pour un mur multicouche, les fronts sont ceux de la couche qui apporte
+    le plus de chaleur latente (son T_m).
+    """
+    materiau = mur.materiau
+    forme = mur.H.shape
+    n = int(np.prod(forme[:-1]))
+    par_mur = _par_mur(forme)
+    dx = par_mur(mur.dx)
+    sondes = np.asarray(sondes, dtype=np.int64)
+    H = mur.H.reshape(n, mur.N)
+    T = mur.T.reshape(n, mur.N)
+    T_sondes = T_sondes.reshape(T_sondes.shape[0], n, len(sondes))
+    if mur._coef_faces is not None:
+        q = parametres_par_noeud(materiau, forme)
+        faces = np.ascontiguousarray(np.broadcast_to(
+            mur._coef_faces, forme[:-1] + (mur.N - 1,)).reshape(n, mur.N - 1), dtype=float)
+        T_m = np.broadcast_to(materiau.T_m, forme).reshape(n, mur.N)
+        dominant = np.argmax(q["L_vol"], axis=1)
+        for r in range(n):
+            avancer_dirichlet_faces(H[r], T[r], n_pas, float(dt), faces[r], q["H_low"][r],
+                                    q["inv_dH"][r], q["L_vol"][r], q["inv_C"][r],
+                                    float(T_m[r, dominant[r]]), dx[r], sondes,
+                                    T_sondes[:, r, :], x_fronts)
+        mur.mettre_a_jour_T()
+        return
+    p = parametres_par_mur(materiau, forme)
+    coef = par_mur(dt * mur._coef_lap)
+    T_m = par_mur(materiau.T_m)
+    for r in range(n):
+        avancer_dirichlet(H[r], T[r], n_pas, coef[r], p["H_low"][r], p["inv_dH"][r],
+                          p["L_vol"][r], p["inv_C"][r], T_m[r], dx[r], sondes,
+                          T_sondes[:, r, :], x_fronts)
+    mur.mettre_a_jour_T()
+
+
+def avancer_piece_bloc(piece, T_ext_vals, dt, pas_debut, pas_releve, T_room_rel, T_int_rel):
+    """
+    Version compilée de piece.pas(dt, T_ext) pour chaque valeur de T_ext_vals
+    (une valeur par pas, ou une ligne d'une valeur par mur à chaque pas).
+    """
+    mur = piece.mur
+    forme = mur.H.shape
+    n = int(np.prod(forme[:-1]))
+    par_mur = _par_mur(forme)
+    T_ext_vals = np.ascontiguousarray(np.broadcast_to(
+        np.reshape(T_ext_vals, (len(T_ext_vals), -1)), (len(T_ext_vals), n)))
+    if mur._coef_faces is not None:
+        q = parametres_par_noeud(mur.materiau, forme)
+        faces = np.ascontiguousarray(np.broadcast_to(
+            mur._coef_faces, forme[:-1] + (mur.N - 1,)).reshape(n, mur.N - 1), dtype=float)
+        avancer_piece_faces(mur.H.reshape(n, mur.N), mur.T.reshape(n, mur.N),
+                            piece.T_room.reshape(n), T_ext_vals, float(dt), faces,
+                            q["H_low"], q["inv_dH"], q["L_vol"], q["inv_C"], q["C"],
+                            q["T_low"], q["inv_2delta"], par_mur(piece._a_robin),
+                            par_mur(piece._b_robin), par_mur(piece._coef_room),
+                            pas_debut, pas_releve, T_room_rel, T_int_rel)
+    else:
+        p = parametres_par_mur(mur.materiau, forme)
+        avancer_piece(mur.H.reshape(n, mur.N), mur.T.reshape(n, mur.N),
+                      piece.T_room.reshape(n), T_ext_vals, float(dt), par_mur(mur._coef_lap),
+                      p["H_low"], p["inv_dH"], p["L_vol"], p["inv_C"], p["C"], p["T_low"],
+                      p["inv_2delta"], par_mur(piece._a_robin), par_mur(piece._b_robin),
+                      par_mur(piece._coef_room), pas_debut, pas_releve, T_room_rel, T_int_rel)
+    mur.mettre_a_jour_T()
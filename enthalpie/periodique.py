@@ -0,0 +1,126 @@
+"""
+Régime périodique établi d'une pièce soumise à un forçage périodique
+(par exemple la sinusoïde de 24 h des scripts), sans simuler le transitoire.
+
+L'inconnue est l'état au début d'une période : températures des murs et
+de l'air (T plutôt que H, pour des grandeurs de même ordre). L'application
+de période P(x) avance la pièce d'une période à partir de x ; le régime
+établi est le point fixe x = P(x), cherché par tir :
+- "anderson" : itérations de point fixe accélérées (Anderson), chaque
+  itération ne coûte qu'une période. Le mode lent (chaleur latente du
+  MCP), qui ne s'atténue que d'un facteur ~2 par jour avec la sinusoïde
+  de 24 h, est éliminé en quelques périodes au lieu d'une dizaine ;
+- "newton-krylov" : Newton sur P(x) - x, jacobienne approchée par
+  différences finies dans un sous-espace de Krylov (SciPy) ;
+- "point-fixe" : périodes successives, comme une simulation longue.
+"""
+import numpy as np
+
+try:
+    from scipy.optimize import NoConvergence, newton_krylov
+except ImportError:
+    newton_krylov = None
+
+from .meteo import valeurs_forcage
+from .noyau_numba import avancer_piece_bloc, choisir_backend
+from .piece import Piece
+
+METHODES = ("anderson", "newton-krylov", "point-fixe")
+
+
+def regime_periodique(materiau, L, N, T_ext, periode, dt, h_conv, A, C_room,
+                      T_init_wall, T_room_init, pas_releve=100, schema="explicite",
+                      backend="auto", methode="anderson", tol=1e-3, max_periodes=30,
+                      memoire=3, max_newton=10):
+    """
+    Cycle établi de la pièce de simuler_piece (mêmes paramètres) pour un
+    T_ext de période `periode` (s, multiple de dt). T_init_wall et
+    T_room_init ne servent que de point de départ.
+
+    Le cycle est atteint quand P(x) et x diffèrent de moins de tol (°C)
+    partout. Renvoie les relevés d'un cycle (comme simuler_piece :
+    "temps", "T_ext", "T_room", "T_interieur", "x", et "T" le profil des
+    murs au début du cycle), "residu" (max |P(x) - x| en °C, du cycle
+    renvoyé) et "periodes" (nombre de périodes simulées). memoire : nombre
+    d'itérations précédentes utilisées par Anderson ; max_newton : nombre
+    maximal d'itérations de Newton (chacune coûte une dizaine de périodes).
+    """
+    if methode not in METHODES:
+        raise ValueError(f"Méthode inconnue : {methode!r}")
+    if methode == "newton-krylov" and newton_krylov is None:
+        raise ImportError("La méthode de Newton-Krylov nécessite SciPy")
+    steps = int(round(periode / dt))
+    if abs(steps * dt - periode) > 1e-9 * periode:
+        raise ValueError("La période doit être un multiple de dt")
+
+    piece = Piece(materiau, L, N, T_init_wall, T_room_init, h_conv, A, C_room, schema)
+    mur = piece.mur
+    decalage = 0.0 if piece.solveur is None else dt
+    compile = piece.solveur is None and choisir_backend(backend, mur.materiau) == "numba"
+    # Forçage d'une période, calculé une seule fois
+    T_ext_vals = valeurs_forcage(T_ext, np.arange(steps) * dt + decalage)
+
+    n_releves = (steps + pas_releve - 1) // pas_releve
+    n_murs = piece.T_room.size
+    T_room_arr = np.empty((n_releves, n_murs))
+    T_interior_arr = np.empty((n_releves, n_murs))
+    n_T = mur.T.size
+    compteur = [0]
+
+    def periode_suivante(x):
+        # Application de période : état au début -> état à la fin
+        compteur[0] += 1
+        mur.T[...] = x[:n_T].reshape(mur.T.shape)
+        mur.materiau.compute_H(mur.T, out=mur.H)
+        mur.mettre_a_jour_T()
+        piece.T_room[...] = x[n_T:].reshape(piece.T_room.shape)
+        if compile:
+            avancer_piece_bloc(piece, T_ext_vals, dt, 0, pas_releve, T_room_arr, T_interior_arr)
+        else:
+            for step in range(steps):
+                piece.pas(dt, T_ext_vals[step])
+                if step % pas_releve == 0:
+                    T_room_arr[step // pas_releve] = piece.T_room.ravel()
+                    T_interior_arr[step // pas_releve] = mur.T[..., -1].ravel()
+        return np.concatenate([mur.T.ravel(), piece.T_room.ravel()])
+
+    x = np.concatenate([mur.T.ravel(), piece.T_room.ravel()])
+    if methode == "newton-krylov":
+        try:
+            # Pas des différences finies au-dessus du bruit des itérations
+            # non linéaires du schéma implicite (tol 1e-6)
+            x = newton_krylov(lambda x: periode_suivante(x) - x, x, f_tol=tol,
+                              maxiter=max_newton, rdiff=1e-5, method="lgmres")
+        except NoConvergence as erreur:
+            x = erreur.args[0]
+        P_x = periode_suivante(x)
+    else:
+        # Anderson (type II) ; memoire = 0 redonne le point fixe simple
+        memoire = 0 if methode == "point-fixe" else memoire
+        dF, dG = [], []
+        P_x = periode_suivante(x)
+        f = P_x - x
+        while np.max(np.abs(f)) >= tol and compteur[0] < max_periodes:
+            if dF:
+                gamma = np.linalg.lstsq(np.array(dF).T, f, rcond=None)[0]
+                x_suivant = P_x - np.array(dG).T @ gamma
+            else:
+                x_suivant = P_x
+            P_suivant = periode_suivante(x_suivant)
+            f_suivant = P_suivant - x_suivant
+            if memoire:
+                dF.append(f_suivant - f)
+                dG.append(P_suivant - P_x)
+                del dF[:-memoire], dG[:-memoire]
+            x, P_x, f = x_suivant, P_suivant, f_suivant
+
+    return {
+        "x": mur.x,
+        "temps": np.arange(n_releves) * pas_releve * dt + decalage,
+        "T_ext": np.asarray(T_ext_vals)[::pas_releve],
+        "T_room": T_room_arr,
+        "T_interieur": T_interior_arr,
+        "T": x[:n_T].reshape(mur.T.shape),
+        "residu": float(np.max(np.abs(P_x - x))),
+        "periodes": compteur[0],
+    }
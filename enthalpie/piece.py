@@ -0,0 +1,237 @@
+import os
+
+import numpy as np
+
+from .champs import EcrivainChamps
+from .implicite import SolveurImplicite, theta_du_schema
+from .meteo import valeurs_forcage
+from .mur import Mur, par_cas
+from .noyau_numba import avancer_piece_bloc, choisir_backend
+from .reprise import charger_point, sauver_point
+
+
+class Piece:
+    """
+    Murs couplés chacun à une pièce (modèle lumpé).
+
+    Chaque ligne du mur est un cas (par exemple MCP et isolation classique) :
+    T_ext est imposée en x = 0, la face x = L échange par convection avec
+    l'air de sa pièce, et C_room * dT_room/dt = h_conv * A * (T_mur - T_room).
+    Tous les murs sont avancés ensemble, sans boucle sur les noeuds.
+
+    Avec schema = "implicite" ou "crank-nicolson", le mur et l'air sont
+    résolus implicitement : des pas de plusieurs minutes restent stables.
+
+    L, T_init_wall, T_room_init, h_conv, A, C_room et T_ext peuvent aussi
+    être des listes d'une valeur par cas (ensemble de cas, voir
+    Materiau.ensemble).
+    """
+
+    def __init__(self, materiau, L, N, T_init_wall, T_room_init, h_conv, A, C_room,
+                 schema="explicite"):
+        h_conv, A, C_room = par_cas(h_conv), par_cas(A), par_cas(C_room)
+        self.mur = Mur(materiau, par_cas(L), N, par_cas(T_init_wall))
+        forme_bord = self.mur.T.shape[:-1] + (1,)
+        self.T_room = np.empty(forme_bord)
+        self.T_room[...] = par_cas(T_room_init)
+
+        # Condition convective intérieure par DF :
+        # T[-1] = (T[-2] + Bi * T_room) / (1 + Bi), avec Bi = h_conv * dx / k
+        Bi = h_conv * self.mur.dx / self.mur.k_bords[1]
+        self._Bi = Bi
+        self._a_robin = 1 / (1 + Bi)
+        self._b_robin = Bi / (1 + Bi)
+        self._coef_room = h_conv * A / C_room
+        self._T_bord = np.empty(forme_bord)
+
+        theta = theta_du_schema(schema)
+        self.solveur = SolveurImplicite(self.mur, theta) if theta is not None else None
+
+    def etat(self):
+        """
+        Copie de l'état de la simulation (H des murs et T_room).
+        """
+        return self.mur.H.copy(), self.T_room.copy()
+
+    def restaurer(self, etat):
+        """
+        Revient à un état renvoyé par etat().
+        """
+        H, T_room = etat
+        self.mur.H[...] = H
+        self.T_room[...] = T_room
+        self.mur.mettre_a_jour_T()
+
+    def pas(self, dt, T_ext_val):
+        """
+        Avance les murs et les pièces d'un pas de temps dt.
+        """
+        T_ext_val = par_cas(T_ext_val)
+        if self.solveur is not None:
+            self._pas_implicite(dt, T_ext_val)
+            return
+
+        mur = self.mur
+        T = mur.T
+
+        # Condition convective intérieure (x = L)
+        np.multiply(T[..., -2:-1], self._a_robin, out=self._T_bord)
+        self._T_bord += self._b_robin * self.T_room
+
+        # Condition extérieure imposée à x = 0
+        mur.imposer_T_bords(T_ext_val, self._T_bord)
+
+        # Conduction dans les murs (schéma explicite)
+        mur.pas_explicite(dt)
+
+        # Température de la pièce
+        self.T_room += dt * self._coef_room * (T[..., -1:] - self.T_room)
+
+    def _pas_implicite(self, dt, T_ext_val):
+        # Air de la pièce en Euler implicite :
+        # T_room' = (T_room + c*dt*T[-1]) / (1 + c*dt), reporté dans la
+        # condition convective (1 + Bi) * T[-1] - T[-2] = Bi * T_room'
+        c_dt = dt * self._coef_room
+        Bi = self._Bi
+        a_N = 1 + Bi - Bi * c_dt / (1 + c_dt)
+        d_N = Bi * self.T_room / (1 + c_dt)
+        self.solveur.pas(dt, (1.0, 0.0, T_ext_val), (a_N, -1.0, d_N))
+
+        self.T_room += c_dt * self.mur.T[..., -1:]
+        self.T_room /= 1 + c_dt
+
+
+def simuler_piece(materiau, L, N, T_ext, dt, total_time, h_conv, A, C_room,
+                  T_init_wall, T_room_init, pas_releve=100, schema="explicite",
+                  backend="auto", taille_bloc=8192, fichier_reprise=None,
+                  pas_reprise=None, reprendre=True, fichier_champs=None, pas_champs=None):
+    """
+    Simulation d'une ou plusieurs pièces sur total_time secondes.
+
+    T_ext(t) est la fonction de température extérieure des scripts.
+    Les résultats sont relevés tous les pas_releve pas, une colonne par mur.
+    En implicite, T_ext est prise en fin de pas et les relevés sont datés
+    de la fin du pas.
+
+    T_ext est évaluée par blocs de taille_bloc pas : T_ext peut être un
+    FichierMeteo (fichier climatique lu au fur et à mesure), dont les
+    valeurs d'un bloc sont interpolées d'un seul appel. Avec le backend
+    Numba (schéma explicite), chaque bloc est avancé par le noyau compilé.
+
+    Pour un ensemble de cas, T_ext(t) peut renvoyer une valeur par cas ; le
+    relevé "T_ext" a alors une colonne par cas.
+
+    Avec fichier_reprise, l'état complet (murs, pièces, pas atteint et
+    relevés) y est écrit tous les pas_reprise pas (par défaut une heure
+    simulée) et en fin de calcul. Si le fichier existe et que reprendre est
+    vrai, la simulation repart de ce point, à l'identique : prolonger un
+    calcul de 5 à 30 jours ne coûte que les 25 jours supplémentaires.
+
+    Avec fichier_champs, les champs T, H et fraction liquide complets des
+    murs sont écrits tous les pas_champs pas (par défaut pas_releve), par
+    blocs compressés, pour la partie calculée par cet appel (voir
+    LecteurChamps).
+    """
+    steps = int(total_time / dt)
+    piece = Piece(materiau, L, N, T_init_wall, T_room_init, h_conv, A, C_room, schema)
+    mur = piece.mur
+    decalage = 0.0 if piece.solveur is None else dt
+
+    n_releves = (steps + pas_releve - 1) // pas_releve
+    n_murs = piece.T_room.size
+    temps = np.empty(n_releves)
+    T_ext_arr = np.empty((n_releves,) + np.shape(T_ext(0.0)))
+    T_room_arr = np.empty((n_releves, n_murs))
+    T_interior_arr = np.empty((n_releves, n_murs))
+    releves = {"temps": temps, "T_ext": T_ext_arr, "T_room": T_room_arr,
+               "T_interieur": T_interior_arr}
+
+    # Paramètres qui doivent être identiques pour reprendre un calcul
+    signature = np.array([dt, N, pas_releve, n_murs, -1 if decalage == 0 else 1])
+    pas_reprise = pas_reprise or max(1, int(3600 / dt))
+
+    def sauver(pas_faits):
+        n_faits = (pas_faits + pas_releve - 1) // pas_releve
+        sauver_point(fichier_reprise, signature=signature, pas=pas_faits, H=mur.H, T=mur.T,
+                     fraction=mur.fraction, T_room=piece.T_room,
+                     **{"releve_" + nom: tableau[:n_faits] for nom, tableau in releves.items()})
+
+    pas_champs = pas_champs or pas_releve
+    if fichier_champs is not None:
+        champs = EcrivainChamps(fichier_champs, mur.x, mur.T.shape)
+
+    def ecrire_champs(pas_faits):
+        if fichier_champs is not None and pas_faits % pas_champs == 0:
+            champs.ajouter(pas_faits * dt, T=mur.T, H=mur.H, fraction=mur.fraction)
+
+    depart = 0
+    if fichier_reprise is not None and reprendre and os.path.exists(fichier_reprise):
+        point = charger_point(fichier_reprise)
+        if not np.array_equal(point["signature"], signature) or point["H"].shape != mur.H.shape:
+            raise ValueError(f"{fichier_reprise} : point de reprise d'une autre simulation")
+        depart = int(point["pas"])
+        if depart > steps:
+            raise ValueError(f"{fichier_reprise} : point de reprise au-delà de total_time")
+        mur.H[...] = point["H"]
+        mur.T[...] = point["T"]
+        mur.fraction[...] = point["fraction"]
+        piece.T_room[...] = point["T_room"]
+        for nom, tableau in releves.items():
+            n = min(len(point["releve_" + nom]), len(tableau))
+            tableau[:n] = point["releve_" + nom][:n]
+
+    ecrire_champs(depart)
+    if piece.solveur is None and choisir_backend(backend, mur.materiau) == "numba":
+        # Blocs coupés aux points de reprise et aux écritures des champs
+        arrets = set(range(depart, steps, taille_bloc)) | {steps}
+        if fichier_reprise is not None:
+            arrets.update(range(-(-depart // pas_reprise) * pas_reprise, steps, pas_reprise))
+        if fichier_champs is not None:
+            arrets.update(range(-(-depart // pas_champs) * pas_champs, steps, pas_champs))
+        arrets = sorted(a for a in arrets if a >= depart)
+        for debut, fin in zip(arrets[:-1], arrets[1:]):
+            T_ext_vals = valeurs_forcage(T_ext, np.arange(debut, fin) * dt)
+            avancer_piece_bloc(piece, T_ext_vals, dt, debut, pas_releve,
+                               T_room_arr, T_interior_arr)
+            pas_releves = np.arange(-(-debut // pas_releve) * pas_releve, fin, pas_releve)
+            temps[pas_releves // pas_releve] = pas_releves * dt
+            T_ext_arr[pas_releves // pas_releve] = T_ext_vals[pas_releves - debut]
+            ecrire_champs(fin)
+            if fichier_reprise is not None and fin % pas_reprise == 0:
+                sauver(fin)
+    else:
+        for step in range(depart, steps):
+            t = step * dt + decalage
+            if step == depart or step - debut_bloc == taille_bloc:
+                # T_ext du bloc de pas suivant, d'un seul appel pour un forçage tabulé
+                debut_bloc = step
+                T_ext_vals = valeurs_forcage(
+                    T_ext, np.arange(step, min(step + taille_bloc, steps)) * dt + decalage)
+            T_ext_val = T_ext_vals[step - debut_bloc]
+            piece.pas(dt, T_ext_val)
+
+            # Enregistrement des résultats tous les pas_releve pas
+            if step % pas_releve == 0:
+                j = step // pas_releve
+                temps[j] = t
+                T_ext_arr[j] = T_ext_val
+                T_room_arr[j] = piece.T_room.ravel()
+                T_interior_arr[j] = mur.T[..., -1].ravel()
+            ecrire_champs(step + 1)
+
+            if fichier_reprise is not None and (step + 1) % pas_reprise == 0:
+                sauver(step + 1)
+
+    if fichier_reprise is not None and (steps % pas_reprise or depart == steps):
+        sauver(steps)
+    if fichier_champs is not None:
+        champs.fermer()
+
+    return {
+        "x": mur.x,
+        "temps": temps,
+        "T_ext": T_ext_arr,
+        "T_room": T_room_arr,
+        "T_interieur": T_interior_arr,
+        "T": mur.T.copy(),
+    }
@@ -0,0 +1,259 @@
+"""
+Modèle réduit (POD + DEIM) du mur MCP dans la pièce de Piece.
+
+Apprentissage : une simulation complète (ou un ensemble de cas voisins)
+fournit des instantanés de H et de T aux noeuds intérieurs du mur. La
+décomposition orthogonale aux valeurs propres (POD, SVD des instantanés)
+donne une base Phi de `rang` modes pour H ; T(H), non linéaire, n'est
+évaluée qu'en n_points noeuds choisis par DEIM et reconstruite sur tout
+le mur par interpolation dans la base POD de T :
+    H ~ H_moy + Phi a,        T ~ Q T(H aux points DEIM)
+
+Évaluation : l'état est z = [a, T_room], de taille rang + 1. Comme dans
+la méthode de Chernoff, T = (H - L_vol f) / C est séparée en une partie
+linéaire en H, traitée implicitement (matrice (rang + 1)^2 inversée une
+fois pour toutes), et la chaleur latente L_vol f, explicite :
+    z <- M z + M_E g(z) + M_F T_ext
+Un pas coûte quelques centaines d'opérations et peut être bien plus long
+que la limite CFL du modèle complet.
+"""
+import numpy as np
+
+from .meteo import valeurs_forcage
+from .noyau_numba import avancer_piece_bloc, avancer_reduit, choisir_backend
+from .piece import Piece
+
+
+def _deim(U):
+    # Points d'interpolation DEIM (Chaturantabut et Sorensen) de la base U
+    points = [int(np.argmax(np.abs(U[:, 0])))]
+    for j in range(1, U.shape[1]):
+        c = np.linalg.solve(U[points, :j], U[points, j])
+        points.append(int(np.argmax(np.abs(U[:, j] - U[:, :j] @ c))))
+    return np.array(points)
+
+
+class ModeleReduit:
+    """
+    Modèle réduit d'un mur (materiau, L, N) et de sa pièce. Se construit
+    avec ModeleReduit.apprendre ; simuler remplace simuler_piece.
+
+    Attributs utiles : energie_negligee (part de l'énergie des instantanés
+    de H hors de la base), erreur_deim_apprentissage (°C, écart maximal
+    entre T et son interpolation DEIM sur les instantanés) et
+    erreur_apprentissage (°C, écart maximal sur T_room entre le modèle
+    réduit et la simulation complète d'apprentissage ; nan pour un
+    ensemble de cas).
+    """
+
+    def __init__(self, materiau, L, N, instantanes_H, instantanes_T, rang=16, n_points=None):
+        self.materiau = materiau
+        self.L = L
+        self.N = N
+        n_points = rang + 4 if n_points is None else n_points
+
+        self.H_moy = instantanes_H.mean(axis=1)
+        U, S, _ = np.linalg.svd(instantanes_H - self.H_moy[:, None], full_matrices=False)
+        rang = min(rang, len(S))
+        self.Phi = U[:, :rang]
+        self.energie_negligee = float(np.sum(S[rang:] ** 2) / np.sum(S ** 2))
+
+        U_T = np.linalg.svd(instantanes_T, full_matrices=False)[0][:, :min(n_points, len(S))]
+        self.points = _deim(U_T)
+        self.Q = U_T @ np.linalg.inv(U_T[self.points])
+        self.erreur_deim_apprentissage = float(
+            np.max(np.abs(self.Q @ instantanes_T[self.points] - instantanes_T)))
+        self.erreur_apprentissage = np.nan
+
+    @classmethod
+    def apprendre(cls, materiau, L, N, T_ext, dt, total_time, h_conv, A, C_room,
+                  T_init_wall, T_room_init, rang=16, n_points=None, pas_instantanes=60,
+                  backend="auto"):
+        """
+        Simulation complète (explicite, paramètres de simuler_piece) dont les
+        instantanés, tous les pas_instantanes pas, forment les bases. Avec un
+        ensemble de cas (Materiau.ensemble, listes de h_conv, ...), les
+        instantanés de tous les cas sont réunis : la base couvre alors ces
+        variations.
+        """
+        piece = Piece(materiau, L, N, T_init_wall, T_room_init, h_conv, A, C_room)
+        mur = piece.mur
+        compile = choisir_backend(backend, mur.materiau) == "numba"
+        steps = int(total_time / dt)
+        instantanes_H = [mur.H[..., 1:-1].reshape(-1, N - 2).copy()]
+        instantanes_T = [mur.T[..., 1:-1].reshape(-1, N - 2).copy()]
+        n_murs = piece.T_room.size
+        T_room = []
+        for debut in range(0, steps, pas_instantanes):
+            fin = min(debut + pas_instantanes, steps)
+            T_ext_vals = valeurs_forcage(T_ext, np.arange(debut, fin) * dt)
+            if compile:
+                avancer_piece_bloc(piece, T_ext_vals, dt, 0, fin - debut + 1,
+                                   np.empty((1, n_murs)), np.empty((1, n_murs)))
+            else:
+                for T_ext_val in T_ext_vals:
+                    piece.pas(dt, T_ext_val)
+            instantanes_H.append(mur.H[..., 1:-1].reshape(-1, N - 2).copy())
+            instantanes_T.append(mur.T[..., 1:-1].reshape(-1, N - 2).copy())
+            T_room.append(float(piece.T_room.ravel()[0]))
+        modele = cls(materiau, L, N, np.concatenate(instantanes_H).T,
+                     np.concatenate(instantanes_T).T, rang, n_points)
+        if n_murs == 1 and steps >= pas_instantanes:
+            # Le modèle réduit rejoue l'apprentissage : écart sur T_room
+            rejeu = modele.simuler(T_ext, dt, total_time, h_conv, A, C_room, T_init_wall,
+                                   T_room_init, pas_releve=pas_instantanes, backend=backend,
+                                   estimer_erreur=False)
+            n = len(rejeu["temps"])
+            modele.erreur_apprentissage = float(
+                np.max(np.abs(rejeu["T_room"][:, 0] - T_room[:n])))
+        return modele
+
+    def _operateurs(self, piece, dt):
+        # Matrices du pas réduit pour la pièce `piece` (un seul mur) et dt
+        mur = piece.mur
+        N, Phi, Q, P = self.N, self.Phi, self.Q, self.points
+        # Conductances des faces (W/(m^3.K)) : dH/dt = D T aux noeuds intérieurs
+        if mur._coef_faces is None:
+            c = np.full(N - 1, float(mur._coef_lap))
+        else:
+            c = np.asarray(mur._coef_faces, dtype=float).reshape(N - 1)
+        D = np.diag(-(c[:-1] + c[1:])) + np.diag(c[1:-1], 1) + np.diag(c[1:-1], -1)
+        k_0 = Phi[0] * c[0]             # Phi^T d_0 : bord extérieur
+        k_N = Phi[-1] * c[-1]           # Phi^T d_N : bord intérieur
+
+        materiau = mur.materiau.noeuds(P + 1)
+        m = len(P)
+        p = {nom: np.broadcast_to(np.asarray(valeur, dtype=float).reshape(-1), (m,)).copy()
+             for nom, valeur in (("H_low", materiau.H_low), ("inv_dH", materiau._inv_dH),
+                                 ("L_vol", materiau.L_vol), ("inv_C", materiau._inv_C))}
+        B = Phi[P] * p["inv_C"][:, None]            # T aux points = g + B a
+        K = Phi.T @ D @ Q
+        q = Q[-1]                                    # dernier noeud intérieur
+        a_robin, b_robin, c_room = (np.asarray(coef, dtype=float).item() for coef in
+                                    (piece._a_robin, piece._b_robin, piece._coef_room))
+
+        r = Phi.shape[1]
+        A_lin = np.zeros((r + 1, r + 1))
+        A_lin[:r, :r] = K @ B + a_robin * np.outer(k_N, q @ B)
+        A_lin[:r, r] = b_robin * k_N
+        A_lin[r, :r] = c_room * a_robin * (q @ B)
+        A_lin[r, r] = c_room * (b_robin - 1.0)
+        E = np.vstack([K + a_robin * np.outer(k_N, q), c_room * a_robin * q[None]])
+        F = np.append(k_0, 0.0)
+
+        M = np.linalg.inv(np.eye(r + 1) - dt * A_lin)
+        p.update(M=M, M_E=dt * M @ E, M_F=dt * M @ F, B=B, a_robin=a_robin, b_robin=b_robin)
+        return p
+
+    def simuler(self, T_ext, dt, total_time, h_conv, A, C_room, T_init_wall, T_room_init,
+                pas_releve=1, materiau=None, backend="auto", taille_bloc=8192,
+                estimer_erreur=True):
+        """
+        Simulation réduite de la pièce ; mêmes paramètres et mêmes relevés
+        que simuler_piece (un seul mur), relevés datés de la fin du pas.
+        materiau : par défaut celui de l'apprentissage ; peut être un
+        matériau voisin (L_latent, T_m, delta, C, k, ...) de même géométrie.
+
+        "erreur_estimee" estime l'écart maximal (°C) sur T_room et
+        T_interieur avec la simulation complète : somme de
+        - "erreur_pas" : erreur due au pas de temps, le schéma étant d'ordre
+          1, estimée par l'écart avec une seconde simulation réduite à
+          2 * dt (Richardson), soit la moitié du coût en plus ; sans
+          estimer_erreur, elle n'est pas calculée (nan) ;
+        - "erreur_modele" : erreur de la réduction elle-même, la plus grande
+          de erreur_apprentissage (troncature POD et DEIM mesurées sur la
+          simulation d'apprentissage) et de "erreur_deim" (écart maximal,
+          aux instants relevés, entre T(H) sur tout le mur reconstruit et
+          son interpolation DEIM). Loin du cas d'apprentissage (autre
+          matériau, autre forçage), elle peut être sous-estimée.
+        """
+        materiau = self.materiau if materiau is None else materiau
+        parametres = (materiau, T_init_wall, T_room_init, h_conv, A, C_room)
+        resultat = self._avancer(parametres, T_ext, dt, total_time, pas_releve, backend,
+                                 taille_bloc)
+
+        erreur_pas = np.nan
+        if estimer_erreur and int(total_time / (2 * dt)) >= 1:
+            grossier = self._avancer(parametres, T_ext, 2 * dt, total_time,
+                                     max(pas_releve // 2, 1), backend, taille_bloc,
+                                     complet=False)
+            t = resultat["temps"]
+            dedans = (t >= grossier["temps"][0]) & (t <= grossier["temps"][-1])
+            erreur_pas = max(
+                float(np.max(np.abs(resultat[nom][dedans, 0] - np.interp(
+                    t[dedans], grossier["temps"], grossier[nom][:, 0])), initial=0.0))
+                for nom in ("T_room", "T_interieur"))
+        erreur_modele = float(np.fmax(resultat["erreur_deim"], self.erreur_apprentissage))
+        resultat.update(erreur_pas=erreur_pas, erreur_modele=erreur_modele,
+                        erreur_estimee=erreur_pas + erreur_modele)
+        return resultat
+
+    def _avancer(self, parametres, T_ext, dt, total_time, pas_releve, backend, taille_bloc,
+                 complet=True):
+        # Une simulation réduite à pas dt ; relevés, et si complet profil
+        # final et erreur_deim
+        materiau, T_init_wall, T_room_init, h_conv, A, C_room = parametres
+        piece = Piece(materiau, self.L, self.N, T_init_wall, T_room_init, h_conv, A, C_room)
+        if piece.T_room.size != 1:
+            raise ValueError("Le modèle réduit ne simule qu'un seul mur à la fois")
+        if getattr(piece.mur.materiau, "tabule", False):
+            raise ValueError("Le modèle réduit suppose une zone pâteuse linéaire "
+                             "(matériau non tabulé)")
+        p = self._operateurs(piece, dt)
+        P, Phi = self.points, self.Phi
+        H_moy_P, Phi_P = self.H_moy[P].copy(), np.ascontiguousarray(Phi[P])
+        r = Phi.shape[1]
+
+        z = np.append(Phi.T @ (piece.mur.H.reshape(-1)[1:-1] - self.H_moy),
+                      float(piece.T_room.reshape(-1)[0]))
+        steps = int(total_time / dt)
+        n_releves = steps // pas_releve
+        z_rel = np.empty((n_releves, r + 1))
+        temps = np.arange(1, n_releves + 1) * pas_releve * dt
+        T_ext_arr = np.empty(n_releves)
+        compile = choisir_backend(backend, piece.mur.materiau) == "numba"
+        for debut in range(0, steps, taille_bloc):
+            fin = min(debut + taille_bloc, steps)
+            T_ext_vals = np.asarray(valeurs_forcage(T_ext, np.arange(debut + 1, fin + 1) * dt),
+                                    dtype=float).reshape(-1)
+            releves = np.arange(-(-(debut + 1) // pas_releve) * pas_releve, fin + 1, pas_releve)
+            T_ext_arr[releves // pas_releve - 1] = T_ext_vals[releves - debut - 1]
+            if compile:
+                avancer_reduit(z, T_ext_vals, H_moy_P, Phi_P, p["H_low"], p["inv_dH"],
+                               p["L_vol"], p["inv_C"], p["M"], p["M_E"], p["M_F"],
+                               debut, pas_releve, z_rel)
+                continue
+            for n, T_ext_val in enumerate(T_ext_vals):
+                h = H_moy_P + Phi_P @ z[:r]
+                f = np.clip((h - p["H_low"]) * p["inv_dH"], 0.0, 1.0)
+                z = p["M"] @ z + p["M_E"] @ ((H_moy_P - p["L_vol"] * f) * p["inv_C"]) \
+                    + p["M_F"] * T_ext_val
+                if (debut + n + 1) % pas_releve == 0:
+                    z_rel[(debut + n + 1) // pas_releve - 1] = z
+
+        # Températures aux points DEIM et face intérieure
+        a, T_room = z_rel[:, :r], z_rel[:, r]
+        h = H_moy_P + a @ Phi_P.T
+        f = np.clip((h - p["H_low"]) * p["inv_dH"], 0.0, 1.0)
+        T_P = (h - p["L_vol"] * f) * p["inv_C"]
+        T_interieur = p["a_robin"] * (T_P @ self.Q[-1]) + p["b_robin"] * T_room
+        T_final = np.full(self.N, np.nan)
+        erreur = np.nan
+        if complet and n_releves:
+            # Estimation d'erreur DEIM : T(H) du mur reconstruit contre Q T(H)[P]
+            T_mur = T_P @ self.Q.T                              # (n_releves, N - 2)
+            H_mur = self.H_moy + a @ Phi.T
+            T_exact = piece.mur.materiau.noeuds(slice(1, -1)).T_from_H(H_mur)
+            erreur = float(np.max(np.abs(T_exact - T_mur)))
+            T_final[0] = T_ext_arr[-1]
+            T_final[1:-1] = T_mur[-1]
+            T_final[-1] = T_interieur[-1]
+        return {
+            "x": piece.mur.x,
+            "temps": temps,
+            "T_ext": T_ext_arr,
+            "T_room": T_room[:, None],
+            "T_interieur": T_interieur[:, None],
+            "T": T_final,
+            "erreur_deim": erreur,
+        }
@@ -0,0 +1,187 @@
+"""
+Ajustement des paramètres du MCP sur une courbe de refroidissement.
+
+L'échantillon est supposé uniforme (modèle à une capacité) et refroidi par
+des pertes proportionnelles à l'écart avec l'ambiance :
+    dH/dt = -pertes * (T(H) - T_ambiante)
+avec H(T) le modèle enthalpique de Materiau. Tous les candidats d'une
+grille de paramètres sont intégrés ensemble (un candidat par ligne, voir
+Materiau.ensemble), puis le meilleur est affiné par moindres carrés.
+"""
+import itertools
+import json
+import math
+import os
+
+import numpy as np
+
+try:
+    from scipy.optimize import least_squares
+except ImportError:  # grille resserrée tour après tour, comme calibration.py
+    least_squares = None
+
+from .materiau import Materiau
+from .mur import par_cas
+
+PARAMETRES_AJUSTES = ("L_latent", "T_m", "delta", "pertes", "T_ambiante")
+
+# Bornes par défaut (paraffines, petit échantillon à l'air libre)
+BORNES = {
+    "L_latent": (50e3, 350e3),      # J/kg
+    "T_m": (30.0, 80.0),            # °C
+    "delta": (0.5, 15.0),           # °C
+    "pertes": (500.0, 50e3),        # W/(m^3.K)
+}
+
+
+def simuler_refroidissement(materiau, pertes, T_ambiante, temps, T_initial, pas_max=1.0):
+    """
+    Température de l'échantillon aux instants `temps` (Euler explicite,
+    sous-pas d'au plus pas_max s). materiau peut être un ensemble de cas
+    (Materiau.ensemble) ; pertes et T_ambiante sont alors des scalaires ou
+    des tableaux d'une valeur par cas. Renvoie un tableau (n_temps, n_cas)
+    ou (n_temps,) pour un seul cas.
+    """
+    temps = np.asarray(temps, dtype=float)
+    pertes, T_ambiante = par_cas(pertes), par_cas(T_ambiante)
+    forme = np.broadcast(np.empty(1), materiau.C, pertes, T_ambiante).shape
+
+    T = np.empty(forme)
+    T[...] = T_initial
+    H = materiau.compute_H(T)
+    fraction = np.empty(forme)
+    flux = np.empty(forme)
+    releve = np.empty((len(temps),) + forme)
+    releve[0] = T
+    for j in range(len(temps) - 1):
+        duree = temps[j + 1] - temps[j]
+        n_sous = max(1, math.ceil(duree / pas_max))
+        pas = duree / n_sous
+        for _ in range(n_sous):
+            np.subtract(T, T_ambiante, out=flux)
+            flux *= pertes * pas
+            H -= flux
+            materiau.T_from_H(H, out=T, fraction=fraction)
+        releve[j + 1] = T
+    return releve[..., 0]
+
+
+def _residus(candidats, noms, materiau, fixes, temps, T, pas_max):
+    # Écarts simulé - mesuré (n_temps, n_candidats), un candidat par ligne
+    n_cas = len(candidats)
+    valeurs = dict(fixes)
+    valeurs.update({nom: candidats[:, j] for j, nom in enumerate(noms)})
+    params = {nom: np.broadcast_to(valeurs.get(nom, getattr(materiau, nom)), (n_cas,))
+              for nom in ("rho", "cp", "k", "L_latent", "T_m", "delta",
+                          "p", "rho_v", "cp_v", "k_v")}
+    simule = simuler_refroidissement(Materiau.ensemble(**params), valeurs["pertes"],
+                                     valeurs["T_ambiante"], temps, T[0], pas_max)
+    return simule - T[:, None]
+
+
+def ajuster_refroidissement(materiau, temps, T, bornes=None, T_ambiante=None,
+                            n_points=6, pas_max=1.0, n_raffinements=8):
+    """
+    Ajuste L_latent, T_m, delta et le coefficient de pertes (W/(m^3.K))
+    pour que le modèle à une capacité suive la courbe (temps, T) en °C.
+    rho, cp et les autres paramètres viennent de `materiau`.
+
+    bornes : {nom: (min, max)} complétant BORNES ; T_ambiante n'est ajustée
+    que si elle y figure, sinon elle vaut `T_ambiante` (par défaut la plus
+    basse température relevée moins 1 °C).
+
+    Une grille de n_points valeurs par paramètre est d'abord évaluée d'un
+    bloc (tous les candidats intégrés ensemble) ; le meilleur candidat est
+    ensuite affiné par moindres carrés, chaque jacobienne (différences
+    finies) étant elle aussi un seul ensemble de cas. Renvoie un
+    dictionnaire : "parametres" ajustés, "ecart" (°C, quadratique moyen),
+    "materiau" (paramètres complets de Materiau) et "simule" (courbe du
+    meilleur candidat). Sans SciPy, la grille est resserrée n_raffinements
+    fois autour du meilleur candidat au lieu des moindres carrés.
+    """
+    temps = np.asarray(temps, dtype=float)
+    T = np.asarray(T, dtype=float)
+    bornes = {**BORNES, **(bornes or {})}
+    inconnus = set(bornes) - set(PARAMETRES_AJUSTES)
+    if inconnus:
+        raise ValueError(f"Paramètres non ajustables : {sorted(inconnus)}")
+    noms = [nom for nom in PARAMETRES_AJUSTES if nom in bornes]
+    fixes = {"T_ambiante": float(np.min(T)) - 1.0 if T_ambiante is None else T_ambiante}
+    arguments = (noms, materiau, fixes, temps, T, pas_max)
+
+    # Grille grossière, tous les candidats d'un coup
+    limites = np.array([bornes[nom] for nom in noms], dtype=float)
+    axes = [np.linspace(b, h, n_points) for b, h in limites]
+    candidats = np.array(list(itertools.product(*axes)))
+    ecarts = np.sqrt(np.mean(_residus(candidats, *arguments) ** 2, axis=0))
+    depart = candidats[np.nanargmin(ecarts)]
+
+    if least_squares is None:
+        bas, haut = limites[:, 0].copy(), limites[:, 1].copy()
+        for _ in range(n_raffinements):
+            pas_grille = (haut - bas) / max(n_points - 1, 1)
+            bas = np.maximum(depart - pas_grille, limites[:, 0])
+            haut = np.minimum(depart + pas_grille, limites[:, 1])
+            candidats = np.array(list(itertools.product(
+                *[np.linspace(b, h, n_points) for b, h in zip(bas, haut)])))
+            residus = _residus(candidats, *arguments)
+            i = np.nanargmin(np.mean(residus ** 2, axis=0))
+            depart, ecart = candidats[i], residus[:, i]
+        return _resultat(materiau, noms, fixes, depart, ecart, T)
+
+    # Moindres carrés en variables réduites (bornes ramenées à [0, 1])
+    echelle = limites[:, 1] - limites[:, 0]
+
+    def residus(z):
+        return _residus((limites[:, 0] + z * echelle)[None], *arguments)[:, 0]
+
+    def jacobienne(z):
+        h = 1e-6
+        z = np.minimum(z, 1.0 - h)
+        r = _residus(limites[:, 0] + np.vstack([z, z + h * np.eye(len(z))]) * echelle, *arguments)
+        return (r[:, 1:] - r[:, :1]) / h
+
+    solution = least_squares(residus, (depart - limites[:, 0]) / echelle, jac=jacobienne,
+                             bounds=(0.0, 1.0))
+    return _resultat(materiau, noms, fixes, limites[:, 0] + solution.x * echelle,
+                     solution.fun, T)
+
+
+def _resultat(materiau, noms, fixes, meilleur, residus, T):
+    parametres = {**fixes, **dict(zip(noms, meilleur.tolist()))}
+    complet = {nom: float(getattr(materiau, nom)) for nom in ("rho", "cp", "k")}
+    complet.update({nom: parametres[nom] for nom in ("L_latent", "T_m", "delta")})
+    if materiau.p != 1:
+        complet.update({nom: float(getattr(materiau, nom)) for nom in ("p", "rho_v", "cp_v", "k_v")})
+    return {
+        "parametres": parametres,
+        "ecart": float(np.sqrt(np.mean(residus ** 2))),
+        "materiau": complet,
+        "simule": residus + T,
+    }
+
+
+def ecrire_materiau(chemin, parametres):
+    """
+    Écrit les paramètres d'un Materiau dans un fichier JSON (comme
+    paraffine.json) après les avoir vérifiés, puis s'assure que le fichier
+    se relit avec Materiau.depuis_json.
+    """
+    materiau = Materiau(**parametres)
+    for nom, valeur in parametres.items():
+        if not np.isfinite(valeur):
+            raise ValueError(f"{nom} n'est pas fini : {valeur}")
+    for nom in ("rho", "cp", "k", "delta"):
+        if not getattr(materiau, nom) > 0:
+            raise ValueError(f"{nom} doit être strictement positif")
+    if materiau.L_latent < 0:
+        raise ValueError("L_latent doit être positive")
+
+    temporaire = f"{chemin}.tmp"
+    with open(temporaire, "w") as f:
+        json.dump({nom: float(valeur) for nom, valeur in parametres.items()}, f, indent=4)
+    os.replace(temporaire, chemin)
+    relu = Materiau.depuis_json(chemin)
+    if any(getattr(relu, nom) != getattr(materiau, nom) for nom in parametres):
+        raise ValueError(f"{chemin} ne redonne pas le matériau écrit")
+    return relu
@@ -0,0 +1,123 @@
+"""
+Lecture des relevés expérimentaux (fichiers CSV du logiciel d'acquisition).
+
+Le format est détecté (encodage, séparateur, virgule décimale, en-tête) et
+le fichier est converti d'un bloc en tableau NumPy. Le résultat est mis en
+cache dans un fichier .npy voisin, associé à la date de modification du
+relevé : une deuxième lecture ne fait que recharger ce tableau.
+"""
+import glob
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+SEPARATEURS = (";", "\t", ",")
+
+
+def _decoder(octets):
+    # Les relevés du logiciel d'acquisition sont en latin-1
+    try:
+        return octets.decode("utf-8")
+    except UnicodeDecodeError:
+        return octets.decode("latin-1")
+
+
+def _est_nombre(texte):
+    try:
+        float(texte)
+        return True
+    except ValueError:
+        return False
+
+
+def detecter_format(texte):
+    """
+    Séparateur, virgule décimale et présence d'un en-tête d'un relevé.
+    Renvoie (separateur, virgule_decimale, en_tete).
+    """
+    lignes = [ligne for ligne in texte.splitlines()[:20] if ligne.strip()]
+    donnees = lignes[1:] or lignes
+    separateur = next((s for s in SEPARATEURS if all(s in ligne for ligne in donnees)), None)
+    if separateur is None:
+        separateur = " "
+    virgule_decimale = separateur != "," and any("," in ligne for ligne in donnees)
+
+    premier = lignes[0].split(separateur)[0].strip() if lignes else ""
+    if virgule_decimale:
+        premier = premier.replace(",", ".")
+    en_tete = not _est_nombre(premier)
+    return separateur, virgule_decimale, en_tete
+
+
+def _convertir(texte, separateur, virgule_decimale, en_tete):
+    lignes = texte.splitlines()
+    colonnes = []
+    if en_tete:
+        colonnes = [nom.strip() for nom in lignes[0].split(separateur)]
+        lignes = lignes[1:]
+    corps = "\n".join(ligne for ligne in lignes if ligne.strip())
+    if virgule_decimale:
+        corps = corps.replace(",", ".")
+    n_colonnes = corps[:corps.find("\n")].count(separateur) + 1 if corps else len(colonnes)
+
+    # Cas courant : tableau régulier, converti en un seul appel
+    with warnings.catch_warnings():
+        # Un tableau irrégulier est seulement lu en partie : traité plus bas
+        warnings.simplefilter("ignore", DeprecationWarning)
+        valeurs = np.fromstring(corps.replace(separateur, " "), sep=" ") if corps else np.empty(0)
+    if corps and valeurs.size == corps.count("\n") * n_colonnes + n_colonnes:
+        return colonnes, valeurs.reshape(-1, n_colonnes)
+
+    # Lignes incomplètes ou cellules non numériques : nan
+    tableau = np.genfromtxt(corps.splitlines(), delimiter=separateur, dtype=float,
+                            invalid_raise=False, filling_values=np.nan)
+    return colonnes, np.atleast_2d(tableau)
+
+
+def _cache(chemin, mtime):
+    return chemin.with_name(f".{chemin.name}.{mtime}.npy")
+
+
+def charger_csv(chemin, cache=True):
+    """
+    Lit un relevé CSV quelconque. Renvoie (colonnes, tableau) : noms des
+    colonnes de l'en-tête (liste vide sans en-tête) et tableau (n_lignes,
+    n_colonnes), nan pour les cellules vides ou non numériques.
+    """
+    chemin = Path(chemin)
+    mtime = chemin.stat().st_mtime_ns
+    with open(chemin, "rb") as f:
+        octets = f.read() if not cache else f.readline()
+    texte = _decoder(octets)
+    fichier_cache = _cache(chemin, mtime)
+
+    if cache and fichier_cache.exists():
+        separateur, _, en_tete = detecter_format(texte)
+        colonnes = [nom.strip() for nom in texte.split(separateur)] if en_tete else []
+        return colonnes, np.load(fichier_cache)
+
+    if cache:
+        texte = _decoder(chemin.read_bytes())
+    colonnes, tableau = _convertir(texte, *detecter_format(texte))
+
+    if cache:
+        try:
+            for ancien in chemin.parent.glob(f".{glob.escape(chemin.name)}.*.npy"):
+                ancien.unlink()
+            np.save(fichier_cache, tableau)
+        except OSError:
+            pass
+    return colonnes, tableau
+
+
+def lire_releve(chemin, colonne=1, cache=True):
+    """
+    Lit un relevé "Temps;Température{n}" (latin-1, séparateur ;, virgule
+    décimale). Renvoie (temps, valeurs) ; `colonne` est l'indice de la
+    colonne de valeurs. Les lignes incomplètes sont ignorées.
+    """
+    _, tableau = charger_csv(chemin, cache)
+    temps, valeurs = tableau[:, 0], tableau[:, colonne]
+    garder = ~(np.isnan(temps) | np.isnan(valeurs))
+    return temps[garder], valeurs[garder]
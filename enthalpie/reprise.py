@@ -0,0 +1,39 @@
+"""
+Points de reprise : état complet d'une simulation dans un fichier .npz.
+
+L'écriture passe par un fichier temporaire renommé à la fin : un arrêt
+pendant l'écriture laisse intact le point de reprise précédent.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+def sauver_point(chemin, **tableaux):
+    """
+    Écrit les tableaux dans `chemin` (format .npz non compressé), de façon
+    atomique.
+    """
+    chemin = Path(chemin)
+    descripteur, temporaire = tempfile.mkstemp(dir=chemin.parent, prefix=chemin.name,
+                                               suffix=".tmp")
+    try:
+        with os.fdopen(descripteur, "wb") as f:
+            np.savez(f, **tableaux)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaire, chemin)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+
+
+def charger_point(chemin):
+    """
+    Relit un point de reprise écrit par sauver_point : dictionnaire de
+    tableaux.
+    """
+    with np.load(chemin) as donnees:
+        return {nom: donnees[nom] for nom in donnees.files}
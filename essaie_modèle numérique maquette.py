@@ -1,6 +1,7 @@
-import numpy as np
 import matplotlib.pyplot as plt
 
+from enthalpie import Materiau, simuler_piece, simuler_piece_adaptatif
+
 
 # %%
 # -------------------------------
@@ -8,7 +9,6 @@ import matplotlib.pyplot as plt
 # -------------------------------
 L = 0.02        # épaisseur du mur (m)
 N = 50         # nombre de points spatiaux
-dx = L / (N - 1)
 
 rho = 800      # masse volumique (kg/m^3)
 cp = 2000      # capacité thermique (J/(kg.K))
@@ -25,7 +25,8 @@ delta = 5.0         # intervalle autour de T_m pour la transition (°C)
 # -------------------------------
 dt = 0.01              # pas de temps
 total_time = 21600  # 24 h en secondes
-steps = int(total_time / dt)
+adaptatif = False      # True : pas adaptatif implicite, calé sur les paliers de T_ext
+ruptures = [5400, 10800]  # changements de palier de T_ext (s)
 
 # Paramètres de la pièce (modèle lumpé)
 h_conv = 10        # coefficient convectif intérieur (W/(m^2.K))
@@ -43,120 +44,39 @@ def T_ext(t):
 # %%
 
 # -------------------------------
-# Fonctions pour la méthode enthalpique (PCM)
+# Matériaux des deux murs
 # -------------------------------
-def compute_H_pcm(T):
-    """
-    Calcule l'enthalpie H pour un profil de température T, en tenant compte du PCM.
-    """
-    H = np.zeros_like(T)
-    mask_solid = T < (T_m - delta)
-    mask_liquid = T > (T_m + delta)
-    mask_mushy = ~(mask_solid | mask_liquid)
-    
-    H[mask_solid] = rho * cp * T[mask_solid]
-    H[mask_liquid] = rho * cp * T[mask_liquid] + rho * L_latent
-    H[mask_mushy] = rho * cp * T[mask_mushy] \
-                    + rho * L_latent * ((T[mask_mushy] - (T_m - delta)) / (2 * delta))
-    return H
-
-def T_from_H_pcm(H):
-    """
-    Récupère la température T à partir de l'enthalpie H pour le matériau PCM.
-    """
-    T = np.zeros_like(H)
-    H_low = rho * cp * (T_m - delta)
-    H_high = rho * cp * (T_m + delta) + rho * L_latent
-    
-    mask_solid = H < H_low
-    mask_liquid = H > H_high
-    mask_mushy = ~(mask_solid | mask_liquid)
-    
-    # Zone solide
-    T[mask_solid] = H[mask_solid] / (rho * cp)
-    # Zone liquide
-    T[mask_liquid] = (H[mask_liquid] - rho * L_latent) / (rho * cp)
-    # Zone mushy (transition)
-    T[mask_mushy] = (H[mask_mushy] + (rho * L_latent / (2 * delta)) * (T_m - delta)) \
-                    / (rho * cp + (rho * L_latent / (2 * delta)))
-    return T
+materiau_pcm = Materiau(rho=rho, cp=cp, k=k, L_latent=L_latent, T_m=T_m, delta=delta)
+# Isolation classique : même matériau, sans changement de phase
+materiau_classic = Materiau(rho=rho, cp=cp, k=k)
 
 # %%
 # -------------------------------
 # Initialisation des profils muraux et de la pièce
 # -------------------------------
 T_init_wall = 20.0   # température initiale du mur (°C)
+T_room_init = 22.0   # température initiale de la pièce (°C)
 
-# Pour la simulation PCM
-T_pcm = np.ones(N) * T_init_wall
-H_pcm = compute_H_pcm(T_pcm)
-
-# Pour l'isolation classique (aucun PCM, mise à jour directe de T)
-T_classic = np.ones(N) * T_init_wall
-
-# Températures initiales de la pièce (pour chaque cas)
-T_room_pcm = 22.0
-T_room_classic = 22.0
-
-# Pour l'enregistrement des résultats
-time_arr = []
-T_room_pcm_arr = []
-T_room_classic_arr = []
-T_interior_pcm_arr = []     # température à la face intérieure du mur (x = L) - PCM
-T_interior_classic_arr = [] # même pour isolation classique
 # %%
 
 # -------------------------------
 # Boucle temporelle de simulation
 # -------------------------------
-for step in range(steps):
-    t = step * dt
-    # Condition extérieure imposée à x = 0
-    T_ext_val = T_ext(t)
-    
-    # ----- Mise à jour pour la simulation PCM -----
-    # Condition limite extérieure
-    T_pcm[0] = T_ext_val
-    H_pcm[0] = compute_H_pcm(np.array([T_pcm[0]]))[0]
-    
-    # Condition convective intérieure (x = L)
-    # Approximation par DF: T_pcm[-1] = ( T_pcm[-2] + (h_conv * dx / k)*T_room_pcm ) / (1 + (h_conv * dx / k))
-    T_pcm[-1] = (T_pcm[-2] + (h_conv * dx / k) * T_room_pcm) / (1 + (h_conv * dx / k))
-    H_pcm[-1] = compute_H_pcm(np.array([T_pcm[-1]]))[0]
-    
-    # Récupérer T à partir de H pour mettre à jour la conduction
-    T_temp_pcm = T_from_H_pcm(H_pcm)
-    H_new_pcm = H_pcm.copy()
-    # Mise à jour des noeuds internes (schéma explicite)
-    for i in range(1, N - 1):
-        d2Tdx2 = (T_temp_pcm[i+1] - 2 * T_temp_pcm[i] + T_temp_pcm[i-1]) / dx**2
-        # dH/dt = k * d2T/dx^2
-        H_new_pcm[i] = H_pcm[i] + dt * k * d2Tdx2
-    H_pcm = H_new_pcm.copy()
-    T_pcm = T_from_H_pcm(H_pcm)
-    
-    # ----- Mise à jour pour la simulation en isolation classique -----
-    T_classic[0] = T_ext_val  # condition extérieure
-    T_classic[-1] = (T_classic[-2] + (h_conv * dx / k) * T_room_classic) / (1 + (h_conv * dx / k))
-    T_new_classic = T_classic.copy()
-    for i in range(1, N - 1):
-        d2Tdx2_classic = (T_classic[i+1] - 2 * T_classic[i] + T_classic[i-1]) / dx**2
-        # Equation classique: rho*cp * dT/dt = k * d2T/dx^2
-        T_new_classic[i] = T_classic[i] + dt * (k / (rho * cp)) * d2Tdx2_classic
-    T_classic = T_new_classic.copy()
-    
-    # ----- Mise à jour de la température de la pièce (modèle lumpé) -----
-    # C_room * dT_room/dt = h_conv * A * (T_interior_wall - T_room)
-    T_room_pcm += dt * (h_conv * A / C_room) * (T_pcm[-1] - T_room_pcm)
-    T_room_classic += dt * (h_conv * A / C_room) * (T_classic[-1] - T_room_classic)
-    
-    # Enregistrement des résultats tous les 100 pas
-    if step % 100 == 0:
-        time_arr.append(t / 3600.0)  # temps en heures
-        T_room_pcm_arr.append(T_room_pcm)
-        T_room_classic_arr.append(T_room_classic)
-        T_interior_pcm_arr.append(T_pcm[-1])
-        T_interior_classic_arr.append(T_classic[-1])
+# Les deux murs (ligne 0 : PCM, ligne 1 : classique) sont avancés ensemble
+materiaux = Materiau.empiler([materiau_pcm, materiau_classic])
+if adaptatif:
+    resultat = simuler_piece_adaptatif(materiaux, L, N, T_ext, total_time, h_conv, A, C_room,
+                                       T_init_wall, T_room_init, ruptures=ruptures)
+    print(f"{resultat['pas_acceptes']} pas acceptés, {resultat['pas_rejetes']} rejetés")
+else:
+    resultat = simuler_piece(materiaux, L, N, T_ext, dt, total_time, h_conv, A, C_room,
+                             T_init_wall, T_room_init, pas_releve=100)
+
+time_arr = resultat["temps"] / 3600.0  # temps en heures
+T_room_pcm_arr = resultat["T_room"][:, 0]
+T_room_classic_arr = resultat["T_room"][:, 1]
+T_interior_pcm_arr = resultat["T_interieur"][:, 0]      # face intérieure du mur (x = L) - PCM
+T_interior_classic_arr = resultat["T_interieur"][:, 1]  # même pour isolation classique
 # %%
 
 # -------------------------------
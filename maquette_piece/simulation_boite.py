@@ -0,0 +1,58 @@
+import matplotlib.pyplot as plt
+import sys
+import time
+from pathlib import Path
+
+# Le solveur commun est à la racine du dépôt
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from enthalpie import Materiau, lire_releve, simuler_boite
+
+# %%
+# -------------------------------
+# Maquette : boîte fermée, parois de MCP ou classiques
+# (mêmes matériaux que essaie_modèle numérique maquette.py)
+# -------------------------------
+taille = (0.3, 0.3, 0.3)   # dimensions extérieures (m) ; deux valeurs pour une coupe 2D
+epaisseur = 0.02           # épaisseur des parois (m)
+dx = 0.01                  # taille des mailles (m)
+solveur = "gc"             # "lu" : factorisation réutilisée (grilles moyennes)
+
+materiau_pcm = Materiau(rho=800, cp=2000, k=0.2, L_latent=15e4, T_m=58.0, delta=5.0)
+materiau_classic = Materiau(rho=800, cp=2000, k=0.2)
+
+dt = 60.0              # pas de temps (s), schéma implicite
+total_time = 21600
+h_conv = 10            # coefficient convectif intérieur (W/(m^2.K))
+T_init = 18.0          # température initiale des parois et de l'air (°C)
+
+
+# Température extérieure en paliers, comme pour les relevés
+def T_ext(t):
+    if 0 <= t < 5400 or 10800 <= t <= 21600:
+        return 80
+    else:
+        return 20
+
+
+# %%
+dossier = Path(__file__).resolve().parent
+releves = {"MCP": "releve_boite_MCP.csv", "classique": "releve_boite_classique.csv"}
+materiaux = {"MCP": materiau_pcm, "classique": materiau_classic}
+
+for nom, materiau in materiaux.items():
+    debut = time.perf_counter()
+    resultat = simuler_boite(materiau, taille, epaisseur, dx, T_ext, dt, total_time,
+                             T_init, T_init, h_conv=h_conv, solveur=solveur)
+    print(f"Boîte {nom} : {resultat['boite'].n} mailles de paroi, "
+          f"{time.perf_counter() - debut:.1f} s")
+
+    t_mesure, T_mesure = lire_releve(dossier / releves[nom])
+    plt.plot(resultat["temps"] / 3600, resultat["T_room"], label=f"Air intérieur ({nom}, simulé)")
+    plt.plot(t_mesure / 3600, T_mesure, "--", label=f"Air intérieur ({nom}, mesuré)")
+
+plt.xlabel("Temps (heures)")
+plt.ylabel("Température (°C)")
+plt.title("Maquette : température de l'air intérieur")
+plt.legend()
+plt.grid(True)
+plt.show()
@@ -0,0 +1,77 @@
+"""
+Pièce avec mur MCP ou isolation classique sur une année complète de
+météo réelle (fichier EPW, par exemple téléchargé sur climate.onebuilding.org).
+
+    python simulation_annuelle_MCP.py chemin/vers/fichier.epw
+"""
+import sys
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from enthalpie import CacheResultats, FichierMeteo, Materiau, simuler_piece
+
+
+# %%
+# -------------------------------
+# Paramètres (ceux de simulation_pièce_MCP.py)
+# -------------------------------
+fichier_meteo = sys.argv[1] if len(sys.argv) > 1 else "climat.epw"
+L = 0.1
+N = 50
+dt = 5               # pas de temps (s), sous la limite CFL du mur
+total_time = 8760 * 3600
+h_conv = 10
+A = 24
+C_room = 1e4
+T_confort = 26.0     # seuil de surchauffe (°C)
+
+materiau_pcm = Materiau(rho=800, cp=2000, k=0.5, L_latent=15e4, T_m=20.0, delta=5.0)
+materiau_classic = Materiau(rho=800, cp=2000, k=0.5)
+
+# %%
+# -------------------------------
+# Simulation : le fichier est lu par tranches au fur et à mesure ; un
+# second lancement avec les mêmes paramètres relit le résultat en cache
+# -------------------------------
+cache = CacheResultats("cache_resultats")
+with FichierMeteo(fichier_meteo) as T_ext:
+    T_init = T_ext(0.0)
+    resultat = cache.appeler(simuler_piece, Materiau.empiler([materiau_pcm, materiau_classic]),
+                             L, N, T_ext, dt, total_time, h_conv, A, C_room, T_init, T_init,
+                             pas_releve=int(3600 / dt))
+
+temps_h = resultat["temps"] / 3600
+T_room = resultat["T_room"]
+
+# %%
+# -------------------------------
+# Bilan mensuel
+# -------------------------------
+mois = np.minimum((resultat["temps"] / (365 / 12 * 86400)).astype(int), 11)
+print("mois  T_ext moy   pièce MCP (min/moy/max)   pièce classique (min/moy/max)")
+for m in range(12):
+    dans = mois == m
+    ligne = f"{m + 1:4d}  {np.mean(resultat['T_ext'][dans]):9.1f}"
+    for j in range(2):
+        T = T_room[dans, j]
+        ligne += f"       {T.min():6.1f} {T.mean():6.1f} {T.max():6.1f}"
+    print(ligne)
+surchauffe = np.sum(np.maximum(T_room - T_confort, 0.0), axis=0)
+print(f"Degrés-heures au-dessus de {T_confort} °C : MCP {surchauffe[0]:.0f}, "
+      f"classique {surchauffe[1]:.0f}")
+
+# %%
+# -------------------------------
+# Visualisation
+# -------------------------------
+plt.figure(figsize=(12, 6))
+plt.plot(temps_h / 24, resultat["T_ext"], color="0.7", lw=0.5, label="Extérieur")
+plt.plot(temps_h / 24, T_room[:, 0], lw=0.8, label="Pièce (MCP)")
+plt.plot(temps_h / 24, T_room[:, 1], lw=0.8, label="Pièce (isolation classique)")
+plt.xlabel("Jour de l'année")
+plt.ylabel('Température (°C)')
+plt.title(f"Année complète : {fichier_meteo}")
+plt.legend()
+plt.grid(True)
+plt.show()
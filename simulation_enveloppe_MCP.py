@@ -0,0 +1,88 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from enthalpie import Couche, Materiau, Multicouche, Paroi, simuler_enveloppe
+
+
+# %%
+# -------------------------------
+# Matériaux
+# -------------------------------
+mcp = Materiau(rho=800, cp=2000, k=0.5, L_latent=15e4, T_m=20.0, delta=5.0)
+sans_mcp = Materiau(rho=800, cp=2000, k=0.5)      # même plaque, sans changement de phase
+brique = Materiau(rho=1800, cp=900, k=0.8)
+beton = Materiau(rho=2300, cp=1000, k=1.7)
+bois = Materiau(rho=500, cp=1600, k=0.15)
+
+# %%
+# -------------------------------
+# Paramètres de simulation
+# -------------------------------
+dx = 0.005           # pas d'espace (m)
+dt = 10              # pas de temps (s), sous Enveloppe.pas_max()
+total_time = 86400*5  # 5 jours
+C_room = 1e5         # capacité thermique de l'air et du mobilier (J/K)
+T_init_wall = 20.0
+T_room_init = 22.0
+
+
+# Température extérieure vue par chaque paroi (nord, sud, est, ouest, toit, sol) :
+# ensoleillement décalé selon l'orientation, sol à température constante
+def T_ext(t):
+    jour = 2 * np.pi * t / 86400
+    return np.array([
+        20 + 8 * np.sin(jour),                 # nord
+        23 + 12 * np.sin(jour),                # sud
+        21 + 10 * np.sin(jour + np.pi / 4),    # est
+        21 + 10 * np.sin(jour - np.pi / 4),    # ouest
+        25 + 15 * np.sin(jour),                # toit (température soleil-air)
+        12.0,                                  # sol
+    ])
+
+
+def enveloppe(plaque):
+    # Murs en brique doublés d'une plaque (MCP ou non) côté intérieur
+    mur = Multicouche([Couche(brique, 0.2), Couche(plaque, 0.02)])
+    return [
+        Paroi(mur, 12, nom="nord"),
+        Paroi(mur, 12, nom="sud"),
+        Paroi(mur, 10, nom="est"),
+        Paroi(mur, 10, nom="ouest"),
+        Paroi(Multicouche([Couche(bois, 0.05), Couche(plaque, 0.02)]), 20, h_ext=20, nom="toit"),
+        Paroi(beton, 20, 0.15, h_int=6, nom="sol"),
+    ]
+
+
+# %%
+# -------------------------------
+# Simulations
+# -------------------------------
+resultats = {nom: simuler_enveloppe(enveloppe(plaque), dx, T_ext, dt, total_time, C_room,
+                                    T_init_wall, T_room_init, pas_releve=10)
+             for nom, plaque in (("MCP", mcp), ("sans MCP", sans_mcp))}
+
+# %%
+# -------------------------------
+# Visualisation des résultats
+# -------------------------------
+plt.figure(figsize=(10, 6))
+for nom, resultat in resultats.items():
+    plt.plot(resultat["temps"] / 3600, resultat["T_room"], label=f"Température pièce ({nom})")
+plt.xlabel('Temps (heures)')
+plt.ylabel('Température (°C)')
+plt.title("Pièce entourée de ses six parois")
+plt.legend()
+plt.grid(True)
+plt.show()
+
+plt.figure(figsize=(10, 6))
+resultat = resultats["MCP"]
+for r, paroi in enumerate(resultat["enveloppe"].parois):
+    plt.plot(resultat["temps"] / 3600, resultat["flux_interieur"][:, r] * paroi.aire,
+             label=paroi.nom)
+plt.xlabel('Temps (heures)')
+plt.ylabel('Puissance cédée à la pièce (W)')
+plt.title("Échanges de chaque paroi avec l'air (MCP)")
+plt.legend()
+plt.grid(True)
+plt.show()
@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from enthalpie import (CacheResultats, Materiau, amortissement, regime_periodique,
+                       reponse_periodique, simuler_piece)
+
 
 # %%
 # -------------------------------
@@ -8,7 +11,6 @@ import matplotlib.pyplot as plt
 # -------------------------------
 L = 0.1        # épaisseur du mur (m)
 N = 50         # nombre de points spatiaux
-dx = L / (N - 1)
 
 rho = 800      # masse volumique (kg/m^3)
 cp = 2000      # capacité thermique (J/(kg.K))
@@ -24,8 +26,12 @@ delta = 5.0         # intervalle autour de T_m pour la transition (°C)
 # Paramètres de simulation
 # -------------------------------
 dt = 1              # pas de temps
+schema = "explicite" # "implicite" ou "crank-nicolson" : stables avec dt ~ 60 s
+fichier_reprise = None # ex. "reprise_piece.npz" : reprend le calcul là où il s'est arrêté
+periodique = False  # True : cycle de 24 h établi directement, sans le transitoire
+valider_classique = False  # True : mur classique aussi simulé pas à pas, pour valider les admittances
+cache = CacheResultats("cache_resultats")  # relancer avec les mêmes paramètres relit le résultat
 total_time = 86400*5  # 24 h en secondes
-steps = int(total_time / dt)
 
 # Paramètres de la pièce (modèle lumpé)
 h_conv = 10        # coefficient convectif intérieur (W/(m^2.K))
@@ -40,128 +46,82 @@ def T_ext(t):
 # %%
 
 # -------------------------------
-# Fonctions pour la méthode enthalpique (PCM)
+# Matériaux des deux murs
 # -------------------------------
-def compute_H_pcm(T):
-    """
-    Calcule l'enthalpie H pour un profil de température T, en tenant compte du PCM.
-    """
-    H = np.zeros_like(T)
-    mask_solid = T < (T_m - delta)
-    mask_liquid = T > (T_m + delta)
-    mask_mushy = ~(mask_solid | mask_liquid)
-    
-    H[mask_solid] = rho * cp * T[mask_solid]
-    H[mask_liquid] = rho * cp * T[mask_liquid] + rho * L_latent
-    H[mask_mushy] = rho * cp * T[mask_mushy] \
-                    + rho * L_latent * ((T[mask_mushy] - (T_m - delta)) / (2 * delta))
-    return H
-
-def T_from_H_pcm(H):
-    """
-    Récupère la température T à partir de l'enthalpie H pour le matériau PCM.
-    """
-    T = np.zeros_like(H)
-    H_low = rho * cp * (T_m - delta)
-    H_high = rho * cp * (T_m + delta) + rho * L_latent
-    
-    mask_solid = H < H_low
-    mask_liquid = H > H_high
-    mask_mushy = ~(mask_solid | mask_liquid)
-    
-    # Zone solide
-    T[mask_solid] = H[mask_solid] / (rho * cp)
-    # Zone liquide
-    T[mask_liquid] = (H[mask_liquid] - rho * L_latent) / (rho * cp)
-    # Zone mushy (transition)
-    T[mask_mushy] = (H[mask_mushy] + (rho * L_latent / (2 * delta)) * (T_m - delta)) \
-                    / (rho * cp + (rho * L_latent / (2 * delta)))
-    return T
+materiau_pcm = Materiau(rho=rho, cp=cp, k=k, L_latent=L_latent, T_m=T_m, delta=delta)
+# Isolation classique : même matériau, sans changement de phase
+materiau_classic = Materiau(rho=rho, cp=cp, k=k)
 
 # %%
 # -------------------------------
 # Initialisation des profils muraux et de la pièce
 # -------------------------------
 T_init_wall = 20.0   # température initiale du mur (°C)
+T_room_init = 22.0   # température initiale de la pièce (°C)
 
-# Pour la simulation PCM
-T_pcm = np.ones(N) * T_init_wall
-H_pcm = compute_H_pcm(T_pcm)
-
-# Pour l'isolation classique (aucun PCM, mise à jour directe de T)
-T_classic = np.ones(N) * T_init_wall
-
-# Températures initiales de la pièce (pour chaque cas)
-T_room_pcm = 22.0
-T_room_classic = 22.0
-
-# Pour l'enregistrement des résultats
-time_arr = []
-T_room_pcm_arr = []
-T_room_classic_arr = []
-T_interior_pcm_arr = []     # température à la face intérieure du mur (x = L) - PCM
-T_interior_classic_arr = [] # même pour isolation classique
 # %%
 
 # -------------------------------
 # Boucle temporelle de simulation
 # -------------------------------
-for step in range(steps):
-    t = step * dt
-    # Condition extérieure imposée à x = 0
-    T_ext_val = T_ext(t)
-    
-    # ----- Mise à jour pour la simulation PCM -----
-    # Condition limite extérieure
-    T_pcm[0] = T_ext_val
-    H_pcm[0] = compute_H_pcm(np.array([T_pcm[0]]))[0]
-    
-    # Condition convective intérieure (x = L)
-    # Approximation par DF: T_pcm[-1] = ( T_pcm[-2] + (h_conv * dx / k)*T_room_pcm ) / (1 + (h_conv * dx / k))
-    T_pcm[-1] = (T_pcm[-2] + (h_conv * dx / k) * T_room_pcm) / (1 + (h_conv * dx / k))
-    H_pcm[-1] = compute_H_pcm(np.array([T_pcm[-1]]))[0]
-    
-    # Récupérer T à partir de H pour mettre à jour la conduction
-    T_temp_pcm = T_from_H_pcm(H_pcm)
-    H_new_pcm = H_pcm.copy()
-    # Mise à jour des noeuds internes (schéma explicite)
-    for i in range(1, N - 1):
-        d2Tdx2 = (T_temp_pcm[i+1] - 2 * T_temp_pcm[i] + T_temp_pcm[i-1]) / dx**2
-        # dH/dt = k * d2T/dx^2
-        H_new_pcm[i] = H_pcm[i] + dt * k * d2Tdx2
-    H_pcm = H_new_pcm.copy()
-    T_pcm = T_from_H_pcm(H_pcm)
-    
-    # ----- Mise à jour pour la simulation en isolation classique -----
-    T_classic[0] = T_ext_val  # condition extérieure
-    T_classic[-1] = (T_classic[-2] + (h_conv * dx / k) * T_room_classic) / (1 + (h_conv * dx / k))
-    T_new_classic = T_classic.copy()
-    for i in range(1, N - 1):
-        d2Tdx2_classic = (T_classic[i+1] - 2 * T_classic[i] + T_classic[i-1]) / dx**2
-        # Equation classique: rho*cp * dT/dt = k * d2T/dx^2
-        T_new_classic[i] = T_classic[i] + dt * (k / (rho * cp)) * d2Tdx2_classic
-    T_classic = T_new_classic.copy()
-    
-    # ----- Mise à jour de la température de la pièce (modèle lumpé) -----
-    # C_room * dT_room/dt = h_conv * A * (T_interior_wall - T_room)
-    T_room_pcm += dt * (h_conv * A / C_room) * (T_pcm[-1] - T_room_pcm)
-    T_room_classic += dt * (h_conv * A / C_room) * (T_classic[-1] - T_room_classic)
-    
-    # Enregistrement des résultats tous les 100 pas
-    if step % 100 == 0:
-        time_arr.append(t / 3600.0)  # temps en heures
-        T_room_pcm_arr.append(T_room_pcm)
-        T_room_classic_arr.append(T_room_classic)
-        T_interior_pcm_arr.append(T_pcm[-1])
-        T_interior_classic_arr.append(T_classic[-1])
+# Seul le mur MCP est simulé pas à pas ; avec valider_classique, les deux
+# murs (ligne 0 : PCM, ligne 1 : classique) sont avancés ensemble
+if valider_classique:
+    materiaux = Materiau.empiler([materiau_pcm, materiau_classic])
+else:
+    materiaux = materiau_pcm
+if periodique:
+    resultat = cache.appeler(regime_periodique, materiaux, L, N, T_ext, 86400, dt, h_conv, A,
+                             C_room, T_init_wall, T_room_init, pas_releve=100, schema=schema)
+    print(f"Régime établi en {resultat['periodes']} périodes, "
+          f"résidu de périodicité {resultat['residu']:.2e} °C")
+else:
+    resultat = cache.appeler(simuler_piece, materiaux, L, N, T_ext, dt, total_time, h_conv, A,
+                             C_room, T_init_wall, T_room_init, pas_releve=100, schema=schema,
+                             fichier_reprise=fichier_reprise)
+
+time_arr = resultat["temps"] / 3600.0  # temps en heures
+T_room_pcm_arr = resultat["T_room"][:, 0]
+T_interior_pcm_arr = resultat["T_interieur"][:, 0]      # face intérieure du mur (x = L) - PCM
+
+# Mur classique (linéaire) : régime établi par la méthode des admittances
+classique = amortissement(materiau_classic, L, 86400, h_conv, A, C_room)["T_room"]
+print(f"Isolation classique : facteur d'amortissement {classique['facteur']:.3f}, "
+      f"déphasage {classique['dephasage'] / 3600:.1f} h")
+cycle = reponse_periodique(materiau_classic, L, T_ext(np.arange(864) * 100.0), 86400,
+                           h_conv, A, C_room)
+T_room_classic_arr = np.interp(resultat["temps"], cycle["temps"], cycle["T_room"], period=86400)
+T_interior_classic_arr = np.interp(resultat["temps"], cycle["temps"], cycle["T_interieur"],
+                                   period=86400)
+dernier_jour = resultat["temps"] >= resultat["temps"][-1] - 86400
+if valider_classique:
+    ecart = np.max(np.abs(resultat["T_room"][dernier_jour, 1] - T_room_classic_arr[dernier_jour]))
+    print(f"Écart admittances / simulation (dernier jour) : {ecart:.3f} °C")
+    # Mur classique simulé avec le mur MCP : même transitoire depuis T_init
+    T_room_classic_arr = resultat["T_room"][:, 1]
+    T_interior_classic_arr = resultat["T_interieur"][:, 1]
+    regime_pcm = regime_classique = ""
+elif periodique:
+    regime_pcm = regime_classique = ", régime établi"
+else:
+    # Le cycle des admittances est un régime établi : il n'est comparé au
+    # transitoire du mur MCP que sur le dernier jour
+    T_room_classic_arr[~dernier_jour] = np.nan
+    T_interior_classic_arr[~dernier_jour] = np.nan
+    veille = np.interp(resultat["temps"][dernier_jour] - 86400, resultat["temps"], T_room_pcm_arr)
+    derive = np.max(np.abs(T_room_pcm_arr[dernier_jour] - veille))
+    print(f"Mur MCP : écart entre les deux derniers jours {derive:.3f} °C "
+          f"(nul en régime établi)")
+    regime_pcm = ""
+    regime_classique = ", régime établi, dernier jour"
 # %%
 
 # -------------------------------
 # Visualisation des résultats
 # -------------------------------
 plt.figure(figsize=(10, 6))
-plt.plot(time_arr, T_room_pcm_arr, label='Température pièce (PCM)')
-plt.plot(time_arr, T_room_classic_arr, label='Température pièce (Isolation classique)')
+plt.plot(time_arr, T_room_pcm_arr, label=f'Température pièce (PCM{regime_pcm})')
+plt.plot(time_arr, T_room_classic_arr, label=f'Température pièce (Isolation classique{regime_classique})')
 plt.xlabel('Temps (heures)')
 plt.ylabel('Température (°C)')
 plt.title('Évolution de la température de la pièce sur 5 jours')
@@ -170,8 +130,8 @@ plt.grid(True)
 plt.show()
 
 plt.figure(figsize=(10, 6))
-plt.plot(time_arr, T_interior_pcm_arr, label='Temp. intérieure du mur (PCM)')
-plt.plot(time_arr, T_interior_classic_arr, label='Temp. intérieure du mur (Isolation classique)')
+plt.plot(time_arr, T_interior_pcm_arr, label=f'Temp. intérieure du mur (PCM{regime_pcm})')
+plt.plot(time_arr, T_interior_classic_arr, label=f'Temp. intérieure du mur (Isolation classique{regime_classique})')
 plt.xlabel('Temps (heures)')
 plt.ylabel('Température (°C)')
 plt.title('Évolution de la température à la face intérieure du mur')